@@ -1,215 +1,241 @@
 # fichier: minipython_complete.py
-from lark import Lark, Transformer
-from anytree import Node, RenderTree
-from anytree.exporter import DotExporter
+import argparse
 import os
+import sys
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(script_dir))
+# Lark (minipython.lark_frontend, minipython.lark_parser) et le cache de
+# compilation ne sont importés que par les phases qui s'en servent
+import minipython.semantic
+from minipython.ast_export import (export, start_render, wait_render, walk, write_json,
+                                   write_text)
+from minipython.governor import Governor, LimitExceeded, run as run_governed
+from minipython.profiling import Instrumentation, Profiler, count_nodes
+from minipython.resolve import resolve_slots, slots_view
+from minipython.semantic import SemanticErrors, check as check_semantics
 
 # ------------------------------
 # 1. Lecture interactive du code MiniPython
 # ------------------------------
-print("Entrez votre code MiniPython (finissez par une ligne vide) :")
-lines = []
-while True:
-    line = input()
-    if line.strip() == "":
-        break
-    lines.append(line)
-code_source = "\n".join(lines)
+def read_source():
+    print("Entrez votre code MiniPython (finissez par une ligne vide) :")
+    lines = []
+    while True:
+        line = input()
+        if line.strip() == "":
+            break
+        lines.append(line)
+    return "\n".join(lines)
 
 # ------------------------------
-# 2. Chargement grammaire Lark
+# 2. Chargement grammaire Lark (tables LALR en cache)
 # ------------------------------
-script_dir = os.path.dirname(os.path.abspath(__file__))
-grammar_path = os.path.join(script_dir, "minipython.lark")
-
-with open(grammar_path, "r", encoding="utf-8") as f:
-    grammar = f.read()
-
-parser = Lark(grammar, start="start", parser="lalr", lexer="basic")
+# get_parser() : construit une seule fois par processus
 
 # ------------------------------
 # 3. Analyse lexicale
 # ------------------------------
-print("\n=== Phase lexicale (Lark) ===")
-tokens = list(parser.lex(code_source))
-for t in tokens:
-    print(t)
+def lex(code_source, parser=None):
+    from minipython.lark_parser import get_parser
+    return list((parser or get_parser()).lex(code_source))
 
 # ------------------------------
 # 4. AST syntaxique via Transformer
 # ------------------------------
-class SyntaxTransformer(Transformer):
-    def start(self, items): return list(items)
-    def decl(self, items): return ("decl(L)", items[0], 'int')
-    def var_list(self, items): return [str(i) for i in items]
-    def assign(self, items): return ("assign(S)", str(items[0]), items[1])
-    def add(self, items): return ('+(S)', str(items[0]), items[1])
-    def print_stmt(self, items): return ("print(S)", str(items[0]))
-    def while_stmt(self, items): return ("while", items[0], items[1])
-    def if_stmt(self, items): return ("if", items[0], items[1])
-    def condition(self, items): return (items[0], str(items[1]), items[2])
-    def NUMBER(self, n): return int(n)
-    def CNAME(self, n): return str(n)
-
-tree = parser.parse(code_source)
-ast_syntax = SyntaxTransformer().transform(tree)
-
-print("\n=== AST syntaxique ===")
-for node in ast_syntax:
-    print(node)
+def parse(code_source, single_pass=False):
+    from minipython.lark_frontend import SyntaxTransformer, get_ast_parser
+    from minipython.lark_parser import get_parser
+    if single_pass:
+        # Transformer appliqué pendant l'analyse LALR : pas d'arbre lark.Tree
+        return get_ast_parser().parse(code_source)
+    tree = get_parser().parse(code_source)
+    return SyntaxTransformer().transform(tree)
 
 # ------------------------------
 # 5. Analyse sémantique
 # ------------------------------
-class SemanticChecker:
-    def __init__(self): self.symbol_table = {}
-
-    def check(self, ast_list):
-        new_ast = []
-        for stmt in ast_list:
-            if stmt[0] == 'decl(L)':
-                for var in stmt[1]:
-                    if var in self.symbol_table:
-                        raise Exception(f"Variable {var} déjà déclarée")
-                    self.symbol_table[var] = 'int'
-                new_ast.append(stmt)
-            elif stmt[0] == 'assign(S)':
-                var, expr = stmt[1], stmt[2]
-                if var not in self.symbol_table:
-                    raise Exception(f"Variable {var} non déclarée")
-                if isinstance(expr, tuple) and expr[0] == '+(S)':
-                    if expr[1] not in self.symbol_table:
-                        raise Exception(f"Variable {expr[1]} non déclarée")
-                new_ast.append(stmt)
-            elif stmt[0] == 'print(S)':
-                var = stmt[1]
-                if var not in self.symbol_table:
-                    raise Exception(f"Variable {var} non déclarée")
-                new_ast.append(stmt)
-            elif stmt[0] in ['while', 'if']:
-                cond, block = stmt[1], stmt[2]
-                for s in block:
-                    if s[0] == 'assign(S)' and s[1] not in self.symbol_table:
-                        raise Exception(f"Variable {s[1]} non déclarée")
-                new_ast.append(stmt)
-        return new_ast
-
-semantic = SemanticChecker()
-ast_semantic = semantic.check(ast_syntax)
-
-print("\n=== AST après analyse sémantique ===")
-for node in ast_semantic:
-    print(node)
-
-print("\n=== Table des symboles ===")
-for var, typ in semantic.symbol_table.items():
-    print(f"{var}: {typ}")
+def check(ast_syntax):
+    # Passe linéaire de minipython.semantic : (AST annoté, table nom -> type)
+    return check_semantics(ast_syntax)
 
 # ------------------------------
 # 6. Visualisation AST
 # ------------------------------
-def build_anytree(node, parent=None):
-    if isinstance(node, tuple):
-        n = Node(node[0], parent=parent)
-        for c in node[1:]:
-            build_anytree(c, n)
-        return n
-    elif isinstance(node, list):
-        for item in node:
-            build_anytree(item, parent)
-        return parent
-    else:
-        Node(str(node), parent=parent)
-        return parent
-
-root = build_anytree(("root", *ast_semantic))
-print("\n=== AST visuel console ===")
-for pre, fill, node in RenderTree(root):
-    print(f"{pre}{node.name}")
-
-# Export DOT/PNG
-try:
+# Export DOT/PNG : l'AST est écrit directement (minipython.ast_export), sans
+# copie anytree, et Graphviz tourne en arrière-plan pendant l'exécution
+def export_png(ast, max_depth=None):
     output_path = os.path.join(script_dir, "ast_lark.png")
     dot_path = os.path.join(script_dir, "ast_lark.dot")
-    DotExporter(root).to_dotfile(dot_path)
-    import subprocess
-    result = subprocess.run(['dot', '-Tpng', dot_path, '-o', output_path],
-                            capture_output=True, text=True)
-    if result.returncode == 0:
+    try:
+        export(dot_path, "root", ast, max_depth)
+    except OSError as e:
+        print(f"\nErreur export AST : {e}")
+        return None
+    render = start_render(dot_path, output_path)
+    if render is None:
+        print("\nErreur export AST : commande dot (Graphviz) introuvable")
+        return None
+    return render, output_path
+
+def finish_png(render, output_path):
+    error = wait_render(render)
+    if error is None:
         print(f"\n=== Image PNG sauvegardée : {output_path} ===")
     else:
-        print(f"\nErreur Graphviz : {result.stderr}")
-except Exception as e:
-    print(f"\nErreur export AST : {e}")
+        print(f"\nErreur Graphviz : {error}")
 
 # ------------------------------
 # 7. Exécution MiniPython
 # ------------------------------
-def eval_condition(cond, runtime):
-    op, left, right = cond
-    left_val = runtime[left] if left in runtime else int(left)
-    right_val = runtime[right] if right in runtime else int(right)
-    if op == '<': return left_val < right_val
-    if op == '==': return left_val == right_val
-    if op == '>': return left_val > right_val
-    return False
-
-def execute_stmt(stmt, runtime):
-    if stmt[0] == 'assign(S)':
-        var, val = stmt[1], stmt[2]
-        if isinstance(val, tuple) and val[0] == '+(S)':
-            left_val = runtime[val[1]] if val[1] in runtime else int(val[1])
-            right_val = val[2]
-            runtime[var] = left_val + right_val
-        elif isinstance(val, int):
-            runtime[var] = val
-        else:
-            runtime[var] = runtime[val]
-    elif stmt[0] == 'print(S)':
-        print(runtime[stmt[1]])
-    elif stmt[0] == 'while':
-        cond, block = stmt[1], stmt[2]
-        while eval_condition(cond, runtime):
-            for s in block:
-                execute_stmt(s, runtime)
-    elif stmt[0] == 'if':
-        cond, block = stmt[1], stmt[2]
-        if eval_condition(cond, runtime):
-            for s in block:
-                execute_stmt(s, runtime)
-
-def execute(ast, symbol_table):
-    runtime = {var: None for var in symbol_table.keys()}
-    for stmt in ast:
-        execute_stmt(stmt, runtime)
-
-print("\n=== Exécution MiniPython ===")
-execute(ast_semantic, semantic.symbol_table)
-
-# ------------------------------
-# 8. Génération TAC simple
-# ------------------------------
-def generate_TAC(ast):
-    tac = []
-    for stmt in ast:
-        if stmt[0] == 'decl(L)':
-            for var in stmt[1]:
-                tac.append(f"DECLARE {var}")
-        elif stmt[0] == 'assign(S)':
-            val = stmt[2]
-            if isinstance(val, tuple) and val[0] == '+(S)':
-                tac.append(f"LOAD {val[1]}")
-                tac.append(f"ADD {val[2]}")
-                tac.append(f"STORE {stmt[1]}")
-            else:
-                tac.append(f"LOAD {val}")
-                tac.append(f"STORE {stmt[1]}")
-        elif stmt[0] == 'print(S)':
-            tac.append(f"PRINT {stmt[1]}")
-    return tac
-
-tac_code = generate_TAC(ast_semantic)
-print("\n=== Code intermédiaire (TAC) ===")
-for line in tac_code:
-    print(line)
+def execute(ast, symbol_table, hook=None, governor=None):
+    # Chaque variable reçoit un index fixe : runtime est une liste plate.
+    # governor (minipython.governor) : limites de pas, de temps et de mémoire
+    names = resolve_slots(ast, symbol_table)
+    runtime = [None] * len(names)
+    try:
+        run_governed(ast, runtime, governor, slots=True, hook=hook)
+    except LimitExceeded as e:
+        print(f"Exécution interrompue : {e}")
+    # Vue dictionnaire des variables finales (débogage)
+    return slots_view(names, runtime)
+
+# ------------------------------
+# 8. Front-end complet et cache de compilation
+# ------------------------------
+def frontend_version():
+    # Le cache est invalidé dès que la grammaire ou le front-end changent
+    import minipython.lark_frontend
+    import minipython.tac
+    from minipython.compile_cache import files_version
+    from minipython.lark_parser import GRAMMAR_PATH
+    return files_version(GRAMMAR_PATH, minipython.lark_frontend.__file__,
+                         minipython.semantic.__file__, minipython.tac.__file__)
+
+def front_end(code_source, instr, single_pass=False):
+    # Lexing, parsing, transformation, sémantique et TAC
+    from minipython.lark_frontend import SyntaxTransformer, get_ast_parser
+    from minipython.tac import TACGenerator
+    from minipython.lark_parser import get_parser
+    with instr.phase("grammar"):
+        parser = get_ast_parser() if single_pass else get_parser()
+    with instr.phase("lex") as rec:
+        tokens = lex(code_source, parser)
+        rec.counts["tokens"] = len(tokens)
+    print("\n=== Phase lexicale (Lark) ===")
+    for t in tokens:
+        print(t)
+
+    if single_pass:
+        with instr.phase("parse") as rec:
+            ast_syntax = parse(code_source, single_pass=True)
+            rec.counts["noeuds"] = count_nodes(ast_syntax)
+    else:
+        with instr.phase("parse"):
+            tree = get_parser().parse(code_source)
+        with instr.phase("transform") as rec:
+            ast_syntax = SyntaxTransformer().transform(tree)
+            rec.counts["noeuds"] = count_nodes(ast_syntax)
+    print("\n=== AST syntaxique ===")
+    for node in ast_syntax:
+        print(node)
+
+    with instr.phase("semantic") as rec:
+        ast_semantic, symbol_table = check(ast_syntax)
+        rec.counts["symboles"] = len(symbol_table)
+
+    # TAC avec étiquettes et sauts (while, if), comme analyse_lark.py
+    with instr.phase("tac") as rec:
+        tac_code = TACGenerator().generate(ast_semantic)
+        rec.counts["instructions"] = len(tac_code)
+    return ast_semantic, symbol_table, tac_code
+
+# ------------------------------
+# 9. Programme principal
+# ------------------------------
+def main():
+    arg_parser = argparse.ArgumentParser(description="Analyse MiniPython avec Lark")
+    arg_parser.add_argument("--max-steps", type=int, metavar="N",
+                            help="arrête l'exécution après N pas")
+    arg_parser.add_argument("--max-time", type=float, metavar="S",
+                            help="arrête l'exécution après S secondes")
+    arg_parser.add_argument("--max-memory", type=int, metavar="KO",
+                            help="limite la taille des variables en Ko")
+    arg_parser.add_argument("--profile", action="store_true",
+                            help="mesure chaque phase et compte les instructions exécutées")
+    arg_parser.add_argument("--cache", action="store_true",
+                            help="réutilise l'AST et le TAC d'une compilation identique")
+    arg_parser.add_argument("--single-pass", action="store_true",
+                            help="construit l'AST pendant l'analyse LALR (sans lark.Tree)")
+    arg_parser.add_argument("--ast-depth", type=int, metavar="N",
+                            help="résume les sous-arbres de l'AST au-delà de la profondeur N")
+    arg_parser.add_argument("--ast-json", metavar="FICHIER",
+                            help="écrit aussi l'AST au format JSON")
+    arg_parser.add_argument("--no-png", action="store_true",
+                            help="n'écrit pas ast_lark.dot et ne lance pas Graphviz")
+    args = arg_parser.parse_args()
+    governor = Governor(args.max_steps, args.max_time,
+                        args.max_memory * 1024 if args.max_memory is not None else None)
+
+    profiler = Profiler()
+    instr = Instrumentation(profiler, trace_alloc=True) if args.profile else Instrumentation()
+
+    code_source = read_source()
+
+    program = None
+    if args.cache:
+        from minipython.compile_cache import (DEFAULT_DIR, CompileCache, CompiledProgram,
+                                              source_key)
+        cache = CompileCache(directory=DEFAULT_DIR)
+        key = source_key(code_source, "lark", frontend_version())
+        program = cache.get(key)
+    if program is not None:
+        print("\n=== Programme trouvé dans le cache de compilation ===")
+        ast_semantic, symbol_table, tac_code = program.ast, program.symtab, program.tac
+    else:
+        try:
+            ast_semantic, symbol_table, tac_code = front_end(code_source, instr, args.single_pass)
+        except SemanticErrors as e:
+            print("\n=== Erreurs sémantiques ===")
+            print(e)
+            sys.exit(1)
+        if args.cache:
+            cache.put(key, CompiledProgram(ast_semantic, symbol_table, tac_code))
+
+    print("\n=== AST après analyse sémantique ===")
+    for node in ast_semantic:
+        print(node)
+
+    print("\n=== Table des symboles ===")
+    for var, typ in symbol_table.items():
+        print(f"{var}: {typ}")
+
+    print("\n=== AST visuel console ===")
+    write_text(walk("root", ast_semantic, args.ast_depth), sys.stdout)
+    render = None
+    if not args.no_png:
+        render = export_png(ast_semantic, args.ast_depth)
+    if args.ast_json:
+        # Toujours du JSON, quelle que soit l'extension du fichier
+        export(args.ast_json, "root", ast_semantic, args.ast_depth, writer=write_json)
+
+    print("\n=== Exécution MiniPython ===")
+    with instr.phase("execute") as rec:
+        execute(ast_semantic, symbol_table, hook=instr.stmt_hook(), governor=governor)
+        if profiler.hits:
+            rec.counts["exécutées"] = sum(profiler.hits.values())
+
+    print("\n=== Code intermédiaire (TAC) ===")
+    for line in tac_code:
+        print(line)
+
+    if render is not None:
+        finish_png(*render)
+
+    if args.profile:
+        print("\n=== Profil ===")
+        print(profiler.report())
+
+if __name__ == "__main__":
+    main()
 
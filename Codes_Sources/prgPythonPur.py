@@ -1,7 +1,10 @@
-from anytree import Node, RenderTree
-from anytree.exporter import DotExporter
-import re
+import io
 import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from minipython.ast_export import export, start_render, wait_render, walk, write_text
+from minipython.lexer import TokenStream, compile_spec, iter_tokens
  
 # ------------------------------
 # 1. Code source MiniPython
@@ -22,64 +25,61 @@ token_specification = [
     ('PLUS', r'\+'), ('EQUAL', r'='), ('LPAR', r'\('), ('RPAR', r'\)'),
     ('SKIP', r'[ \t\n]+')
 ]
-regex = '|'.join(f'(?P<{n}>{p})' for n, p in token_specification)
-tokens = [(m.lastgroup, m.group()) for m in re.finditer(regex, code_source) if m.lastgroup != 'SKIP']
- 
-print("\n=== Phase lexicale ===")
-for t in tokens:
-    print(t)
+lexer = compile_spec(token_specification)
+
+def lex(code):
+    # Les tokens sont produits à la demande pendant l'analyse syntaxique
+    return TokenStream(iter_tokens(io.StringIO(code), lexer))
  
 # ------------------------------
 # 3. Analyse syntaxique & construction AST
 # ------------------------------
-symbol_table = {}
-ast = []
+def parse(tokens):
+    symbol_table = {}
+    ast = []
  
-i = 0
-while i < len(tokens):
-    tok, val = tokens[i]
-    if tok == 'INT':  # Déclaration de variables
-        i += 1
-        vars_list = []
-        while i < len(tokens) and tokens[i][0] != 'SEMICOLON':
-            if tokens[i][0] == 'ID':
-                vars_list.append(tokens[i][1])
+    i = 0
+    while i < len(tokens):
+        tok, val = tokens[i][:2]
+        if tok == 'INT':  # Déclaration de variables
             i += 1
-        for v in vars_list:
-            symbol_table[v] = 'int'
-        ast.append(('Decl', [('Var: ' + v + ' (type=int)') for v in vars_list]))
-        i += 1
-    elif tok == 'ID':  # Assignation
-        var_name = val
-        i += 2  # skip '='
-        if i >= len(tokens):
-            break
-        left_tok, left_val = tokens[i]
-        i += 1
-        if i < len(tokens) and tokens[i][0] == 'PLUS':
+            vars_list = []
+            while i < len(tokens) and tokens[i][0] != 'SEMICOLON':
+                if tokens[i][0] == 'ID':
+                    vars_list.append(tokens[i][1])
+                i += 1
+            for v in vars_list:
+                symbol_table[v] = 'int'
+            ast.append(('Decl', [('Var: ' + v + ' (type=int)') for v in vars_list]))
             i += 1
+        elif tok == 'ID':  # Assignation
+            var_name = val
+            i += 2  # skip '='
             if i >= len(tokens):
                 break
-            right_val = int(tokens[i][1])
+            left_tok, left_val = tokens[i][:2]
             i += 1
-            expr = ('Expr: +', [('Var: ' + left_val), ('Const: ' + str(right_val))])
+            if i < len(tokens) and tokens[i][0] == 'PLUS':
+                i += 1
+                if i >= len(tokens):
+                    break
+                right_val = int(tokens[i][1])
+                i += 1
+                expr = ('Expr: +', [('Var: ' + left_val), ('Const: ' + str(right_val))])
+            else:
+                expr = ('Expr', [('Const: ' + left_val) if left_val.isdigit() else ('Var: ' + left_val)])
+            ast.append(('Assign', [('Var: ' + var_name), expr]))
+            i += 1  # skip ';'
+        elif tok == 'PRINT':
+            i += 2  # skip '('
+            if i >= len(tokens):
+                break
+            var_name = tokens[i][1]
+            i += 2  # skip ')' and ';'
+            ast.append(('Print', [('Var: ' + var_name)]))
         else:
-            expr = ('Expr', [('Const: ' + left_val) if left_val.isdigit() else ('Var: ' + left_val)])
-        ast.append(('Assign', [('Var: ' + var_name), expr]))
-        i += 1  # skip ';'
-    elif tok == 'PRINT':
-        i += 2  # skip '('
-        if i >= len(tokens):
-            break
-        var_name = tokens[i][1]
-        i += 2  # skip ')' and ';'
-        ast.append(('Print', [('Var: ' + var_name)]))
-    else:
-        i += 1
- 
-print("\n=== AST syntaxique brut ===")
-for node in ast:
-    print(node)
+            i += 1
+    return ast, symbol_table
  
 # ------------------------------
 # 4. Analyse sémantique simple
@@ -101,53 +101,42 @@ def semantic_check(ast, symbol_table):
             new_ast.append(stmt)
     return new_ast
  
-ast_semantic = semantic_check(ast, symbol_table)
-print("\n=== AST après analyse sémantique ===")
-for node in ast_semantic:
-    print(node)
- 
 # ------------------------------
-# 5. Visualisation AST avec anytree
+# 5. Visualisation AST
 # ------------------------------
-def build_anytree(node, parent=None):
+# L'AST (tuples (libellé, enfants) et chaînes) est parcouru directement par
+# minipython.ast_export, sans copie anytree
+def describe(node):
     if isinstance(node, tuple):
-        n = Node(node[0], parent=parent)
-        for c in node[1]:
-            build_anytree(c, n)
-        return n
-    elif isinstance(node, list):
-        n = Node("list", parent=parent)
-        for item in node:
-            build_anytree(item, n)
-        return n
-    else:
-        Node(str(node), parent=parent)
-    return parent
- 
-root_node = build_anytree(("Program", ast_semantic))
-print("\n=== AST visuel console ===")
-for pre, fill, node in RenderTree(root_node):
-    print(f"{pre}{node.name}")
+        return node[0], node[1]
+    if isinstance(node, list):
+        return "list", node
+    return str(node), ()
  
 # Export Graphviz (optionnel - peut être ignoré si problème d'installation)
-try:
-    # Exporter un fichier DOT local (sans passer par Temp)
-    DotExporter(root_node).to_dotfile("ast.dot")
-    print("\nFichier DOT généré : ast.dot")
+def export_graphviz(ast):
+    try:
+        # Exporter un fichier DOT local (sans passer par Temp)
+        export("ast.dot", "Program", ast, describe=describe)
+        print("\nFichier DOT généré : ast.dot")
+    except OSError as e:
+        print(f"\nErreur Graphviz : {e}")
+        return None
 
-    # Convertir DOT -> PNG sans fichier temporaire caché
-    import os
-    ret = os.system("dot -Tpng ast.dot -o ast_graphviz.png")
+    # Convertir DOT -> PNG en arrière-plan, sans fichier temporaire caché
+    render = start_render("ast.dot", "ast_graphviz.png")
+    if render is None:
+        print("\nErreur Graphviz : commande dot introuvable")
+        print("Pour installer: télécharger Graphviz depuis https://graphviz.org/download/")
+    return render
 
-    if ret == 0:
+def finish_graphviz(render):
+    error = wait_render(render)
+    if error is None:
         print("\nAST exporté en image : ast_graphviz.png")
     else:
         print("\nGraphviz installé mais l'exécution de 'dot' a échoué.")
-        print("Vérifie que Graphviz est dans le PATH. (where dot)")
-
-except Exception as e:
-    print(f"\nErreur Graphviz : {e}")
-    print("Pour installer: pip install graphviz ET télécharger Graphviz depuis https://graphviz.org/download/")
+        print(error)
 
 # ------------------------------
 # 6. Exécution MiniPython - VERSION CORRIGÉE
@@ -165,7 +154,7 @@ def execute(ast, symbol_table):
             if isinstance(val_expr, tuple) and val_expr[0] == 'Expr: +':
                 # Gestion de l'addition: y = x + 2
                 left_node = val_expr[1][0]
-                right_node = val_expr[2][0]
+                right_node = val_expr[1][1]
                
                 # Extraire les valeurs
                 if 'Var:' in left_node:
@@ -206,7 +195,34 @@ def execute(ast, symbol_table):
             var = stmt[1][0].split(': ')[1]
             print(f"PRINT: {runtime[var]}")
  
-print("\n=== Exécution MiniPython ===")
-execute(ast_semantic, symbol_table)
-print("=== Fin exécution ===")
+# ------------------------------
+# 7. Programme principal
+# ------------------------------
+def main():
+    print("\n=== Phase lexicale ===")
+    for t in iter_tokens(io.StringIO(code_source), lexer):
+        print((t.type, t.value))
+
+    ast, symbol_table = parse(lex(code_source))
+    print("\n=== AST syntaxique brut ===")
+    for node in ast:
+        print(node)
+
+    ast_semantic = semantic_check(ast, symbol_table)
+    print("\n=== AST après analyse sémantique ===")
+    for node in ast_semantic:
+        print(node)
+
+    print("\n=== AST visuel console ===")
+    write_text(walk("Program", ast_semantic, describe=describe), sys.stdout)
+    render = export_graphviz(ast_semantic)
+
+    print("\n=== Exécution MiniPython ===")
+    execute(ast_semantic, symbol_table)
+    print("=== Fin exécution ===")
+    if render is not None:
+        finish_graphviz(render)
+
+if __name__ == "__main__":
+    main()
  
\ No newline at end of file
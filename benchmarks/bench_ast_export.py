@@ -0,0 +1,110 @@
+# ------------------------------
+# Benchmark de l'export de l'AST
+# ------------------------------
+# Compare, sur des programmes synthétiques (parser descendant) :
+#  - anytree   : copie de l'AST en anytree.Node, puis DotExporter et
+#                RenderTree (ancienne approche des scripts) ;
+#  - streaming : minipython.ast_export parcourt l'AST et écrit au fil de
+#                l'eau.
+# Temps (meilleur de --repeat) et pic d'allocation (tracemalloc) pour le
+# fichier DOT et pour le dessin console.
+# Usage : python benchmarks/bench_ast_export.py [--sizes 1000,10000,50000]
+import argparse
+import io
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from minipython.ast_export import walk, write_dot, write_text
+from minipython.lexer import iter_tokens
+from minipython.parser import parse_program
+from programs import synthetic_program
+
+try:
+    from anytree import Node, RenderTree
+    from anytree.exporter import DotExporter
+except ImportError:
+    Node = None
+
+
+def build_anytree(node, parent=None):
+    n = Node(node.label, parent=parent)
+    for c in node.children():
+        if isinstance(c, str):
+            Node(c, parent=n)
+        else:
+            build_anytree(c, n)
+    return n
+
+
+def anytree_root(ast):
+    root = Node("Program")
+    for stmt in ast:
+        build_anytree(stmt, root)
+    return root
+
+
+def anytree_dot(ast, path):
+    DotExporter(anytree_root(ast)).to_dotfile(path)
+
+
+def anytree_text(ast, out):
+    for pre, _, n in RenderTree(anytree_root(ast)):
+        out.write(f"{pre}{n.name}\n")
+
+
+def streaming_dot(ast, path):
+    with open(path, "w", encoding="utf-8") as out:
+        write_dot(walk("Program", ast), out)
+
+
+def streaming_text(ast, out):
+    write_text(walk("Program", ast), out)
+
+
+def measure(fn, ast, target, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(ast, target() if callable(target) else target)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    tracemalloc.start()
+    fn(ast, target() if callable(target) else target)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return best, peak
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Benchmark de l'export de l'AST")
+    arg_parser.add_argument("--sizes", default="1000,10000,50000",
+                            help="nombres d'instructions des programmes générés")
+    arg_parser.add_argument("--repeat", type=int, default=3)
+    args = arg_parser.parse_args()
+
+    methods = {"streaming": (streaming_dot, streaming_text)}
+    if Node is not None:
+        methods = {"anytree": (anytree_dot, anytree_text), **methods}
+
+    print(f"{'instructions':>12} {'méthode':<10} {'DOT (s)':>9} {'pic DOT (Mo)':>13} "
+          f"{'console (s)':>12} {'pic console (Mo)':>17}")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "ast.dot")
+        for size in (int(s) for s in args.sizes.split(",")):
+            source = synthetic_program(size)
+            ast = parse_program(list(iter_tokens(io.StringIO(source))))
+            for name, (dot, text) in methods.items():
+                dot_time, dot_peak = measure(dot, ast, path, args.repeat)
+                text_time, text_peak = measure(text, ast, io.StringIO, args.repeat)
+                print(f"{size:>12} {name:<10} {dot_time:>9.3f} {dot_peak / 2 ** 20:>13.1f} "
+                      f"{text_time:>12.3f} {text_peak / 2 ** 20:>17.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+# ------------------------------
+# Boucles en forme close (minipython.closed_form) contre l'interprète
+# ------------------------------
+# 1. Vérification : des programmes aléatoires (boucles affines, compteurs
+#    croissants ou décroissants, toutes les comparaisons, valeurs qui
+#    dépassent 64 bits, divisions, booléens, boucles qui ne terminent pas,
+#    corps non affines) sont exécutés par minipython.governor avec et sans
+#    closed_form. Sorties, variables finales (valeur et type), nombre de
+#    pas et limite atteinte doivent être identiques.
+# 2. Temps : programmes de LOOP_PROGRAMS, pas à pas contre forme close.
+# Usage : python benchmarks/bench_closed_form.py [--programs 500] [--iterations 100000]
+import argparse
+import os
+import random
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from minipython.governor import Governor, LimitExceeded, run
+from minipython.lexer import tokenize
+from minipython.parser import parse_program
+from minipython.semantic import check
+from programs import LOOP_PROGRAMS
+
+NAMES = ["a", "b", "c", "s"]
+COMPARISONS = ["<", "<=", ">", ">=", "!=", "=="]
+
+
+def random_program(rng):
+    lines = [f"int {n};" for n in NAMES + ["i", "k"]]
+    for n in NAMES + ["k"]:
+        value = rng.choice(['0', str(rng.randint(-9, 9)), str(rng.randint(-9, 9)), '7 / 2', '1 < 2',
+                            '3 * 1000000000'])
+        lines.append(f"{n} = {value};")
+    for _ in range(rng.randint(1, 3)):
+        start, bound = rng.randint(-300, 300), rng.randint(-300, 300)
+        step = rng.choice([1, 1, 2, 3, -1, -2])
+        lines.append(f"i = {start};")
+        if rng.random() < 0.2:
+            lines.append(f"while ({bound} {rng.choice(COMPARISONS)} i) {{")
+        else:
+            bound_expr = rng.choice([str(bound), f"k + {bound}", f"{bound} / 2", f"k * 2"])
+            lines.append(f"while (i {rng.choice(COMPARISONS)} {bound_expr}) {{")
+        body = []
+        affine_only = rng.random() < 0.5
+        for _ in range(rng.randint(1, 4)):
+            x, y = rng.choice(NAMES), rng.choice(NAMES + ["i", "k"])
+            templates = [
+                f"{x} = {x} + i * {rng.randint(-5, 5)};",
+                f"{x} = {rng.randint(-3, 3)} * {x} + {y} - {rng.randint(0, 9)};",
+                f"{x} = -{y} + k * {x};",
+                f"{x} = {x} * 3 + 1;",
+                f"{x} = {y} - (k - 2) * i;",
+            ]
+            if not affine_only:
+                templates += [
+                    f"{x} = {y} - (k / 2) * i;",
+                    f"{x} = {x} * (i - i) + {y};",
+                    f"{x} = {x} + (k < 3);",
+                    f"print({x});",
+                ]
+            body.append(rng.choice(templates))
+        counter = f"i = i + {step};" if step > 0 else f"i = i - {-step};"
+        body.insert(rng.randint(0, len(body)), counter)
+        lines += ["    " + line for line in body] + ["}"]
+    lines.append("print(s);")
+    return "\n".join(lines) + "\n"
+
+
+def same(value):
+    # Clé de comparaison : 0 == 0.0 == False, et nan n'est pas égal à lui-même
+    if isinstance(value, float):
+        return "float", repr(value)
+    return type(value).__name__, value
+
+
+def execute(ast, symtab, closed_form, max_steps=20000):
+    # ((sorties, variables, pas ou arrêt), nombre d'appels à on_assign)
+    env = {name: 0 for name in symtab}
+    out = []
+    assigns = []
+    try:
+        steps = run(ast, env, Governor(max_steps=max_steps), on_print=out.append,
+                    on_assign=lambda name, value: assigns.append(name),
+                    closed_form=closed_form)
+    except LimitExceeded as e:
+        steps = ("limite", e.limit, e.steps)
+    except ArithmeticError as e:
+        steps = type(e).__name__
+    return (list(map(same, out)), {k: same(v) for k, v in env.items()}, steps), len(assigns)
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Forme close des boucles de comptage")
+    arg_parser.add_argument("--programs", type=int, default=500)
+    arg_parser.add_argument("--iterations", type=int, default=100000)
+    arg_parser.add_argument("--seed", type=int, default=0)
+    args = arg_parser.parse_args()
+
+    rng = random.Random(args.seed)
+    accelerated = 0
+    for n in range(args.programs):
+        source = random_program(rng)
+        ast, symtab = check(parse_program(tokenize(source)))
+        reference, assigns = execute(ast, symtab, False)
+        result, assigns_closed = execute(ast, symtab, True)
+        if result != reference:
+            raise SystemExit(f"programme {n} : résultats différents\n{source}\n"
+                             f"interprète : {reference}\nforme close : {result}")
+        # on_assign ne voit que les valeurs finales d'une boucle en forme close
+        accelerated += assigns_closed < assigns
+    print(f"{args.programs} programmes aléatoires : résultats identiques "
+          f"({accelerated} avec au moins une boucle en forme close)")
+
+    print(f"\n{'programme':<16} {'pas à pas (s)':>14} {'forme close (s)':>16}")
+    for name, make_program in LOOP_PROGRAMS.items():
+        iterations = args.iterations
+        if name == "nested_loops":
+            iterations = int(iterations ** 0.5) + 1
+        ast, symtab = check(parse_program(tokenize(make_program(iterations))))
+        timings = []
+        for closed_form in (False, True):
+            env = {k: 0 for k in symtab}
+            start = time.perf_counter()
+            run(ast, env, on_print=lambda v: None, closed_form=closed_form)
+            timings.append(time.perf_counter() - start)
+        print(f"{name:<16} {timings[0]:>14.3f} {timings[1]:>16.3f}")
+
+
+if __name__ == "__main__":
+    main()
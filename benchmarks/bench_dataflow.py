@@ -0,0 +1,78 @@
+# ------------------------------
+# Benchmark des passes globales de minipython.tac_opt
+# ------------------------------
+# Sur des programmes synthétiques (une graine par programme), compte les
+# instructions supprimées par chaque passe de optimize(), cumulées sur tous
+# les programmes, et le temps passé dans chacune. L'exécution par la VM du
+# TAC optimisé doit produire les mêmes PRINT et les mêmes valeurs finales
+# que le TAC d'origine.
+# Usage : python benchmarks/bench_dataflow.py [--statements 200] [--programs 50]
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from minipython.bytecode import assemble, run as run_bytecode
+from minipython.lexer import tokenize
+from minipython.parser import parse_program
+from minipython.semantic import check
+from minipython.tac import TACGenerator
+from minipython.tac_opt import DEFAULT_PASSES, format_tac, parse_tac
+from programs import synthetic_program
+
+
+def run_vm(tac, symtab):
+    # (lignes PRINT, variables finales, durée)
+    out = io.StringIO()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(out):
+        env = run_bytecode(assemble(tac, symtab))
+    elapsed = time.perf_counter() - start
+    return [l for l in out.getvalue().splitlines() if l.startswith("PRINT")], env, elapsed
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Benchmark des passes de flot de données")
+    arg_parser.add_argument("--statements", type=int, default=200)
+    arg_parser.add_argument("--programs", type=int, default=50)
+    args = arg_parser.parse_args()
+
+    removed = {}
+    timings = {}
+    before_total = after_total = 0
+    vm_before = vm_after = 0.0
+    for seed in range(args.programs):
+        ast, symtab = check(parse_program(tokenize(synthetic_program(args.statements, seed=seed))))
+        tac = TACGenerator().generate(ast)
+        code = parse_tac(tac)
+        for name, run_pass in DEFAULT_PASSES:
+            before = len(code)
+            start = time.perf_counter()
+            code = run_pass(code)
+            timings[name] = timings.get(name, 0.0) + time.perf_counter() - start
+            removed[name] = removed.get(name, 0) + before - len(code)
+        optimized = format_tac(code)
+
+        prints, env, elapsed = run_vm(tac, symtab)
+        prints_opt, env_opt, elapsed_opt = run_vm(optimized, symtab)
+        if (prints, env) != (prints_opt, env_opt):
+            raise SystemExit(f"graine {seed} : le TAC optimisé ne donne pas le même résultat")
+        before_total += len(tac)
+        after_total += len(optimized)
+        vm_before += elapsed
+        vm_after += elapsed_opt
+
+    print(f"{'passe':<24} {'supprimées':>11} {'temps (s)':>10}")
+    for name in removed:
+        print(f"{name:<24} {removed[name]:>11} {timings[name]:>10.3f}")
+    print(f"\n{args.programs} programmes : {before_total} -> {after_total} instructions, "
+          f"VM {vm_before:.3f} s -> {vm_after:.3f} s (sorties identiques)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+# ------------------------------
+# Benchmark des moteurs d'exécution de analyse_lark.py
+# ------------------------------
+# Compare le parcours d'AST ("tree") aux autres moteurs (analyse_lark.ENGINES)
+# et vérifie que tous produisent exactement la même sortie.
+# Usage : python benchmarks/bench_engines.py [--iterations N] [--repeat R]
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "version_lark"))
+
+import analyse_lark
+from minipython.lexer import tokenize
+from programs import LOOP_PROGRAMS
+
+
+# Petits programmes dont la sortie doit être identique sur tous les moteurs
+EDGE_CASES = {
+    # Variable nommée comme un temporaire du TAC
+    "temp_names": "int t2; int x; t2 = 5; x = t2 * 3 + t2; print(x);",
+    # && et || en court-circuit : l'opérande droit n'est pas évalué
+    "short_circuit": "int x; int y; x = 0; y = x && (1 / x); print(y);"
+                     "y = 2 || (1 / x); print(y); y = x || 3; print(y);"
+                     "while (y > 0 && (6 / y) > 1 || y == 3) { y = y - 1; print(y); }",
+    # Au-delà des limites de compile() : le moteur python passe aux fermetures
+    "deep_blocks": "int x; x = 0;" + " while (x < 1) {" * 25 + " x = x + 1;" + " }" * 25
+                   + " print(x);",
+    "deep_parens": "int x; x = " + "1 - (" * 300 + "1" + ")" * 300 + "; print(x);",
+}
+
+# (nom affiché, moteur, TAC optimisé)
+CONFIGS = [(engine, engine, False) for engine in analyse_lark.ENGINES] + [("vm -O", "vm", True)]
+
+
+def run_engine(ast, symtab, engine, optimize):
+    out = io.StringIO()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(out):
+        analyse_lark.execute(ast, symtab, engine=engine, optimize=optimize)
+    return time.perf_counter() - start, out.getvalue()
+
+
+def results(ast, symtab, engine, optimize):
+    # Valeurs affichées et variables finales : le TAC optimisé peut supprimer
+    # des STORE morts, et donc des lignes "EXEC" de la trace
+    out = io.StringIO()
+    with contextlib.redirect_stdout(out):
+        env = analyse_lark.execute(ast, symtab, engine=engine, optimize=optimize)
+    return [l for l in out.getvalue().splitlines() if l.startswith("PRINT")], env
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Benchmark des moteurs d'exécution")
+    arg_parser.add_argument("--iterations", type=int, default=20000)
+    arg_parser.add_argument("--repeat", type=int, default=3)
+    args = arg_parser.parse_args()
+
+    labels = [label for label, _, _ in CONFIGS]
+    for name, source in EDGE_CASES.items():
+        ast, symtab = analyse_lark.check_program(analyse_lark.parse_program(tokenize(source)))
+        outputs = {label: results(ast, symtab, engine, optimize)
+                   for label, engine, optimize in CONFIGS}
+        for label in labels:
+            if outputs[label] != outputs["tree"]:
+                raise SystemExit(f"{name} : la sortie du moteur {label} diffère de tree")
+    print(f"{len(EDGE_CASES)} cas limites : sorties identiques sur tous les moteurs\n")
+
+    print(f"{'programme':<16}" + "".join(f"{label + ' (s)':>14}" for label in labels))
+    for name, make_program in LOOP_PROGRAMS.items():
+        iterations = args.iterations
+        if name == "nested_loops":
+            iterations = int(iterations ** 0.5) + 1
+        ast, symtab = analyse_lark.check_program(
+            analyse_lark.parse_program(tokenize(make_program(iterations))))
+
+        timings = {}
+        outputs = {}
+        for label, engine, optimize in CONFIGS:
+            best = None
+            for _ in range(args.repeat):
+                elapsed, output = run_engine(ast, symtab, engine, optimize)
+                best = elapsed if best is None else min(best, elapsed)
+            timings[label] = best
+            outputs[label] = output
+
+        for label in labels:
+            if outputs[label] != outputs["tree"]:
+                raise SystemExit(f"{name} : la sortie du moteur {label} diffère de tree")
+        print(f"{name:<16}" + "".join(f"{timings[label]:>14.3f}" for label in labels))
+
+if __name__ == "__main__":
+    main()
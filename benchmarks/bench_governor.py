@@ -0,0 +1,108 @@
+# ------------------------------
+# Benchmark du coût de minipython.governor
+# ------------------------------
+# Sur les programmes de boucles (programs.LOOP_PROGRAMS), compare :
+#  - recursif : interprète récursif sans aucun compteur (ancien exec_stmt) ;
+#  - gouverne : minipython.governor.run sans limite ;
+#  - limites  : run avec limites de pas, de temps et de mémoire actives ;
+#  - tranches : le même programme lancé N fois en parallèle par un
+#               Scheduler (temps total divisé par N).
+# Vérifie aussi que les sorties et les variables finales sont identiques.
+# Usage : python benchmarks/bench_governor.py [--iterations N] [--programs N]
+import argparse
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from minipython.governor import Governor, Scheduler, evaluator, execution, run
+from minipython.lark_frontend import SemanticChecker
+from minipython.lexer import tokenize
+from minipython.nodes import Assign, If, Print, While
+from minipython.parser import parse_program
+from programs import LOOP_PROGRAMS
+
+
+def recursive(ast, env, out):
+    value = evaluator(env)
+
+    def exec_stmt(stmt):
+        if isinstance(stmt, Assign):
+            env[stmt.name] = value(stmt.value)
+        elif isinstance(stmt, Print):
+            out.append(value(stmt.value))
+        elif isinstance(stmt, While):
+            while value(stmt.cond):
+                for s in stmt.body.stmts:
+                    exec_stmt(s)
+        elif isinstance(stmt, If):
+            for s in (stmt.then if value(stmt.cond) else stmt.orelse).stmts:
+                exec_stmt(s)
+
+    for stmt in ast:
+        exec_stmt(stmt)
+
+
+def governed(ast, env, out):
+    run(ast, env, on_print=out.append)
+
+
+def limited(ast, env, out):
+    governor = Governor(max_steps=10 ** 12, max_seconds=3600, max_memory=1 << 30)
+    run(ast, env, governor, on_print=out.append)
+
+
+def timed(fn, ast, names, repeat):
+    best = None
+    for _ in range(repeat):
+        env, out = {k: 0 for k in names}, []
+        start = time.perf_counter()
+        fn(ast, env, out)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, (env, out)
+
+
+def sliced(ast, names, programs):
+    scheduler = Scheduler()
+    for k in range(programs):
+        scheduler.add(k, execution(ast, {n: 0 for n in names}, on_print=lambda v: None))
+    start = time.perf_counter()
+    scheduler.run()
+    return (time.perf_counter() - start) / programs
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Coût de l'exécution gouvernée")
+    arg_parser.add_argument("--iterations", type=int, default=50000)
+    arg_parser.add_argument("--programs", type=int, default=8,
+                            help="programmes exécutés par tranches en même temps")
+    arg_parser.add_argument("--repeat", type=int, default=3)
+    args = arg_parser.parse_args()
+
+    methods = {"recursif": recursive, "gouverne": governed, "limites": limited}
+    print(f"{'programme':<16}" + "".join(f"{name + ' (s)':>14}" for name in methods)
+          + f"{'tranches (s)':>14}{'surcoût':>9}")
+    for name, make_program in LOOP_PROGRAMS.items():
+        iterations = args.iterations
+        if name == "nested_loops":
+            iterations = int(iterations ** 0.5) + 1
+        checker = SemanticChecker()
+        ast = checker.check(parse_program(tokenize(make_program(iterations))))
+        names = list(checker.symbol_table)
+
+        timings, results = {}, {}
+        for label, fn in methods.items():
+            timings[label], results[label] = timed(fn, ast, names, args.repeat)
+        if any(r != results["recursif"] for r in results.values()):
+            print(f"{name}: résultats différents !")
+        per_program = sliced(ast, names, args.programs)
+        overhead = timings["limites"] / timings["recursif"] - 1
+        print(f"{name:<16}" + "".join(f"{timings[label]:>14.3f}" for label in methods)
+              + f"{per_program:>14.3f}{overhead:>+9.0%}")
+
+
+if __name__ == "__main__":
+    main()
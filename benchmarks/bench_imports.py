@@ -0,0 +1,74 @@
+# ------------------------------
+# Coût d'import des points d'entrée (python -X importtime)
+# ------------------------------
+# Chaque import est fait dans un processus neuf, comme un worker de courte
+# durée : temps d'import cumulé du module visé (médiane de --repeat) et
+# dépendances lourdes effectivement chargées.
+# Usage : python benchmarks/bench_imports.py [--repeat 7]
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# (libellé, répertoire ajouté à sys.path, instruction d'import)
+TARGETS = [
+    ("minipython", ROOT, "import minipython"),
+    ("minipython.tokenize", ROOT, "from minipython import tokenize; tokenize('int x;')"),
+    ("minipython.lexer", ROOT, "import minipython.lexer"),
+    ("minipython.batch", ROOT, "import minipython.batch"),
+    ("minipython.service", ROOT, "import minipython.service"),
+    ("analyse_lark", os.path.join(ROOT, "version_lark"), "import analyse_lark"),
+    ("minipython_complete", os.path.join(ROOT, "Codes_Sources"), "import minipython_complete"),
+    ("prgPythonPur", os.path.join(ROOT, "Codes_Sources"), "import prgPythonPur"),
+    ("analyse_minipython", os.path.join(ROOT, "Codes_Sources", "Analyse_Lark_Automatique"),
+     "import analyse_minipython"),
+]
+
+HEAVY = ("lark", "anytree", "subprocess", "json", "tracemalloc", "asyncio",
+         "concurrent.futures", "hashlib")
+
+
+def import_times(path, statement):
+    # (temps cumulé en µs de tous les imports de premier niveau, modules chargés)
+    code = f"import sys; sys.path.insert(0, {path!r}); {statement}"
+    process = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                             capture_output=True, text=True)
+    if process.returncode != 0:
+        return None, set()
+    err = process.stderr
+    total = 0
+    loaded = set()
+    for line in err.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        loaded.add(name.strip())
+        if not name.startswith("  "):
+            # Premier niveau (hors modules déjà chargés au démarrage de Python)
+            total += int(cumulative)
+    return total, loaded
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Coût d'import des points d'entrée")
+    arg_parser.add_argument("--repeat", type=int, default=7)
+    args = arg_parser.parse_args()
+
+    # Imports faits par -c lui-même (sys), retranchés de chaque mesure
+    baseline = statistics.median(import_times(ROOT, "pass")[0] for _ in range(args.repeat))
+    print(f"{'point d entrée':<22} {'import (ms)':>12}  dépendances lourdes chargées")
+    for label, path, statement in TARGETS:
+        runs = [import_times(path, statement) for _ in range(args.repeat)]
+        if runs[0][0] is None:
+            print(f"{label:<22} {'échec':>12}")
+            continue
+        median = statistics.median(t for t, _ in runs) - baseline
+        heavy = [m for m in HEAVY if m in runs[0][1]]
+        print(f"{label:<22} {median / 1000:>12.1f}  {', '.join(heavy) or '-'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+# ------------------------------
+# Benchmark de l'analyse incrémentale
+# ------------------------------
+# Pour des programmes de tailles croissantes, compare le temps d'une
+# réanalyse complète (lexing + parse_program) au temps par édition de
+# minipython.incremental.Document, sur trois scénarios au milieu du texte :
+#  - digit  : remplacement d'un chiffre ;
+#  - type   : frappe d'une instruction caractère par caractère ;
+#  - delete : effacement d'une ligne caractère par caractère.
+# Chaque édition renvoie l'AST modifié et les diagnostics ; le temps par
+# édition doit dépendre de l'édition, pas de la taille du fichier.
+# Usage : python benchmarks/bench_incremental.py [--sizes 1000,10000,40000]
+import argparse
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from minipython.incremental import Document
+from minipython.lexer import iter_tokens
+from minipython.parser import parse_program
+from programs import synthetic_program
+
+TYPED = "v3 = (v1 + 2) * v4;\n"
+
+
+def full_parse(source):
+    import io
+    return parse_program(list(iter_tokens(io.StringIO(source))))
+
+
+def middle_line(text):
+    # Début d'une ligne "vN = ...;" de premier niveau proche du milieu
+    pos = text.index("\nv", len(text) // 2) + 1
+    return pos, text.index("\n", pos) + 1
+
+
+def scenario_digit(doc, text):
+    pos = next(i for i in range(len(text) // 2, len(text)) if text[i].isdigit())
+    edits = [(pos, pos + 1, str(k % 10)) for k in range(20)]
+    return edits
+
+
+def scenario_type(doc, text):
+    start, _ = middle_line(text)
+    return [(start + k, start + k, ch) for k, ch in enumerate(TYPED)]
+
+
+def scenario_delete(doc, text):
+    start, end = middle_line(text)
+    return [(pos - 1, pos, "") for pos in range(end, start, -1)]
+
+
+SCENARIOS = {"digit": scenario_digit, "type": scenario_type, "delete": scenario_delete}
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Benchmark de l'analyse incrémentale")
+    arg_parser.add_argument("--sizes", default="1000,10000,40000",
+                            help="nombres d'instructions des programmes générés")
+    args = arg_parser.parse_args()
+
+    print(f"{'lignes':>8} {'complet (ms)':>13} {'chargement (ms)':>16}"
+          + "".join(f"{name + ' (ms/éd.)':>18}" for name in SCENARIOS))
+    for size in (int(s) for s in args.sizes.split(",")):
+        source = synthetic_program(size)
+        start = time.perf_counter()
+        full_parse(source)
+        full = time.perf_counter() - start
+
+        start = time.perf_counter()
+        Document(source)
+        load = time.perf_counter() - start
+
+        cells = []
+        for name, scenario in SCENARIOS.items():
+            doc = Document(source)
+            edits = scenario(doc, source)
+            start = time.perf_counter()
+            for edit in edits:
+                doc.edit(*edit)
+            elapsed = time.perf_counter() - start
+            cells.append(f"{elapsed / len(edits) * 1000:>18.3f}")
+        lines = source.count("\n")
+        print(f"{lines:>8} {full * 1000:>13.1f} {load * 1000:>16.1f}" + "".join(cells))
+
+
+if __name__ == "__main__":
+    main()
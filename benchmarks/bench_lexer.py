@@ -0,0 +1,83 @@
+# ------------------------------
+# Benchmark du lexer : tokens par seconde
+# ------------------------------
+# Compare sur un même programme synthétique :
+#  - finditer    : ancienne approche (un motif par mot-clé, lastgroup,
+#                  caractères inconnus ignorés), reproduite ci-dessous ;
+#  - tokenize    : minipython.lexer.tokenize (motif ID unique + dictionnaire
+#                  des mots-clés, dispatch par lastindex) ;
+#  - iter_tokens : lexer incrémental, avec ligne et colonne ;
+#  - lark basic  : lexer "basic" de Lark sur minipython.lark.
+# Usage : python benchmarks/bench_lexer.py [--statements 20000] [--repeat 5]
+import argparse
+import io
+import os
+import re
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from minipython.lark_parser import get_parser
+from minipython.lexer import iter_tokens, tokenize
+from programs import synthetic_program
+
+OLD_SPECIFICATION = [
+    ('INT', r'int'), ('FLOAT', r'float'), ('BOOL', r'bool'),
+    ('STRING', r'string'), ('PRINT', r'print'), ('WHILE', r'while'),
+    ('IF', r'if'), ('ELSE', r'else'), ('FOR', r'for'),
+    ('TRUE', r'true'), ('FALSE', r'false'),
+    ('EQEQ', r'=='), ('NEQ', r'!='), ('LTE', r'<='), ('GTE', r'>='),
+    ('LT', r'<'), ('GT', r'>'),
+    ('AND', r'&&'), ('OR', r'\|\|'), ('NOT', r'!'),
+    ('PLUS', r'\+'), ('MINUS', r'-'),
+    ('STAR', r'\*'), ('SLASH', r'/'),
+    ('EQUAL', r'='),
+    ('LPAR', r'\('), ('RPAR', r'\)'),
+    ('LBRACE', r'\{'), ('RBRACE', r'\}'),
+    ('SEMICOLON', r';'),
+    ('FLOATNUM', r'\d+\.\d+'),
+    ('NUMBER', r'\d+'),
+    ('STRINGLIT', r'"[^"]*"'),
+    ('ID', r'[A-Za-z_]\w*'),
+    ('SKIP', r'[ \t\n]+'),
+]
+OLD_REGEX = '|'.join(f'(?P<{n}>{p})' for n, p in OLD_SPECIFICATION)
+
+
+def old_tokenize(code):
+    return [(m.lastgroup, m.group()) for m in re.finditer(OLD_REGEX, code)
+            if m.lastgroup != 'SKIP']
+
+
+LEXERS = {
+    "finditer": old_tokenize,
+    "tokenize": tokenize,
+    "iter_tokens": lambda code: list(iter_tokens(io.StringIO(code))),
+    "lark basic": lambda code: list(get_parser().lex(code)),
+}
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Benchmark du lexer")
+    arg_parser.add_argument("--statements", type=int, default=20000)
+    arg_parser.add_argument("--repeat", type=int, default=5)
+    args = arg_parser.parse_args()
+
+    source = synthetic_program(args.statements)
+    get_parser()
+    print(f"programme : {len(source) // 1024} Ko")
+    print(f"{'lexer':<12} {'tokens':>9} {'temps (s)':>10} {'tokens/s':>12}")
+    for name, lex in LEXERS.items():
+        best = None
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            tokens = lex(source)
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        print(f"{name:<12} {len(tokens):>9} {best:>10.3f} {len(tokens) / best:>12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
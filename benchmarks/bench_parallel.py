@@ -0,0 +1,98 @@
+# ------------------------------
+# Débit de minipython.parallel sur un lot de jobs
+# ------------------------------
+# Lot type « correction de copies » : --programs programmes distincts (une
+# boucle de comptage avec un if, des constantes propres à chaque copie,
+# quelques copies fausses ou sans fin), exécutés chacun sur plusieurs
+# entrées, --jobs jobs au total.
+#  - par job  : compilation puis exécution pour chaque job, comme execute()
+#               d'analyse_lark.py, dans un seul processus ;
+#  - run_jobs : minipython.parallel avec 1, 2, 4... processus.
+# Les résultats doivent être identiques quel que soit le nombre de
+# processus ; le débit doit croître avec le nombre de coeurs.
+# Usage : python benchmarks/bench_parallel.py [--jobs 10000] [--programs 200] [--workers 1,2,4]
+import argparse
+import os
+import random
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from minipython.compile_cache import CompiledProgram
+from minipython.parallel import compile_source, run_job, run_jobs
+
+
+def submission(rng):
+    # Somme des termes au-dessus d'un seuil, pour n donné en entrée
+    a, b, m = rng.randint(1, 9), rng.randint(0, 9), rng.randint(2, 7)
+    step = "i = i + 1;" if rng.random() > 0.02 else ""        # boucle sans fin
+    declared = "int n; int i; int s;" + (" int t;" if rng.random() > 0.02 else "")
+    return f"""
+{declared}
+i = 0;
+s = 0;
+while (i < n) {{
+    t = i * {a} + {b};
+    if (t > {m} * 40) {{
+        s = s + t;
+    }}
+    if (t < {m} * 40) {{
+        s = s - 1;
+    }}
+    {step}
+}}
+print(s);
+print(s / n);
+"""
+
+
+def per_job(jobs, budget):
+    # Référence : le programme est recompilé à chaque job
+    results = []
+    for source, inputs in jobs:
+        data, errors = compile_source(source)
+        if data is None:
+            results.append({"success": False, "diagnostics": errors})
+        else:
+            results.append(run_job(CompiledProgram.from_bytes(data), inputs, budget, None))
+    return results
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Débit de minipython.parallel")
+    arg_parser.add_argument("--jobs", type=int, default=10000)
+    arg_parser.add_argument("--programs", type=int, default=200)
+    arg_parser.add_argument("--workers", default=",".join(
+        str(1 << k) for k in range((os.cpu_count() or 1).bit_length())))
+    arg_parser.add_argument("--budget", type=int, default=20000)
+    args = arg_parser.parse_args()
+
+    rng = random.Random(0)
+    sources = [submission(rng) for _ in range(args.programs)]
+    jobs = [(rng.choice(sources), {"n": rng.randint(0, 300)}) for _ in range(args.jobs)]
+    print(f"{args.jobs} jobs, {args.programs} programmes, {os.cpu_count()} coeurs")
+
+    start = time.perf_counter()
+    reference = per_job(jobs, args.budget)
+    baseline = time.perf_counter() - start
+    print(f"\n{'mode':<16} {'temps (s)':>10} {'jobs/s':>10} {'accélération':>13}")
+    print(f"{'par job':<16} {baseline:>10.2f} {args.jobs / baseline:>10.0f} {1:>13.2f}")
+
+    single = None
+    for workers in map(int, args.workers.split(",")):
+        start = time.perf_counter()
+        results = run_jobs(jobs, workers, budget=args.budget)
+        elapsed = time.perf_counter() - start
+        if results != reference:
+            raise SystemExit(f"run_jobs ({workers} processus) : résultats différents")
+        single = single or elapsed
+        print(f"{f'run_jobs -j {workers}':<16} {elapsed:>10.2f} {args.jobs / elapsed:>10.0f} "
+              f"{baseline / elapsed:>13.2f}   (x{single / elapsed:.2f} contre -j 1)")
+    failures = sum(not r["success"] for r in reference)
+    print(f"\nrésultats identiques ({failures} jobs en échec : erreurs, budget dépassé)")
+
+
+if __name__ == "__main__":
+    main()
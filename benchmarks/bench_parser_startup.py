@@ -0,0 +1,65 @@
+# ------------------------------
+# Benchmark : temps de construction du parser Lark
+# ------------------------------
+# Trois chemins sont mesurés :
+#  - cold       : nouveau processus, cache disque vide (tables LALR calculées)
+#  - warm-disk  : nouveau processus, tables relues depuis le cache disque
+#  - in-process : second appel à get_parser() dans le même processus
+# Pour les deux premiers, on mesure aussi la durée totale du processus.
+# Usage : python benchmarks/bench_parser_startup.py [--repeat R]
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+CHILD = """
+import time
+start = time.perf_counter()
+from minipython.lark_parser import get_parser
+get_parser()
+print(time.perf_counter() - start)
+"""
+
+
+def run_child(cache_dir):
+    env = dict(os.environ, MINIPYTHON_CACHE_DIR=cache_dir, PYTHONPATH=ROOT)
+    start = time.perf_counter()
+    out = subprocess.run([sys.executable, "-c", CHILD], env=env, check=True,
+                         capture_output=True, text=True).stdout
+    return float(out), time.perf_counter() - start
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Benchmark du démarrage du parser Lark")
+    arg_parser.add_argument("--repeat", type=int, default=5)
+    args = arg_parser.parse_args()
+
+    results = {"cold": [], "warm-disk": []}
+    for _ in range(args.repeat):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            results["cold"].append(run_child(cache_dir))
+            results["warm-disk"].append(run_child(cache_dir))
+
+    from minipython.lark_parser import get_parser
+    get_parser()
+    in_process = []
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        get_parser()
+        in_process.append(time.perf_counter() - start)
+
+    print(f"{'chemin':<12} {'get_parser (ms)':>16} {'processus (ms)':>15}")
+    for name, samples in results.items():
+        parser_time = min(s[0] for s in samples) * 1000
+        process_time = min(s[1] for s in samples) * 1000
+        print(f"{name:<12} {parser_time:>16.2f} {process_time:>15.2f}")
+    print(f"{'in-process':<12} {min(in_process) * 1000:>16.4f} {'-':>15}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,204 @@
+# ------------------------------
+# Benchmark de chaque phase des trois chaînes de compilation
+# ------------------------------
+# Les mêmes phases sont mesurées séparément pour :
+#  - prgPythonPur.py       (lexer regex + analyse ad hoc, sous-ensemble plat)
+#  - analyse_lark.py       (lexer minipython.lexer + parser descendant)
+#  - minipython_complete.py (Lark LALR + SyntaxTransformer)
+# sur des programmes synthétiques (benchmarks/programs.py) de taille et de
+# profondeur d'imbrication configurables. Chaque phase garde le meilleur
+# temps sur --repeat exécutions. Les résultats sont écrits en JSON et
+# comparés à la référence benchmarks/baseline.json : le script sort avec
+# le code 1 si une phase a ralenti de plus de --threshold ou n'a pas de
+# référence. Une référence absente ou mesurée avec une autre configuration
+# est une erreur, pas une comparaison sautée (--no-baseline pour mesurer
+# sans comparer). Les temps dépendent de la machine : réenregistrer la
+# référence avant de comparer sur une autre machine.
+# Usage :
+#   python benchmarks/bench_phases.py
+#   python benchmarks/bench_phases.py --save-baseline benchmarks/baseline.json
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE = os.path.join(ROOT, "benchmarks", "baseline.json")
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "version_lark"))
+sys.path.insert(0, os.path.join(ROOT, "Codes_Sources"))
+
+import analyse_lark
+import minipython_complete
+import prgPythonPur
+from minipython.lexer import iter_tokens
+from programs import flat_program, synthetic_program
+
+PHASES = ("lex", "parse", "semantic", "tac", "execute")
+
+# Différence absolue (s) en dessous de laquelle un écart n'est que du bruit
+NOISE_FLOOR = 0.001
+
+
+# ------------------------------
+# Chaînes mesurées
+# ------------------------------
+# clock(phase, fn, *args) exécute fn(*args), mesure sa durée et renvoie son
+# résultat. Une phase absente d'une chaîne n'est simplement pas mesurée.
+
+def run_pure(source, clock):
+    tokens = clock("lex", lambda: list(iter_tokens(io.StringIO(source), prgPythonPur.lexer)))
+    ast, symtab = clock("parse", prgPythonPur.parse, tokens)
+    ast = clock("semantic", prgPythonPur.semantic_check, ast, symtab)
+    clock("execute", prgPythonPur.execute, ast, symtab)
+
+
+def run_analyse_lark(source, clock):
+    tokens = clock("lex", lambda: list(iter_tokens(io.StringIO(source))))
+    ast = clock("parse", analyse_lark.parse_program, tokens)
+    ast, symtab = clock("semantic", analyse_lark.check_program, ast)
+    clock("tac", lambda: analyse_lark.TACGenerator().generate(ast))
+    clock("execute", analyse_lark.execute, ast, symtab)
+
+
+def run_lark(source, clock):
+    # parser.parse() relance son propre lexer : "parse" inclut le lexing
+    clock("lex", minipython_complete.lex, source)
+    ast = clock("parse", minipython_complete.parse, source)
+    ast, symtab = clock("semantic", minipython_complete.check, ast)
+    clock("tac", lambda: analyse_lark.TACGenerator().generate(ast))
+    clock("execute", minipython_complete.execute, ast, symtab)
+
+
+PIPELINES = {
+    "prgPythonPur": (run_pure, "flat"),
+    "analyse_lark": (run_analyse_lark, "structured"),
+    "minipython_complete": (run_lark, "structured"),
+}
+
+
+def measure(run, source, repeat):
+    best = {}
+
+    def clock(phase, fn, *args):
+        start = time.perf_counter()
+        result = fn(*args)
+        elapsed = time.perf_counter() - start
+        best[phase] = min(elapsed, best.get(phase, elapsed))
+        return result
+
+    for _ in range(repeat):
+        with contextlib.redirect_stdout(io.StringIO()):
+            run(source, clock)
+    return {phase: best[phase] for phase in PHASES if phase in best}
+
+
+# ------------------------------
+# Comparaison à la référence
+# ------------------------------
+# Renvoie (régressions, phases mesurées sans référence)
+def compare(results, baseline, threshold):
+    regressions, missing = [], []
+    for pipeline, phases in results["pipelines"].items():
+        base_phases = baseline["pipelines"].get(pipeline, {})
+        for phase, seconds in phases.items():
+            base = base_phases.get(phase)
+            if base is None:
+                missing.append((pipeline, phase))
+            elif seconds > base * (1 + threshold) and seconds - base > NOISE_FLOOR:
+                regressions.append((pipeline, phase, base, seconds))
+    return regressions, missing
+
+
+def print_table(results, baseline=None):
+    print(f"{'chaîne':<21}" + "".join(f"{phase + ' (ms)':>16}" for phase in PHASES))
+    for pipeline, phases in results["pipelines"].items():
+        cells = []
+        for phase in PHASES:
+            if phase not in phases:
+                cells.append(f"{'-':>16}")
+                continue
+            cell = f"{phases[phase] * 1000:.2f}"
+            base = (baseline or {}).get("pipelines", {}).get(pipeline, {}).get(phase)
+            if base:
+                cell += f" ({phases[phase] / base:.2f}x)"
+            cells.append(f"{cell:>16}")
+        print(f"{pipeline:<21}" + "".join(cells))
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Benchmark des phases de compilation")
+    arg_parser.add_argument("--statements", type=int, default=2000,
+                            help="nombre d'instructions du programme généré")
+    arg_parser.add_argument("--depth", type=int, default=3, help="profondeur d'imbrication max")
+    arg_parser.add_argument("--trips", type=int, default=3, help="tours de chaque boucle")
+    arg_parser.add_argument("--seed", type=int, default=0)
+    arg_parser.add_argument("--repeat", type=int, default=5)
+    arg_parser.add_argument("--pipelines", default=",".join(PIPELINES),
+                            help="chaînes mesurées, séparées par des virgules")
+    arg_parser.add_argument("-o", "--output", help="fichier JSON des résultats")
+    arg_parser.add_argument("--baseline", default=BASELINE, help="référence JSON à comparer")
+    arg_parser.add_argument("--no-baseline", action="store_true",
+                            help="mesure sans comparer à une référence")
+    arg_parser.add_argument("--save-baseline", help="enregistre les résultats comme référence")
+    arg_parser.add_argument("--threshold", type=float, default=0.25,
+                            help="ralentissement toléré (0.25 = +25%%)")
+    args = arg_parser.parse_args()
+    config = {"statements": args.statements, "depth": args.depth, "trips": args.trips,
+              "seed": args.seed}
+
+    # La référence est lue avant de mesurer : une erreur n'attend pas la fin
+    baseline = None
+    saving = args.save_baseline and os.path.abspath(args.save_baseline) == os.path.abspath(
+        args.baseline)
+    if not args.no_baseline and not saving:
+        try:
+            with open(args.baseline, "r", encoding="utf-8") as f:
+                baseline = json.load(f)
+        except OSError as e:
+            arg_parser.error(f"référence illisible ({e}) : --save-baseline pour l'enregistrer, "
+                             "--no-baseline pour mesurer sans comparer")
+        except ValueError as e:
+            arg_parser.error(f"référence {args.baseline} invalide : {e}")
+        if baseline.get("config") != config:
+            arg_parser.error(f"référence {args.baseline} mesurée avec une autre configuration "
+                             f"({baseline.get('config')})")
+
+    sources = {
+        "structured": synthetic_program(args.statements, args.depth, args.trips, seed=args.seed),
+        "flat": flat_program(args.statements, seed=args.seed),
+    }
+    results = {
+        "config": config,
+        "repeat": args.repeat,
+        "python": platform.python_version(),
+        "pipelines": {},
+    }
+    for name in args.pipelines.split(","):
+        run, kind = PIPELINES[name]
+        results["pipelines"][name] = measure(run, sources[kind], args.repeat)
+
+    print_table(results, baseline)
+
+    for path in (args.output, args.save_baseline):
+        if path:
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(results, f, indent=2)
+
+    if baseline is not None:
+        regressions, missing = compare(results, baseline, args.threshold)
+        for pipeline, phase, base, seconds in regressions:
+            print(f"RÉGRESSION {pipeline}/{phase} : {base * 1000:.2f} ms -> "
+                  f"{seconds * 1000:.2f} ms", file=sys.stderr)
+        for pipeline, phase in missing:
+            print(f"SANS RÉFÉRENCE {pipeline}/{phase}", file=sys.stderr)
+        if regressions or missing:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
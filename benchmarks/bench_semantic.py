@@ -0,0 +1,72 @@
+# ------------------------------
+# Benchmark de l'analyse sémantique (minipython.semantic)
+# ------------------------------
+# Sur des programmes synthétiques de tailles croissantes, mesure la passe
+# sémantique (meilleur de --repeat) et son coût par noeud d'AST, qui doit
+# rester constant : la passe est linéaire. Le parse complet est donné pour
+# comparaison. Un programme de --depth while imbriqués vérifie en plus que
+# la passe ne dépend pas de la limite de récursion de Python.
+# Usage : python benchmarks/bench_semantic.py [--sizes 1000,10000,100000]
+import argparse
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from minipython.lexer import tokenize
+from minipython.nodes import ADD, LT, Assign, BinOp, Block, Decl, Num, Var, While
+from minipython.parser import parse_program
+from minipython.profiling import count_nodes
+from minipython.semantic import analyze
+from programs import synthetic_program
+
+
+def nested_program(depth):
+    # AST construit directement : le parser descendant est lui-même récursif
+    # sur les blocs. y n'est pas déclarée : une erreur attendue.
+    body = [Assign("x", BinOp(ADD, Var("x"), Var("y")))]
+    for _ in range(depth):
+        body = [While(BinOp(LT, Var("x"), Num(1)), Block(body))]
+    return [Decl(["x"]), Assign("x", Num(0))] + body
+
+
+def best_of(fn, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Benchmark de l'analyse sémantique")
+    arg_parser.add_argument("--sizes", default="1000,10000,100000",
+                            help="nombres d'instructions des programmes générés")
+    arg_parser.add_argument("--depth", type=int, default=5000,
+                            help="profondeur du programme de boucles imbriquées")
+    arg_parser.add_argument("--repeat", type=int, default=3)
+    args = arg_parser.parse_args()
+
+    print(f"{'instructions':>12} {'noeuds':>9} {'parse (s)':>10} {'sémantique (s)':>15} "
+          f"{'ns/noeud':>9} {'erreurs':>8}")
+    for size in (int(s) for s in args.sizes.split(",")):
+        source = synthetic_program(size)
+        parse_time, ast = best_of(lambda: parse_program(tokenize(source)), 1)
+        nodes = count_nodes(ast)
+        check_time, analysis = best_of(lambda: analyze(ast), args.repeat)
+        print(f"{size:>12} {nodes:>9} {parse_time:>10.3f} {check_time:>15.3f} "
+              f"{check_time / nodes * 1e9:>9.0f} {len(analysis.errors):>8}")
+
+    ast = nested_program(args.depth)
+    check_time, analysis = best_of(lambda: analyze(ast), 1)
+    print(f"\n{args.depth} boucles imbriquées (limite de récursion "
+          f"{sys.getrecursionlimit()}) : "
+          f"{check_time:.3f} s, erreurs : {[str(e) for e in analysis.errors]}")
+
+
+if __name__ == "__main__":
+    main()
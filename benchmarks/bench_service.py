@@ -0,0 +1,112 @@
+# ------------------------------
+# Générateur de charge pour minipython.service
+# ------------------------------
+# Lance le service sur un port libre (sous-processus), puis ouvre
+# --clients connexions persistantes qui envoient en boucle, pendant
+# --duration secondes, un mélange de requêtes compile / check / run sur
+# les deux front-ends (dont une boucle sans fin arrêtée par le budget).
+# Rapporte les latences p50 / p99 et le débit, pour chaque --batch-size.
+# Usage : python benchmarks/bench_service.py [--clients 32] [--batch-sizes 1,16]
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from programs import synthetic_program
+
+SMALL = "int x, y; x = 3; y = x * 2 + 1; while (x < 40) { x = x + y; } print(x);"
+
+MIX = [
+    ("compile", {"source": SMALL}),
+    ("check", {"source": SMALL, "frontend": "rd"}),
+    ("run", {"source": SMALL}),
+    ("compile", {"source": synthetic_program(50), "frontend": "rd"}),
+    ("run", {"source": "int x; x = 1; while (1 < 2) { }", "budget": 20000}),
+    ("check", {"source": "int x; y = 1;"}),
+]
+
+
+def start_service(batch_size, jobs):
+    process = subprocess.Popen(
+        [sys.executable, "-m", "minipython.service", "--port", "0", "-j", str(jobs),
+         "--batch-size", str(batch_size)],
+        cwd=ROOT, stdout=subprocess.PIPE, text=True)
+    ready = process.stdout.readline()
+    port = int(ready.rsplit(":", 1)[1].split()[0])
+    return process, port
+
+
+async def request(reader, writer, op, payload):
+    body = json.dumps(payload).encode("utf-8")
+    writer.write(f"POST /{op} HTTP/1.1\r\nHost: localhost\r\n"
+                 f"Content-Length: {len(body)}\r\n\r\n".encode("latin-1") + body)
+    await writer.drain()
+    status = (await reader.readline()).split()[1]
+    length = 0
+    while True:
+        header = await reader.readline()
+        if header in (b"\r\n", b""):
+            break
+        name, _, value = header.decode("latin-1").partition(":")
+        if name.lower() == "content-length":
+            length = int(value)
+    await reader.readexactly(length)
+    return int(status)
+
+
+async def client(port, index, stop, latencies, errors):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    k = index
+    while time.perf_counter() < stop:
+        op, payload = MIX[k % len(MIX)]
+        k += 1
+        start = time.perf_counter()
+        status = await request(reader, writer, op, payload)
+        latencies.append(time.perf_counter() - start)
+        if status != 200:
+            errors.append(status)
+    writer.close()
+
+
+async def load(port, clients, duration):
+    latencies, errors = [], []
+    stop = time.perf_counter() + duration
+    start = time.perf_counter()
+    await asyncio.gather(*(client(port, i, stop, latencies, errors) for i in range(clients)))
+    return latencies, errors, time.perf_counter() - start
+
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p))]
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Charge du service MiniPython")
+    arg_parser.add_argument("--clients", type=int, default=32)
+    arg_parser.add_argument("--duration", type=float, default=5.0)
+    arg_parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count())
+    arg_parser.add_argument("--batch-sizes", default="1,16")
+    args = arg_parser.parse_args()
+
+    print(f"{'lot':>4} {'requêtes':>9} {'req/s':>8} {'p50 (ms)':>9} {'p99 (ms)':>9} {'erreurs':>8}")
+    for batch_size in (int(b) for b in args.batch_sizes.split(",")):
+        process, port = start_service(batch_size, args.jobs)
+        try:
+            latencies, errors, elapsed = asyncio.run(load(port, args.clients, args.duration))
+        finally:
+            process.terminate()
+            process.wait()
+        print(f"{batch_size:>4} {len(latencies):>9} {len(latencies) / elapsed:>8.0f} "
+              f"{percentile(latencies, 0.5) * 1000:>9.1f} {percentile(latencies, 0.99) * 1000:>9.1f} "
+              f"{len(errors):>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+# ------------------------------
+# Benchmark : Lark en deux passes contre Lark en une passe
+# ------------------------------
+# - two-pass    : parser.parse() construit un lark.Tree complet, puis
+#                 SyntaxTransformer().transform(tree) le reparcourt ;
+# - single-pass : SyntaxTransformer est appliqué pendant l'analyse LALR
+#                 (lark_frontend.get_ast_parser), sans arbre intermédiaire.
+# Chaque mode tourne dans son propre processus : temps (meilleur de
+# --repeat), pic d'allocation Python (tracemalloc) et pic RSS.
+# Usage : python benchmarks/bench_single_pass.py [--sizes 1000,10000,50000]
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from programs import synthetic_program
+
+MODES = ("two-pass", "single-pass")
+
+
+def run_mode(mode, statements, repeat):
+    from minipython.lark_frontend import parse, get_ast_parser
+    from minipython.lark_parser import get_parser
+
+    source = synthetic_program(statements)
+    single_pass = mode == "single-pass"
+    get_ast_parser() if single_pass else get_parser()
+
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        ast = parse(source, single_pass=single_pass)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+        del ast
+
+    tracemalloc.start()
+    ast = parse(source, single_pass=single_pass)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(json.dumps({"seconds": best, "peak_mb": peak / 2 ** 20, "rss_mb": rss_kb / 1024,
+                      "bytes": len(source), "statements": len(ast)}))
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Benchmark du mode Lark une passe")
+    arg_parser.add_argument("--sizes", default="1000,10000,50000",
+                            help="nombres d'instructions des programmes générés")
+    arg_parser.add_argument("--repeat", type=int, default=3)
+    arg_parser.add_argument("--mode", help=argparse.SUPPRESS)
+    arg_parser.add_argument("--statements", type=int, help=argparse.SUPPRESS)
+    args = arg_parser.parse_args()
+
+    if args.mode:
+        run_mode(args.mode, args.statements, args.repeat)
+        return
+
+    print(f"{'instructions':>12} {'Ko':>7} {'mode':<12} {'temps (s)':>10} "
+          f"{'pic alloc (Mo)':>15} {'pic RSS (Mo)':>13}")
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    for size in (int(s) for s in args.sizes.split(",")):
+        for mode in MODES:
+            out = subprocess.run([sys.executable, __file__, "--mode", mode,
+                                  "--statements", str(size), "--repeat", str(args.repeat)],
+                                 env=env, check=True, capture_output=True, text=True).stdout
+            r = json.loads(out)
+            print(f"{size:>12} {r['bytes'] // 1024:>7} {mode:<12} {r['seconds']:>10.3f} "
+                  f"{r['peak_mb']:>15.1f} {r['rss_mb']:>13.1f}")
+
+
+if __name__ == "__main__":
+    main()
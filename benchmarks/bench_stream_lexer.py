@@ -0,0 +1,96 @@
+# ------------------------------
+# Benchmark : lexer complet (tokenize) contre lexer incrémental
+# ------------------------------
+# Pour chaque taille, un programme MiniPython est généré dans un fichier
+# temporaire puis analysé dans un processus séparé par mode, afin de mesurer
+# le pic mémoire réel (ru_maxrss) de chaque mode :
+#  - eager        : f.read() + tokenize() (liste complète)
+#  - stream       : iter_tokens() sur le fichier
+#  - stream-parse : iter_statements(stream_tokens()) sans garder l'AST
+# Usage : python benchmarks/bench_stream_lexer.py [--sizes 1,10,100] [--eager-limit 10]
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+BLOCK = """x = x + 1;
+y = (x * 3 + y) / 2;
+if (x == 10) {
+    print(y);
+}
+while (y > 100) {
+    y = y - 7;
+}
+"""
+
+
+def write_program(path, megabytes):
+    target = megabytes * 1024 * 1024
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("int x;\nint y;\nx = 1;\ny = 1;\n")
+        written = 0
+        block = BLOCK * 64
+        while written < target:
+            f.write(block)
+            written += len(block)
+
+
+def run_mode(mode, path):
+    from minipython.lexer import iter_tokens, stream_tokens, tokenize
+    from minipython.parser import iter_statements
+
+    start = time.perf_counter()
+    count = 0
+    with open(path, "r", encoding="utf-8") as f:
+        if mode == "eager":
+            count = len(tokenize(f.read()))
+        elif mode == "stream":
+            for _ in iter_tokens(f):
+                count += 1
+        elif mode == "stream-parse":
+            for _ in iter_statements(stream_tokens(f)):
+                count += 1
+    elapsed = time.perf_counter() - start
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(json.dumps({"count": count, "seconds": elapsed, "peak_mb": peak_kb / 1024}))
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Benchmark du lexer incrémental")
+    arg_parser.add_argument("--sizes", default="1,10,100", help="tailles en Mo")
+    arg_parser.add_argument("--eager-limit", type=float, default=10,
+                            help="taille max (Mo) pour le mode eager")
+    arg_parser.add_argument("--mode", help=argparse.SUPPRESS)
+    arg_parser.add_argument("--file", help=argparse.SUPPRESS)
+    args = arg_parser.parse_args()
+
+    if args.mode:
+        run_mode(args.mode, args.file)
+        return
+
+    print(f"{'taille':>7} {'mode':<13} {'éléments':>10} {'temps (s)':>10} "
+          f"{'Mo/s':>7} {'pic RSS (Mo)':>13}")
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    for size in (float(s) for s in args.sizes.split(",")):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "programme.minipy")
+            write_program(path, size)
+            for mode in ("eager", "stream", "stream-parse"):
+                if mode == "eager" and size > args.eager_limit:
+                    continue
+                out = subprocess.run([sys.executable, __file__, "--mode", mode, "--file", path],
+                                     env=env, check=True, capture_output=True, text=True).stdout
+                r = json.loads(out)
+                print(f"{size:>5g}Mo {mode:<13} {r['count']:>10} {r['seconds']:>10.2f} "
+                      f"{size / r['seconds']:>7.2f} {r['peak_mb']:>13.1f}")
+
+
+if __name__ == "__main__":
+    main()
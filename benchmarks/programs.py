@@ -0,0 +1,167 @@
+# ------------------------------
+# Générateur de programmes MiniPython pour les benchmarks
+# ------------------------------
+import random
+
+
+def counting_loop(iterations):
+    # Boucle simple : un compteur et un accumulateur
+    return f"""
+int i;
+int s;
+i = 1;
+s = 1;
+while (i < {iterations}) {{
+    s = s + i * 3;
+    i = i + 1;
+}}
+print(s);
+"""
+
+
+def branching_loop(iterations):
+    # Boucle avec un if dans le corps
+    return f"""
+int i;
+int s;
+i = 1;
+s = 1;
+while (i < {iterations}) {{
+    s = s + i * 3;
+    if (s > 1000) {{
+        s = s - 997;
+    }}
+    i = i + 1;
+}}
+print(s);
+"""
+
+
+def nested_loops(iterations):
+    # Deux boucles imbriquées : iterations^2 tours au total
+    return f"""
+int i;
+int j;
+int s;
+i = 1;
+s = 1;
+while (i < {iterations}) {{
+    j = 1;
+    while (j < {iterations}) {{
+        s = s + i * j;
+        j = j + 1;
+    }}
+    i = i + 1;
+}}
+print(s);
+"""
+
+
+def invariant_loop(iterations):
+    # Corps avec des sous-expressions invariantes (a, b et n ne changent pas
+    # dans la seconde boucle) et un produit par le compteur
+    return f"""
+int i;
+int a;
+int b;
+int n;
+int s;
+i = 0;
+a = 1;
+b = 2;
+while (i < 3) {{
+    a = a + i;
+    b = b * 2;
+    i = i + 1;
+}}
+n = {iterations};
+i = 0;
+s = 0;
+while (i < n - 1) {{
+    s = s + (a * b - n) / 2 + i * 5;
+    i = i + 1;
+}}
+print(s);
+"""
+
+
+LOOP_PROGRAMS = {
+    "counting_loop": counting_loop,
+    "branching_loop": branching_loop,
+    "nested_loops": nested_loops,
+    "invariant_loop": invariant_loop,
+}
+
+
+# ------------------------------
+# Programmes synthétiques
+# ------------------------------
+# Sous-ensemble commun au parser descendant (analyse_lark.py) et à la
+# grammaire Lark : une variable par déclaration, + - * / et parenthèses,
+# print, while et if (sans else) sur une comparaison. Chaque boucle a son
+# propre compteur et fait exactement `trips` tours : le coût d'exécution
+# reste borné (trips ** depth par instruction la plus imbriquée).
+
+def synthetic_program(statements, depth=2, trips=3, variables=8, seed=0):
+    rng = random.Random(seed)
+    names = [f"v{k}" for k in range(variables)]
+    counters = []
+    body = []
+
+    def expr():
+        a, b = rng.choice(names), rng.choice(names)
+        k = rng.randint(1, 9)
+        return rng.choice((
+            f"{a} + {k}",
+            f"({a} + {b}) / 2",
+            f"{a} - {b}",
+            f"{a} * {k} - {b} * {k}",
+        ))
+
+    def block(count, level, indent):
+        pad = "    " * indent
+        remaining = count
+        while remaining > 0:
+            kind = rng.random()
+            if level < depth and remaining > 2 and kind < 0.3:
+                inner = rng.randint(1, min(remaining - 1, 6))
+                if kind < 0.2:
+                    c = f"c{len(counters)}"
+                    counters.append(c)
+                    body.append(f"{pad}{c} = 0;")
+                    body.append(f"{pad}while ({c} < {trips}) {{")
+                    block(inner, level + 1, indent + 1)
+                    body.append(f"{pad}    {c} = {c} + 1;")
+                else:
+                    body.append(f"{pad}if ({rng.choice(names)} > {rng.randint(0, 20)}) {{")
+                    block(inner, level + 1, indent + 1)
+                body.append(f"{pad}}}")
+                remaining -= inner + 1
+            elif kind < 0.4:
+                body.append(f"{pad}print({rng.choice(names)});")
+                remaining -= 1
+            else:
+                body.append(f"{pad}{rng.choice(names)} = {expr()};")
+                remaining -= 1
+
+    block(statements, 0, 0)
+    head = [f"int {n};" for n in names + counters]
+    head += [f"{n} = {k + 1};" for k, n in enumerate(names)]
+    return "\n".join(head + body) + "\n"
+
+
+def flat_program(statements, variables=8, seed=0):
+    # Sous-ensemble de prgPythonPur.py : int a, b; a = 5; a = b + 2; print(a);
+    rng = random.Random(seed)
+    names = [f"v{k}" for k in range(variables)]
+    lines = [f"int {', '.join(names)};"]
+    lines += [f"{n} = {k + 1};" for k, n in enumerate(names)]
+    for _ in range(statements):
+        kind = rng.random()
+        if kind < 0.2:
+            lines.append(f"print({rng.choice(names)});")
+        elif kind < 0.4:
+            lines.append(f"{rng.choice(names)} = {rng.randint(0, 99)};")
+        else:
+            lines.append(f"{rng.choice(names)} = {rng.choice(names)} + {rng.randint(1, 9)};")
+    return "\n".join(lines) + "\n"
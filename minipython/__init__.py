@@ -0,0 +1,49 @@
+# Bibliothèque MiniPython : moteurs réutilisables par les scripts d'analyse
+#
+# API de haut niveau (chaque phase importe ses modules au premier appel :
+# tokenize ne charge ni Lark, ni Graphviz, ni le profilage) :
+#     tokens = minipython.tokenize(source)
+#     ast = minipython.parse(source)                  # frontend="lark" : Lark LALR
+#     ast, symtab = minipython.check(ast)             # SemanticErrors si erreurs
+#     tac = minipython.generate_tac(ast)
+#     variables = minipython.run(ast, symtab)         # governor=... : limites
+__all__ = ["tokenize", "parse", "check", "generate_tac", "run"]
+
+
+def tokenize(source):
+    # Liste de tokens (type, valeur, ligne) du lexer descendant
+    import io
+    from minipython.lexer import iter_tokens
+    return list(iter_tokens(io.StringIO(source)))
+
+
+def parse(source, frontend="rd"):
+    # AST (liste d'instructions) : parser descendant ("rd") ou Lark ("lark")
+    if frontend == "rd":
+        from minipython.parser import parse_program
+        return parse_program(tokenize(source))
+    if frontend == "lark":
+        from minipython.lark_frontend import parse as parse_lark
+        return parse_lark(source)
+    raise ValueError(f"Front-end inconnu : {frontend}")
+
+
+def check(ast):
+    # (AST annoté : slots et types, table des symboles nom -> type)
+    from minipython.semantic import check as check_semantics
+    return check_semantics(ast)
+
+
+def generate_tac(ast):
+    from minipython.tac import TACGenerator
+    return TACGenerator().generate(ast)
+
+
+def run(ast, symtab=None, governor=None, on_print=print):
+    # Exécute l'AST vérifié ; renvoie les variables finales (nom -> valeur)
+    from minipython.governor import run as run_governed
+    if symtab is None:
+        ast, symtab = check(ast)
+    env = {name: 0 for name in symtab}
+    run_governed(ast, env, governor, on_print=on_print)
+    return env
@@ -0,0 +1,142 @@
+# ------------------------------
+# Export de l'AST : console, DOT et JSON en flux
+# ------------------------------
+# Les écrivains parcourent directement l'AST (minipython.nodes, ou tout
+# arbre décrit par une fonction describe), sans en construire de copie :
+# walk() produit les noeuds un à un dans l'ordre préfixe, avec une pile
+# d'itérateurs (mémoire proportionnelle à la profondeur, pas à la taille),
+# et chaque écrivain envoie ses lignes au fichier au fur et à mesure.
+#  - max_depth : au-delà, un sous-arbre est remplacé par un seul noeud
+#    "... (N noeuds)" ;
+#  - start_render() lance Graphviz en arrière-plan : le rendu PNG ne
+#    bloque ni la compilation ni l'exécution, et wait_render() en
+#    récupère le résultat à la fin.
+# json, shutil et subprocess ne sont importés que par les écrivains et le
+# rendu qui s'en servent : afficher l'AST en console n'en charge aucun.
+import os
+
+from minipython.nodes import Node
+
+
+def describe(node):
+    # (libellé, enfants) d'un noeud ; les feuilles textuelles n'ont pas d'enfant
+    if isinstance(node, Node):
+        return node.label, node.children()
+    return str(node), ()
+
+
+def subtree_size(node, describe=describe):
+    count = 0
+    stack = [node]
+    while stack:
+        count += 1
+        stack.extend(describe(stack.pop())[1])
+    return count
+
+
+def with_last(items):
+    last = len(items) - 1
+    return ((item, k == last) for k, item in enumerate(items))
+
+
+def walk(root_label, roots, max_depth=None, describe=describe):
+    # (profondeur, numéro, numéro du parent, libellé, dernier enfant ?)
+    yield 0, 0, None, root_label, True
+    count = 1
+    stack = [(with_last(roots), 0, 1)]
+    while stack:
+        children, parent, depth = stack[-1]
+        item = next(children, None)
+        if item is None:
+            stack.pop()
+            continue
+        child, last = item
+        ident = count
+        count += 1
+        label, grandchildren = describe(child)
+        yield depth, ident, parent, label, last
+        if not grandchildren:
+            continue
+        if max_depth is not None and depth >= max_depth:
+            hidden = sum(subtree_size(c, describe) for c in grandchildren)
+            yield depth + 1, count, ident, f"... ({hidden} noeuds)", True
+            count += 1
+        else:
+            stack.append((with_last(grandchildren), ident, depth + 1))
+
+
+# ------------------------------
+# Écrivains
+# ------------------------------
+def write_text(events, out):
+    # Même dessin que anytree.RenderTree
+    prefixes = []
+    for depth, _, _, label, last in events:
+        if depth == 0:
+            out.write(f"{label}\n")
+            continue
+        del prefixes[depth - 1:]
+        out.write(f"{''.join(prefixes)}{'└── ' if last else '├── '}{label}\n")
+        prefixes.append("    " if last else "│   ")
+
+
+def write_dot(events, out):
+    # Un identifiant par noeud : deux noeuds de même libellé restent distincts
+    import json
+    out.write("digraph tree {\n")
+    for _, ident, parent, label, _ in events:
+        out.write(f"    n{ident} [label={json.dumps(label, ensure_ascii=False)}];\n")
+        if parent is not None:
+            out.write(f"    n{parent} -> n{ident};\n")
+    out.write("}\n")
+
+
+def write_json(events, out):
+    # {"label": ..., "children": [...]} imbriqués, écrits sans construire
+    # les dictionnaires
+    import json
+    previous = -1
+    for depth, _, _, label, _ in events:
+        if depth <= previous:
+            out.write("]}" * (previous - depth + 1) + ",")
+        out.write(f'{{"label": {json.dumps(label, ensure_ascii=False)}, "children": [')
+        previous = depth
+    out.write("]}" * (previous + 1) + "\n")
+
+
+WRITERS = {".dot": write_dot, ".json": write_json, ".txt": write_text}
+
+
+def export(path, root_label, roots, max_depth=None, describe=describe, writer=None):
+    # Format imposé par writer, sinon choisi d'après l'extension du fichier
+    if writer is None:
+        ext = os.path.splitext(path)[1]
+        if ext not in WRITERS:
+            raise ValueError(f"Extension inconnue pour l'export de l'AST : {ext or path!r} "
+                             f"(attendu : {', '.join(WRITERS)})")
+        writer = WRITERS[ext]
+    with open(path, "w", encoding="utf-8") as out:
+        writer(walk(root_label, roots, max_depth, describe), out)
+
+
+# ------------------------------
+# Rendu Graphviz en arrière-plan
+# ------------------------------
+def start_render(dot_path, image_path):
+    # Processus dot lancé sans l'attendre, ou None si Graphviz est absent
+    import shutil
+    import subprocess
+    dot = shutil.which("dot")
+    if dot is None:
+        return None
+    fmt = os.path.splitext(image_path)[1][1:] or "png"
+    return subprocess.Popen([dot, f"-T{fmt}", dot_path, "-o", image_path],
+                            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+
+
+def wait_render(process):
+    # Message d'erreur de Graphviz, ou None si l'image a été produite
+    _, err = process.communicate()
+    if process.returncode == 0:
+        return None
+    return err.strip() or f"dot a échoué (code {process.returncode})"
@@ -0,0 +1,139 @@
+# ------------------------------
+# Compilation par lots de fichiers MiniPython
+# ------------------------------
+# Usage :
+#     python -m minipython.batch exemples/ "autres/*.minipy" -o resultats.jsonl -j 4
+#
+# Chaque fichier passe par lexer -> parser -> SemanticChecker -> TAC
+# (minipython.tac, avec les sauts de while et if) dans un pool de processus.
+# Le parser est construit une seule fois par worker (initialiseur du pool).
+# Une ligne JSON est écrite par fichier :
+#     {"file": ..., "success": ..., "diagnostics": [...], "tac": [...],
+#      "tokens": ..., "timings": {"lex": ..., "parse": ..., ...}}
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+EXTENSION = ".minipy"
+
+parser = None
+
+
+def init_worker():
+    global parser
+    from minipython.lark_parser import get_parser
+    parser = get_parser()
+
+
+def diagnostic(phase, error):
+    entry = {"phase": phase, "message": str(error).strip()}
+    line = getattr(error, "line", None)
+    if line is not None:
+        entry["line"] = line
+        entry["column"] = getattr(error, "column", None)
+    return entry
+
+
+def diagnostics(phase, error):
+    # Une entrée par erreur : l'analyse sémantique les lève toutes ensemble
+    return [diagnostic(phase, e) for e in getattr(error, "errors", None) or [error]]
+
+
+def compile_file(path):
+    from minipython.lark_frontend import SemanticChecker, SyntaxTransformer
+    from minipython.tac import TACGenerator
+
+    if parser is None:
+        init_worker()
+
+    result = {"file": path, "success": False, "diagnostics": [], "tac": [],
+              "tokens": 0, "timings": {}}
+    timings = result["timings"]
+    phase = "read"
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            source = f.read()
+
+        phase = "lex"
+        start = time.perf_counter()
+        result["tokens"] = sum(1 for _ in parser.lex(source))
+        timings["lex"] = time.perf_counter() - start
+
+        phase = "parse"
+        start = time.perf_counter()
+        tree = parser.parse(source)
+        timings["parse"] = time.perf_counter() - start
+
+        phase = "transform"
+        start = time.perf_counter()
+        ast = SyntaxTransformer().transform(tree)
+        timings["transform"] = time.perf_counter() - start
+
+        phase = "semantic"
+        start = time.perf_counter()
+        ast = SemanticChecker().check(ast)
+        timings["semantic"] = time.perf_counter() - start
+
+        phase = "tac"
+        start = time.perf_counter()
+        result["tac"] = TACGenerator().generate(ast)
+        timings["tac"] = time.perf_counter() - start
+
+        result["success"] = True
+    except Exception as e:
+        result["diagnostics"].extend(diagnostics(phase, e))
+    return result
+
+
+def collect_files(patterns):
+    files = []
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            matches = glob.glob(os.path.join(pattern, "**", "*" + EXTENSION), recursive=True)
+        else:
+            matches = glob.glob(pattern, recursive=True)
+        files.extend(sorted(matches))
+    # Un fichier cité deux fois n'est compilé qu'une fois
+    return list(dict.fromkeys(files))
+
+
+def main(argv=None):
+    arg_parser = argparse.ArgumentParser(description="Compilation MiniPython par lots")
+    arg_parser.add_argument("inputs", nargs="+",
+                            help=f"répertoires (fichiers *{EXTENSION}) ou motifs glob")
+    arg_parser.add_argument("-o", "--output", help="fichier JSON lines (défaut : sortie standard)")
+    arg_parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count(),
+                            help="nombre de processus (défaut : nombre de coeurs)")
+    args = arg_parser.parse_args(argv)
+    if args.jobs < 1:
+        arg_parser.error("-j/--jobs doit valoir au moins 1")
+
+    files = collect_files(args.inputs)
+    if not files:
+        arg_parser.error("aucun fichier MiniPython trouvé")
+
+    out = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    failures = 0
+    start = time.perf_counter()
+    try:
+        with ProcessPoolExecutor(max_workers=args.jobs, initializer=init_worker) as pool:
+            chunksize = max(1, len(files) // (4 * args.jobs))
+            for result in pool.map(compile_file, files, chunksize=chunksize):
+                failures += not result["success"]
+                out.write(json.dumps(result, ensure_ascii=False) + "\n")
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    elapsed = time.perf_counter() - start
+
+    print(f"{len(files)} fichiers, {failures} en échec, {elapsed:.2f} s "
+          f"({len(files) / elapsed:.1f} fichiers/s, {args.jobs} processus)", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,188 @@
+# ------------------------------
+# Bytecode à registres et machine virtuelle pour le TAC
+# ------------------------------
+# Le TAC textuel de TACGenerator ("ADD %t3, %t1, %t2", "JZ %t4, L2", ...) est
+# assemblé une fois en un tableau d'entiers : chaque instruction occupe
+# INSTR_SIZE cases [opcode, a, b, c]. Variables, temporaires et constantes
+# sont tous des registres ; les constantes sont simplement des registres
+# pré-initialisés. Les étiquettes sont résolues en positions dans le tableau.
+import marshal
+from array import array
+
+INSTR_SIZE = 4
+
+# Opcodes (numérotés par fréquence décroissante dans les boucles)
+(OP_LOAD, OP_STORE, OP_ADD, OP_SUB, OP_MUL, OP_DIV,
+ OP_LT, OP_GT, OP_LTE, OP_GTE, OP_EQ, OP_NEQ, OP_AND, OP_OR,
+ OP_NEG, OP_NOT, OP_JZ, OP_JMP, OP_PRINT) = range(19)
+
+OPCODES = {
+    'LOAD': OP_LOAD, 'STORE': OP_STORE,
+    'ADD': OP_ADD, 'SUB': OP_SUB, 'MUL': OP_MUL, 'DIV': OP_DIV,
+    'LT': OP_LT, 'GT': OP_GT, 'LTE': OP_LTE, 'GTE': OP_GTE,
+    'EQ': OP_EQ, 'NEQ': OP_NEQ, 'AND': OP_AND, 'OR': OP_OR,
+    'NEG': OP_NEG, 'NOT': OP_NOT,
+    'JZ': OP_JZ, 'JMP': OP_JMP, 'PRINT': OP_PRINT,
+}
+OPNAMES = {code: name for name, code in OPCODES.items()}
+
+# Version du format sérialisé : à incrémenter si les opcodes changent
+FORMAT_VERSION = 1
+
+
+class Bytecode:
+    def __init__(self, code, names, initial, variables):
+        self.code = code            # array('i') : [op, a, b, c] * n
+        self.names = names          # nom de chaque registre (debug / désassemblage)
+        self.initial = initial      # valeur initiale de chaque registre
+        self.variables = variables  # registres des variables déclarées
+
+    def to_bytes(self):
+        return marshal.dumps((FORMAT_VERSION, self.code.tobytes(), self.names,
+                              self.initial, self.variables))
+
+    @classmethod
+    def from_bytes(cls, data):
+        version, raw, names, initial, variables = marshal.loads(data)
+        if version != FORMAT_VERSION:
+            raise ValueError(f"Format de bytecode incompatible : {version}")
+        code = array('i')
+        code.frombytes(raw)
+        return cls(code, list(names), list(initial), list(variables))
+
+
+def parse_tac_line(line):
+    # "ADD %t3, %t1, 2" -> ('ADD', ['%t3', '%t1', '2'])
+    op, _, rest = line.strip().partition(" ")
+    if op == 'DECLARE':
+        return op, rest.split()[-1:]
+    return op, [a.strip() for a in rest.split(",")] if rest else []
+
+
+def is_literal(operand):
+    return operand.lstrip('-').isdigit()
+
+
+def assemble(tac, symtab=()):
+    registers = {}
+    names = []
+    initial = []
+    variables = []
+
+    def register(operand):
+        if operand not in registers:
+            registers[operand] = len(names)
+            names.append(operand)
+            initial.append(int(operand) if is_literal(operand) else 0)
+        return registers[operand]
+
+    for var in symtab:
+        variables.append(register(var))
+
+    # Première passe : position de chaque étiquette
+    instructions = []
+    labels = {}
+    for line in tac:
+        op, args = parse_tac_line(line)
+        if op == 'LABEL':
+            labels[args[0]] = len(instructions) * INSTR_SIZE
+        elif op == 'DECLARE':
+            if args[0] not in registers:
+                variables.append(register(args[0]))
+        else:
+            instructions.append((op, args))
+
+    # Deuxième passe : encodage
+    code = array('i')
+    for op, args in instructions:
+        if op not in OPCODES:
+            raise ValueError(f"Instruction TAC inconnue : {op}")
+        if op == 'JMP':
+            slots = [labels[args[0]]]
+        elif op == 'JZ':
+            slots = [register(args[0]), labels[args[1]]]
+        else:
+            slots = [register(a) for a in args]
+        slots += [0] * (INSTR_SIZE - 1 - len(slots))
+        code.append(OPCODES[op])
+        code.extend(slots)
+
+    return Bytecode(code, names, initial, variables)
+
+
+def disassemble(bc):
+    lines = []
+    code = bc.code
+    for pc in range(0, len(code), INSTR_SIZE):
+        op, a, b, c = code[pc:pc + INSTR_SIZE]
+        name = OPNAMES[op]
+        if op == OP_JMP:
+            args = [f"@{a}"]
+        elif op == OP_JZ:
+            args = [bc.names[a], f"@{b}"]
+        elif op == OP_PRINT:
+            args = [bc.names[a]]
+        elif op in (OP_LOAD, OP_STORE, OP_NEG, OP_NOT):
+            args = [bc.names[a], bc.names[b]]
+        else:
+            args = [bc.names[a], bc.names[b], bc.names[c]]
+        lines.append(f"{pc:>5} {name} {', '.join(args)}")
+    return lines
+
+
+def run(bc):
+    # Boucle de dispatch : renvoie la vue dict des variables (debug)
+    regs = list(bc.initial)
+    names = bc.names
+    code = bc.code.tolist()
+    end = len(code)
+    pc = 0
+    while pc < end:
+        op = code[pc]
+        a = code[pc + 1]
+        if op == OP_LOAD:
+            regs[a] = regs[code[pc + 2]]
+        elif op == OP_STORE:
+            regs[a] = v = regs[code[pc + 2]]
+            print(f"EXEC: {names[a]}={v}")
+        elif op == OP_ADD:
+            regs[a] = regs[code[pc + 2]] + regs[code[pc + 3]]
+        elif op == OP_LT:
+            regs[a] = regs[code[pc + 2]] < regs[code[pc + 3]]
+        elif op == OP_JZ:
+            if not regs[a]:
+                pc = code[pc + 2]
+                continue
+        elif op == OP_JMP:
+            pc = a
+            continue
+        elif op == OP_SUB:
+            regs[a] = regs[code[pc + 2]] - regs[code[pc + 3]]
+        elif op == OP_MUL:
+            regs[a] = regs[code[pc + 2]] * regs[code[pc + 3]]
+        elif op == OP_DIV:
+            regs[a] = regs[code[pc + 2]] / regs[code[pc + 3]]
+        elif op == OP_GT:
+            regs[a] = regs[code[pc + 2]] > regs[code[pc + 3]]
+        elif op == OP_LTE:
+            regs[a] = regs[code[pc + 2]] <= regs[code[pc + 3]]
+        elif op == OP_GTE:
+            regs[a] = regs[code[pc + 2]] >= regs[code[pc + 3]]
+        elif op == OP_EQ:
+            regs[a] = regs[code[pc + 2]] == regs[code[pc + 3]]
+        elif op == OP_NEQ:
+            regs[a] = regs[code[pc + 2]] != regs[code[pc + 3]]
+        elif op == OP_AND:
+            regs[a] = regs[code[pc + 2]] and regs[code[pc + 3]]
+        elif op == OP_OR:
+            regs[a] = regs[code[pc + 2]] or regs[code[pc + 3]]
+        elif op == OP_NEG:
+            regs[a] = -regs[code[pc + 2]]
+        elif op == OP_NOT:
+            regs[a] = not regs[code[pc + 2]]
+        elif op == OP_PRINT:
+            print("PRINT:", regs[a])
+        else:
+            raise ValueError(f"Opcode inconnu : {op}")
+        pc += INSTR_SIZE
+    return {names[r]: regs[r] for r in bc.variables}
@@ -0,0 +1,282 @@
+# ------------------------------
+# Boucles de comptage exécutées en forme close
+# ------------------------------
+# Une boucle while dont le corps n'est fait que d'affectations affines des
+# variables qu'il modifie, et dont la condition compare un compteur à une
+# borne qui ne change pas, est exécutée sans itérer :
+#     while (i < n) { s = s + i * k; i = i + 1; }
+# Le corps composé donne une application affine x -> A.x + b sur les
+# variables de la boucle ; k tours valent la puissance k de la matrice
+# augmentée [[A, b], [0, 1]], calculée par carrés successifs sur des
+# entiers Python. Le résultat est exact : pas de NumPy, dont les entiers
+# 64 bits déborderaient là où ceux de MiniPython grandissent sans borne.
+# Tout ce qui sort de ce cadre (print, if, boucle imbriquée, division ou
+# produit de deux variables de la boucle, valeur non entière, boucle
+# infinie, trop peu de tours) retombe sur l'interprète normal, tout comme
+# une puissance dont les coefficients dépassent MAX_BITS : l'interprète
+# avance alors pas à pas, sous les limites de minipython.governor.
+from minipython.nodes import (ADD, EQ, GT, GTE, LT, LTE, MUL, NEG, NEQ, SUB, Assign, BinOp,
+                              Num, UnaryOp, Var)
+
+# En dessous, itérer coûte moins cher que d'analyser la boucle
+MIN_TRIPS = 16
+
+# Taille maximale (bits) d'un coefficient de la matrice élevée au carré :
+# borne le coût de chaque produit, quel que soit le nombre de tours
+MAX_BITS = 1 << 16
+
+
+class Plan:
+    # Analyse statique d'une boucle, faite une fois par noeud While
+    __slots__ = ('names', 'keys', 'reads', 'stmts', 'counter', 'op', 'bound')
+
+    def __init__(self, names, keys, reads, stmts, counter, op, bound):
+        self.names = names      # variables affectées, dans l'ordre du corps
+        self.keys = keys        # nom -> clé dans l'environnement (nom ou slot)
+        self.reads = reads      # variables de la boucle lues par le corps
+        self.stmts = stmts
+        self.counter = counter  # variable comparée à la borne
+        self.op = op            # LT, LTE, GT, GTE, EQ ou NEQ (compteur à gauche)
+        self.bound = bound      # expression indépendante de la boucle
+
+
+SWAPPED = {LT: GT, GT: LT, LTE: GTE, GTE: LTE, EQ: EQ, NEQ: NEQ}
+
+
+def variables(expr):
+    stack = [expr]
+    while stack:
+        e = stack.pop()
+        if isinstance(e, Var):
+            yield e.name
+        elif isinstance(e, BinOp):
+            stack.append(e.left)
+            stack.append(e.right)
+        elif isinstance(e, UnaryOp):
+            stack.append(e.operand)
+
+
+def depends(expr, names):
+    # Vrai si l'expression lit une variable modifiée par la boucle
+    return any(name in names for name in variables(expr))
+
+
+def affine_shape(expr, names):
+    # Vrai si l'expression est affine en les variables de la boucle, les
+    # coefficients étant des sous-expressions indépendantes de la boucle
+    if not depends(expr, names):
+        return True
+    if isinstance(expr, Var):
+        return True
+    if isinstance(expr, BinOp):
+        if expr.op in (ADD, SUB):
+            return affine_shape(expr.left, names) and affine_shape(expr.right, names)
+        if expr.op == MUL:
+            return ((not depends(expr.left, names) and affine_shape(expr.right, names))
+                    or (not depends(expr.right, names) and affine_shape(expr.left, names)))
+        return False
+    if isinstance(expr, UnaryOp):
+        return expr.op == NEG and affine_shape(expr.operand, names)
+    return False
+
+
+def plan_loop(loop, slots=False):
+    stmts = loop.body.stmts
+    if not stmts or not all(isinstance(s, Assign) for s in stmts):
+        return None
+    keys = {}
+    for s in stmts:
+        keys.setdefault(s.name, s.slot if slots else s.name)
+    names = list(keys)
+    cond = loop.cond
+    if not isinstance(cond, BinOp) or cond.op not in SWAPPED:
+        return None
+    if isinstance(cond.left, Var) and cond.left.name in keys \
+            and not depends(cond.right, keys):
+        counter, op, bound = cond.left.name, cond.op, cond.right
+    elif isinstance(cond.right, Var) and cond.right.name in keys \
+            and not depends(cond.left, keys):
+        counter, op, bound = cond.right.name, SWAPPED[cond.op], cond.left
+    else:
+        return None
+    if not all(affine_shape(s.value, keys) for s in stmts):
+        return None
+    # Une variable multipliée par 0 disparaît de la forme affine mais pas
+    # du calcul pas à pas (3.5 * 0 vaut 0.0) : toute variable lue compte
+    reads = {name for s in stmts for name in variables(s.value) if name in keys}
+    return Plan(names, keys, reads | {counter}, stmts, counter, op, bound)
+
+
+# ------------------------------
+# Formes affines : {nom: coefficient, None: constante}
+# ------------------------------
+class NotAffine(Exception):
+    pass
+
+
+class TooLarge(Exception):
+    pass
+
+
+def constant(value):
+    # Seuls les entiers exacts passent : un booléen ou un flottant garde
+    # la sémantique pas à pas de l'interprète
+    if type(value) is not int:
+        raise NotAffine()
+    return {None: value}
+
+
+def add(f, g, sign=1):
+    result = dict(f)
+    for k, c in g.items():
+        result[k] = result.get(k, 0) + sign * c
+    return result
+
+
+def scale(f, c):
+    return {k: v * c for k, v in f.items()} if c else {None: 0}
+
+
+def affine(expr, forms, names, value):
+    # Forme affine de expr en fonction des valeurs à l'entrée du tour
+    if not depends(expr, names):
+        return constant(value(expr))
+    if isinstance(expr, Var):
+        return forms[expr.name]
+    if isinstance(expr, UnaryOp):
+        return scale(affine(expr.operand, forms, names, value), -1)
+    if expr.op == MUL:
+        if depends(expr.left, names):
+            f, c = affine(expr.left, forms, names, value), value(expr.right)
+        else:
+            f, c = affine(expr.right, forms, names, value), value(expr.left)
+        return scale(f, constant(c)[None])
+    return add(affine(expr.left, forms, names, value),
+               affine(expr.right, forms, names, value), 1 if expr.op == ADD else -1)
+
+
+def trip_count(op, start, step, bound):
+    # Nombre de tours de "while (compteur op borne)" quand le compteur
+    # avance de step à chaque tour ; None si la boucle ne termine pas
+    if op == LT:
+        if start >= bound:
+            return 0
+        return -((start - bound) // step) if step > 0 else None
+    if op == LTE:
+        if start > bound:
+            return 0
+        return (bound - start) // step + 1 if step > 0 else None
+    if op == GT:
+        if start <= bound:
+            return 0
+        return -((bound - start) // -step) if step < 0 else None
+    if op == GTE:
+        if start < bound:
+            return 0
+        return (start - bound) // -step + 1 if step < 0 else None
+    if op == EQ:
+        return 1 if start == bound else 0
+    # NEQ : la borne doit tomber exactement sur un tour
+    distance = bound - start
+    if distance % step == 0 and distance // step >= 0:
+        return distance // step
+    return None
+
+
+def mat_mul(a, b):
+    n = len(a)
+    result = []
+    for row in a:
+        out = [0] * n
+        for k, x in enumerate(row):
+            if x:
+                for j, y in enumerate(b[k]):
+                    if y:
+                        out[j] += x * y
+        result.append(out)
+    return result
+
+
+def mat_pow(m, k, check=None, max_bits=MAX_BITS):
+    # check() est appelé avant chaque étape (délai du governor) ; TooLarge
+    # si un coefficient de m dépasse max_bits
+    n = len(m)
+    result = [[int(i == j) for j in range(n)] for i in range(n)]
+    while k:
+        if check is not None:
+            check()
+        if k & 1:
+            result = mat_mul(result, m)
+        k >>= 1
+        if k:
+            m = mat_mul(m, m)
+            if max(abs(x) for row in m for x in row).bit_length() > max_bits:
+                raise TooLarge()
+    return result
+
+
+class ClosedForms:
+    # Exécuteur de boucles en forme close pour un environnement donné
+    # (dictionnaire nom -> valeur ou liste indexée par les slots)
+    def __init__(self, env, value, slots=False, on_assign=None, min_trips=MIN_TRIPS,
+                 check=None):
+        self.env = env
+        self.value = value
+        self.slots = slots
+        self.on_assign = on_assign
+        self.min_trips = min_trips
+        self.check = check      # appelé pendant le calcul (LimitExceeded du governor)
+        self.plans = {}         # id(While) -> (While, Plan ou None)
+
+    def run(self, loop, max_trips=None):
+        # Exécute la boucle entière et renvoie son nombre de tours, ou None
+        # (rien n'a été modifié) si l'interprète doit s'en charger
+        entry = self.plans.get(id(loop))
+        if entry is None:
+            entry = self.plans[id(loop)] = (loop, plan_loop(loop, self.slots))
+        plan = entry[1]
+        if plan is None:
+            return None
+        env = self.env
+        names = plan.keys
+        try:
+            forms = {name: {name: 1} for name in plan.names}
+            for s in plan.stmts:
+                forms[s.name] = affine(s.value, forms, names, self.value)
+            counter = forms[plan.counter]
+            step = counter.get(None, 0)
+            if counter.get(plan.counter) != 1 or len(counter) != 2 or not step:
+                return None
+            start = constant(env[names[plan.counter]])[None]
+            bound = constant(self.value(plan.bound))[None]
+            entry_values = [constant(env[names[n]])[None] if n in plan.reads else 0
+                            for n in plan.names]
+        except (NotAffine, ArithmeticError, TypeError):
+            return None
+        trips = trip_count(plan.op, start, step, bound)
+        if trips is None or trips < self.min_trips:
+            return None
+        if max_trips is not None and trips > max_trips:
+            return None
+
+        # Matrice augmentée de l'application affine d'un tour
+        index = {name: i for i, name in enumerate(plan.names)}
+        size = len(plan.names) + 1
+        matrix = []
+        for name in plan.names:
+            row = [0] * size
+            for k, c in forms[name].items():
+                row[size - 1 if k is None else index[k]] += c
+            matrix.append(row)
+        matrix.append([0] * (size - 1) + [1])
+        try:
+            power = mat_pow(matrix, trips, self.check)
+        except TooLarge:
+            return None
+        vector = entry_values + [1]
+        for i, name in enumerate(plan.names):
+            env[names[name]] = sum(c * x for c, x in zip(power[i], vector) if c)
+        if self.on_assign is not None:
+            for name in plan.names:
+                self.on_assign(name, env[names[name]])
+        return trips
@@ -0,0 +1,116 @@
+# ------------------------------
+# Compilation de l'AST en fermetures Python
+# ------------------------------
+# L'AST (minipython.nodes) est parcouru UNE seule fois : chaque noeud
+# devient une fonction Python imbriquée. Les constantes et les opérateurs
+# sont résolus à la compilation, l'exécution ne fait plus aucun dispatch
+# sur le type des noeuds.
+# Avec slots=True, l'environnement est une liste indexée par les slots
+# calculés par minipython.resolve au lieu d'un dictionnaire indexé par nom.
+import operator
+
+from minipython.nodes import (AND, OP_FUNCS, OR, Assign, BinOp, Block, Decl, If, Num,
+                              Print, UnaryOp, Var, While)
+
+
+def _key(node, slots):
+    return node.slot if slots else node.name
+
+
+def compile_expr(expr, slots=False):
+    if isinstance(expr, Num):
+        value = expr.value
+        return lambda env: value
+    if isinstance(expr, Var):
+        return operator.itemgetter(_key(expr, slots))
+
+    if isinstance(expr, UnaryOp):
+        fn = OP_FUNCS[expr.op]
+        inner = compile_expr(expr.operand, slots)
+        return lambda env: fn(inner(env))
+
+    if not isinstance(expr, BinOp):
+        raise ValueError(f"Expression inconnue : {expr!r}")
+
+    left = compile_expr(expr.left, slots)
+    right = compile_expr(expr.right, slots)
+    if expr.op == AND:
+        return lambda env: left(env) and right(env)
+    if expr.op == OR:
+        return lambda env: left(env) or right(env)
+
+    fn = OP_FUNCS[expr.op]
+    # Spécialisation des cas les plus fréquents (x < 10, x + 1, ...) :
+    # on évite un appel de fermeture pour les feuilles.
+    if isinstance(expr.left, Var):
+        name = _key(expr.left, slots)
+        if isinstance(expr.right, Num):
+            value = expr.right.value
+            return lambda env: fn(env[name], value)
+        if isinstance(expr.right, Var):
+            other = _key(expr.right, slots)
+            return lambda env: fn(env[name], env[other])
+    return lambda env: fn(left(env), right(env))
+
+
+def compile_block(stmts, slots=False):
+    compiled = [compile_stmt(s, slots) for s in stmts]
+    compiled = [c for c in compiled if c is not None]
+    if len(compiled) == 1:
+        return compiled[0]
+
+    def run_block(env):
+        for s in compiled:
+            s(env)
+    return run_block
+
+
+def compile_stmt(stmt, slots=False):
+    if isinstance(stmt, Decl):
+        # Les déclarations sont déjà prises en compte dans l'environnement initial
+        return None
+
+    if isinstance(stmt, Assign):
+        name = stmt.name
+        key = _key(stmt, slots)
+        value = compile_expr(stmt.value, slots)
+
+        def run_assign(env):
+            env[key] = v = value(env)
+            print(f"EXEC: {name}={v}")
+        return run_assign
+
+    if isinstance(stmt, Print):
+        value = compile_expr(stmt.value, slots)
+        return lambda env: print("PRINT:", value(env))
+
+    if isinstance(stmt, While):
+        cond = compile_expr(stmt.cond, slots)
+        body = compile_block(stmt.body.stmts, slots)
+
+        def run_while(env):
+            while cond(env):
+                body(env)
+        return run_while
+
+    if isinstance(stmt, If):
+        cond = compile_expr(stmt.cond, slots)
+        then_block = compile_block(stmt.then.stmts, slots)
+        else_block = compile_block(stmt.orelse.stmts, slots)
+
+        def run_if(env):
+            if cond(env):
+                then_block(env)
+            else:
+                else_block(env)
+        return run_if
+
+    if isinstance(stmt, Block):
+        return compile_block(stmt.stmts, slots)
+
+    raise ValueError(f"Instruction inconnue : {stmt!r}")
+
+
+def compile_program(ast, slots=False):
+    # Renvoie une fonction run(env) qui exécute tout le programme
+    return compile_block(ast, slots)
@@ -0,0 +1,158 @@
+# ------------------------------
+# Cache de compilation adressé par le contenu
+# ------------------------------
+# Le résultat du front-end (AST vérifié, table des symboles, TAC) est rangé
+# sous une clé sha256 calculée à partir du texte source, du nom du
+# front-end et de sa version (hash de la grammaire ou du code du parser) :
+# recompiler un programme identique ne refait ni le lexing, ni le parsing,
+# ni l'analyse sémantique, ni la génération du TAC.
+#  - en mémoire : LRU bornée à maxsize programmes ;
+#  - sur disque (optionnel) : un fichier par clé, sérialisé avec marshal.
+# L'AST est encodé en tuples (code du type de noeud, champs...) : le format
+# est compact, rapide à relire, et un fichier de cache ne peut pas exécuter
+# de code au chargement (contrairement à pickle).
+import hashlib
+import marshal
+import os
+from collections import OrderedDict
+
+from minipython.lark_parser import CACHE_DIR
+from minipython.nodes import (Assign, BinOp, Block, Decl, If, Node, Num, Print, UnaryOp, Var,
+                              While)
+
+# Version du format sérialisé : à incrémenter si les noeuds changent
+FORMAT_VERSION = 4
+
+# Magasin disque par défaut, à côté des tables LALR de Lark
+DEFAULT_DIR = os.path.join(CACHE_DIR, "compiled")
+
+NODE_TYPES = (Num, Var, BinOp, UnaryOp, Decl, Assign, Print, Block, While, If)
+NODE_TAGS = {cls: tag for tag, cls in enumerate(NODE_TYPES)}
+
+
+def source_key(source, frontend, version):
+    h = hashlib.sha256()
+    for part in (frontend, version, str(FORMAT_VERSION), source):
+        h.update(part.encode("utf-8"))
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+def files_version(*paths):
+    # Version d'un front-end écrit à la main : hash de ses fichiers sources
+    h = hashlib.sha256()
+    for path in paths:
+        with open(path, "rb") as f:
+            h.update(f.read())
+    return h.hexdigest()[:16]
+
+
+# ------------------------------
+# Encodage de l'AST
+# ------------------------------
+def encode(value):
+    if isinstance(value, Node):
+        cls = type(value)
+        # Toutes les annotations, slot compris : un AST relu du cache est
+        # exactement celui produit par l'analyse sémantique
+        return (NODE_TAGS[cls],) + tuple(encode(getattr(value, f)) for f in cls.__slots__)
+    if isinstance(value, list):
+        return [encode(v) for v in value]
+    return value
+
+
+def decode(value):
+    if isinstance(value, tuple):
+        cls = NODE_TYPES[value[0]]
+        node = cls.__new__(cls)
+        fields = iter(value[1:])
+        for f in cls.__slots__:
+            setattr(node, f, decode(next(fields)))
+        return node
+    if isinstance(value, list):
+        return [decode(v) for v in value]
+    return value
+
+
+class CompiledProgram:
+    __slots__ = ('ast', 'symtab', 'tac')
+
+    def __init__(self, ast, symtab, tac):
+        self.ast = ast          # AST après analyse sémantique
+        self.symtab = symtab    # {nom: type}
+        self.tac = tac          # liste de lignes TAC
+
+    def to_bytes(self):
+        return marshal.dumps((FORMAT_VERSION, encode(self.ast), self.symtab, self.tac))
+
+    @classmethod
+    def from_bytes(cls, data):
+        version, ast, symtab, tac = marshal.loads(data)
+        if version != FORMAT_VERSION:
+            raise ValueError(f"Format de cache incompatible : {version}")
+        return cls(decode(ast), symtab, tac)
+
+
+# ------------------------------
+# Cache
+# ------------------------------
+class CompileCache:
+    def __init__(self, maxsize=128, directory=None):
+        self.maxsize = maxsize
+        self.directory = directory
+        self.hits = 0
+        self.misses = 0
+        self._memory = OrderedDict()
+
+    def _path(self, key):
+        return os.path.join(self.directory, key[:2], key + ".bin")
+
+    def get(self, key):
+        program = self._memory.get(key)
+        if program is not None:
+            self._memory.move_to_end(key)
+            self.hits += 1
+            return program
+        if self.directory is not None:
+            try:
+                with open(self._path(key), "rb") as f:
+                    program = CompiledProgram.from_bytes(f.read())
+            except (OSError, ValueError, EOFError, TypeError):
+                # Absent, tronqué ou d'un autre format : simple défaut de cache
+                program = None
+            if program is not None:
+                self._remember(key, program)
+                self.hits += 1
+                return program
+        self.misses += 1
+        return None
+
+    def put(self, key, program):
+        self._remember(key, program)
+        if self.directory is not None:
+            path = self._path(key)
+            try:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                # Écriture atomique : un lecteur concurrent ne voit jamais
+                # un fichier à moitié écrit
+                tmp = f"{path}.{os.getpid()}.tmp"
+                with open(tmp, "wb") as f:
+                    f.write(program.to_bytes())
+                os.replace(tmp, path)
+            except OSError:
+                pass
+
+    def _remember(self, key, program):
+        self._memory[key] = program
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.maxsize:
+            self._memory.popitem(last=False)
+
+    def compile(self, source, frontend, version, compile_fn):
+        # compile_fn(source) -> CompiledProgram, appelé seulement en cas de défaut
+        key = source_key(source, frontend, version)
+        program = self.get(key)
+        if program is None:
+            program = compile_fn(source)
+            self.put(key, program)
+        return program
@@ -0,0 +1,219 @@
+# ------------------------------
+# Exécution gouvernée : limites de pas, de temps et de mémoire
+# ------------------------------
+# execution() interprète l'AST avec une pile explicite de blocs (pas de
+# récursion sur les instructions) et compte les pas : chaque instruction
+# exécutée et chaque tour de boucle (une boucle à corps vide avance aussi).
+# Tous les Governor.check_every pas, le Governor vérifie les limites puis
+# le générateur rend la main (yield) : l'exécution peut être suspendue et
+# reprise plus tard, et un Scheduler répartit un seul thread entre
+# plusieurs programmes par tranches.
+#  - max_steps   : nombre de pas (limite exacte) ;
+#  - max_seconds : temps passé à exécuter ce programme, tranches des
+#                  autres programmes non comprises ;
+#  - max_memory  : octets occupés par les valeurs des variables
+#                  (sys.getsizeof ; les entiers Python grandissent sans borne).
+# Entre deux points de contrôle, le coût est un compteur et une comparaison.
+#
+# closed_form=True : les boucles de comptage affines sont exécutées d'un
+# coup (minipython.closed_form) ; leurs pas sont comptés comme si elles
+# avaient tourné, et le délai (max_seconds) est vérifié pendant le calcul.
+# Sans effet avec une limite de mémoire ou un hook, qui observent chaque
+# affectation ; on_assign ne voit que les valeurs finales.
+import sys
+import time
+from collections import deque
+
+from minipython.closed_form import ClosedForms
+from minipython.nodes import AND, OP_FUNCS, OR, Assign, BinOp, If, Num, Print, Var, While
+
+CHECK_EVERY = 1024
+
+
+class UndeclaredVariable(NameError):
+    # Lecture d'une variable absente de l'environnement (programme non
+    # vérifié par minipython.semantic)
+    def __init__(self, name):
+        super().__init__(f"Variable {name} non déclarée")
+        self.name = name
+
+
+class LimitExceeded(Exception):
+    def __init__(self, limit, message, steps):
+        super().__init__(message)
+        self.limit = limit      # "steps", "time" ou "memory"
+        self.steps = steps
+
+
+class Governor:
+    def __init__(self, max_steps=None, max_seconds=None, max_memory=None,
+                 check_every=CHECK_EVERY):
+        self.max_steps = max_steps
+        self.max_seconds = max_seconds
+        self.max_memory = max_memory
+        self.check_every = check_every
+        self.seconds = 0.0      # temps d'exécution cumulé
+        self._resumed = None
+
+    def resume(self):
+        self._resumed = time.perf_counter()
+
+    def pause(self):
+        self.seconds += time.perf_counter() - self._resumed
+
+    def checkpoint(self, steps):
+        # Pas auquel le prochain contrôle aura lieu
+        checkpoint = steps + self.check_every
+        if self.max_steps is not None:
+            checkpoint = min(checkpoint, self.max_steps + 1)
+        return checkpoint
+
+    def check(self, steps, env):
+        if self.max_steps is not None and steps > self.max_steps:
+            raise LimitExceeded("steps", f"Limite de {self.max_steps} pas atteinte", steps)
+        if self.max_seconds is not None:
+            if self.seconds + time.perf_counter() - self._resumed > self.max_seconds:
+                raise LimitExceeded("time", f"Limite de {self.max_seconds:g} s atteinte "
+                                            f"après {steps} pas", steps)
+        if self.max_memory is not None:
+            values = env.values() if isinstance(env, dict) else env
+            used = sum(map(sys.getsizeof, values))
+            if used > self.max_memory:
+                raise LimitExceeded("memory", f"Limite de {self.max_memory} octets atteinte "
+                                              f"({used} octets après {steps} pas)", steps)
+
+
+def evaluator(env, slots=False):
+    def value(expr):
+        if isinstance(expr, Num):
+            return expr.value
+        if isinstance(expr, Var):
+            try:
+                return env[expr.slot] if slots else env[expr.name]
+            except KeyError:
+                raise UndeclaredVariable(expr.name) from None
+        if isinstance(expr, BinOp):
+            # && et || en court-circuit, comme tous les moteurs
+            if expr.op == AND:
+                left = value(expr.left)
+                return value(expr.right) if left else left
+            if expr.op == OR:
+                left = value(expr.left)
+                return left if left else value(expr.right)
+            return OP_FUNCS[expr.op](value(expr.left), value(expr.right))
+        return OP_FUNCS[expr.op](value(expr.operand))
+    return value
+
+
+def execution(ast, env, governor=None, slots=False, on_assign=None, on_print=print,
+              hook=None, closed_form=False):
+    # Générateur : rend le nombre de pas à chaque point de contrôle et
+    # renvoie (StopIteration.value) le nombre total de pas.
+    # env : dictionnaire nom -> valeur, ou liste indexée par les slots.
+    # on_assign(nom, valeur) / on_print(valeur) : effets visibles ;
+    # hook(instruction) : appelé à chaque instruction (profilage).
+    governor = governor if governor is not None else Governor()
+    value = evaluator(env, slots)
+    # Une valeur peut doubler de taille à chaque pas (x = x * x) : avec une
+    # limite de mémoire, chaque valeur affectée est aussi mesurée
+    max_value = governor.max_memory
+    closed = None
+    if closed_form and max_value is None and hook is None:
+        closed = ClosedForms(env, value, slots, on_assign,
+                             check=lambda: governor.check(steps, env))
+    max_steps = governor.max_steps
+    governor.resume()
+    steps = 0
+    checkpoint = governor.checkpoint(steps)
+    # Blocs en cours : (itérateur sur les instructions, boucle à reprendre ou None)
+    stack = [(iter(ast), None)]
+    while stack:
+        stmts, loop = stack[-1]
+        for stmt in stmts:
+            steps += 1
+            if steps >= checkpoint:
+                governor.check(steps, env)
+                governor.pause()
+                yield steps
+                governor.resume()
+                checkpoint = governor.checkpoint(steps)
+            if hook is not None:
+                hook(stmt)
+            if isinstance(stmt, Assign):
+                result = value(stmt.value)
+                env[stmt.slot if slots else stmt.name] = result
+                if max_value is not None and sys.getsizeof(result) > max_value:
+                    governor.check(steps, env)
+                if on_assign is not None:
+                    on_assign(stmt.name, result)
+            elif isinstance(stmt, Print):
+                on_print(value(stmt.value))
+            elif isinstance(stmt, While):
+                if closed is not None:
+                    # Chaque tour compte ses instructions et le retour à la condition
+                    cost = len(stmt.body.stmts) + 1
+                    trips = closed.run(stmt, None if max_steps is None
+                                       else (max_steps - steps) // cost)
+                    if trips is not None:
+                        steps += trips * cost
+                        continue
+                if value(stmt.cond):
+                    stack.append((iter(stmt.body.stmts), stmt))
+                    break
+            elif isinstance(stmt, If):
+                block = stmt.then if value(stmt.cond) else stmt.orelse
+                stack.append((iter(block.stmts), None))
+                break
+        else:
+            # Bloc terminé : nouveau tour de boucle ?
+            if loop is None:
+                stack.pop()
+                continue
+            steps += 1
+            if steps >= checkpoint:
+                governor.check(steps, env)
+                governor.pause()
+                yield steps
+                governor.resume()
+                checkpoint = governor.checkpoint(steps)
+            if value(loop.cond):
+                stack[-1] = (iter(loop.body.stmts), loop)
+            else:
+                stack.pop()
+    governor.pause()
+    return steps
+
+
+def run(ast, env, governor=None, **options):
+    # Exécution jusqu'au bout (ou jusqu'à LimitExceeded) ; renvoie le nombre de pas
+    running = execution(ast, env, governor, **options)
+    while True:
+        try:
+            next(running)
+        except StopIteration as stop:
+            return stop.value
+
+
+class Scheduler:
+    # Tourniquet : chaque exécution avance d'une tranche (check_every pas)
+    # à son tour, sur un seul thread
+    def __init__(self):
+        self.ready = deque()
+
+    def add(self, name, running):
+        self.ready.append((name, running))
+
+    def run(self):
+        # nom -> nombre de pas, ou LimitExceeded si le programme a été arrêté
+        results = {}
+        while self.ready:
+            name, running = self.ready.popleft()
+            try:
+                next(running)
+            except StopIteration as stop:
+                results[name] = stop.value
+            except LimitExceeded as e:
+                results[name] = e
+            else:
+                self.ready.append((name, running))
+        return results
@@ -0,0 +1,602 @@
+# ------------------------------
+# Analyse incrémentale d'un programme édité
+# ------------------------------
+# Document garde le programme découpé en instructions de premier niveau :
+# chaque entrée possède son texte (l'instruction et les blancs qui la
+# suivent), son noeud d'AST et ses diagnostics. Une édition (intervalle de
+# caractères + texte de remplacement) ne relexe et ne réanalyse que les
+# entrées touchées ; les autres instructions, et leurs sous-arbres, sont
+# réutilisées telles quelles.
+#
+#  - Les entrées sont rangées par paquets d'environ CHUNK entrées qui
+#    connaissent leur nombre de caractères et de lignes : retrouver une
+#    position ne parcourt que les totaux des paquets.
+#  - Lexer (minipython.lexer) et parser (minipython.parser) sont ceux
+#    d'analyse_lark.py : sur un programme sans erreur, l'AST est celui de
+#    parse_program() sur le texte complet.
+#  - Une instruction invalide devient une entrée d'erreur, arrêtée au
+#    premier ";" ou "}" : les instructions suivantes restent analysées.
+#    Une région invalide est d'abord élargie (jusqu'à WINDOW entrées) pour
+#    laisser une édition réparer une entrée d'erreur voisine, par exemple
+#    l'accolade fermante d'un while tapée quelques lignes plus bas.
+#  - Les diagnostics sémantiques suivent les règles de minipython.semantic
+#    (toutes les erreurs, blocs imbriqués compris).
+#    Une édition ne revérifie que les nouvelles entrées, et les
+#    utilisations d'un nom dont la première déclaration a changé de côté.
+#  - Les lignes des noeuds réutilisés ne sont recalées que lorsque l'AST
+#    complet est demandé (Document.ast()).
+from collections import namedtuple
+
+from minipython.lexer import KEYWORDS, LEXER
+from minipython.nodes import Assign, Decl, Var
+from minipython.parser import parse_statement
+
+CHUNK = 128       # taille visée d'un paquet d'entrées
+WINDOW = 32       # élargissement maximal d'une région invalide (entrées)
+GAP = 1 << 64     # écart entre les clés d'ordre après renumérotation
+STEP = 1 << 32    # écart maximal entre les clés de deux entrées insérées
+
+# Caractères qui ne peuvent prolonger aucun token : une frontière de
+# région bordée par l'un d'eux ne coupe jamais un token en deux
+SEPARATORS = frozenset(' \t\r\n;{}()')
+
+Diagnostic = namedtuple('Diagnostic', 'line message')
+EditResult = namedtuple('EditResult', 'index removed inserted diagnostics')
+
+# Premier niveau : second token et dernier token attendus par instruction
+SECOND = {'INT': 'ID', 'ID': 'EQUAL', 'PRINT': 'LPAR', 'WHILE': 'LPAR', 'IF': 'LPAR'}
+LAST = {'INT': 'SEMICOLON', 'ID': 'SEMICOLON', 'PRINT': 'SEMICOLON',
+        'WHILE': 'RBRACE', 'IF': 'RBRACE'}
+
+
+class Entry:
+    __slots__ = ('text', 'lines', 'stmt', 'stamp', 'order', 'chunk', 'syntax', 'braces',
+                 'declares', 'uses', 'problems')
+
+    def __init__(self, text, stmt, stamp, syntax=None, braces=0):
+        self.text = text
+        self.lines = text.count('\n')
+        self.stmt = stmt            # None pour une entrée d'erreur
+        self.stamp = stamp          # ligne de début pour laquelle stmt est numéroté
+        self.order = 0              # clé croissante dans l'ordre du document
+        self.chunk = None
+        self.syntax = syntax        # (ligne relative, message) ou None
+        self.braces = braces        # "{" moins "}" d'une entrée d'erreur
+        self.declares, self.uses = names_of(stmt, stamp)
+        self.problems = []          # diagnostics courants (ligne relative, message)
+
+
+class Chunk:
+    __slots__ = ('entries', 'chars', 'lines', 'statements')
+
+    def __init__(self, entries):
+        self.entries = entries
+        self.chars = sum(len(e.text) for e in entries)
+        self.lines = sum(e.lines for e in entries)
+        self.statements = sum(e.stmt is not None for e in entries)
+        for e in entries:
+            e.chunk = self
+
+
+# ------------------------------
+# Lexing et analyse d'une région
+# ------------------------------
+def scan(text, line, lexer=LEXER):
+    # Tokens (type, valeur, ligne) et position de début de chacun. Un
+    # caractère non reconnu devient un token ERROR au lieu d'arrêter le
+    # lexing : seule l'instruction qui le contient sera en erreur.
+    kinds = lexer.kinds
+    keywords = lexer.keywords
+    id_index = lexer.id_index
+    skip_index = lexer.skip_index
+    match = lexer.pattern.match
+    tokens = []
+    starts = []
+    pos = 0
+    end = len(text)
+    while pos < end:
+        m = match(text, pos)
+        if m is None:
+            tokens.append(('ERROR', text[pos], line))
+            starts.append(pos)
+            if text[pos] == '\n':
+                line += 1
+            pos += 1
+            continue
+        i = m.lastindex
+        value = m.group()
+        if i == skip_index:
+            line += value.count('\n')
+        else:
+            kind = keywords.get(value, 'ID') if i == id_index else kinds[i]
+            tokens.append((kind, value, line))
+            starts.append(pos)
+            line += value.count('\n')
+        pos = m.end()
+    return tokens, starts
+
+
+def well_formed(node):
+    # Le parser descendant laisse None à la place d'un opérande manquant
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        for child in node.children():
+            if child is None:
+                return False
+            if not isinstance(child, str):
+                stack.append(child)
+    if isinstance(node, Decl):
+        return all(n.isidentifier() and n not in KEYWORDS for n in node.names)
+    return True
+
+
+def statement_at(tokens, i):
+    # (instruction, fin) si une instruction de premier niveau complète
+    # commence au token i, sinon (None, i)
+    kind = tokens[i][0]
+    if kind not in SECOND:
+        return None, i
+    try:
+        stmt, j = parse_statement(tokens, i)
+    except (IndexError, SyntaxError, RecursionError):
+        return None, i
+    if (stmt is None or j > len(tokens) or j < i + 2
+            or tokens[i + 1][0] != SECOND[kind] or tokens[j - 1][0] != LAST[kind]
+            or not well_formed(stmt) or any(t[0] == 'ERROR' for t in tokens[i:j])):
+        return None, i
+    return stmt, j
+
+
+def split_statements(tokens):
+    # [(début, fin, instruction ou None)] couvrant tous les tokens ; une
+    # entrée d'erreur s'arrête au premier ";" ou "}" qui suit son début
+    pieces = []
+    i = 0
+    n = len(tokens)
+    while i < n:
+        stmt, j = statement_at(tokens, i)
+        if stmt is None:
+            j = i + 1
+            if tokens[i][0] not in ('SEMICOLON', 'RBRACE'):
+                while j < n and tokens[j - 1][0] not in ('SEMICOLON', 'RBRACE'):
+                    j += 1
+        pieces.append((i, j, stmt))
+        i = j
+    return pieces
+
+
+def syntax_error(tokens, i, j):
+    for kind, value, line in tokens[i:j]:
+        if kind == 'ERROR':
+            return line, f"Caractère inattendu {value!r}"
+    return tokens[i][2], f"Erreur de syntaxe près de {tokens[i][1]!r}"
+
+
+def build_entries(text, line):
+    # Découpe le texte d'une région (commençant à la ligne line) en entrées
+    tokens, starts = scan(text, line)
+    pieces = split_statements(tokens)
+    entries = []
+    cut = 0
+    start_line = line
+    for k, (i, j, stmt) in enumerate(pieces):
+        nxt = starts[pieces[k + 1][0]] if k + 1 < len(pieces) else len(text)
+        entry_text = text[cut:nxt]
+        if stmt is None:
+            err_line, message = syntax_error(tokens, i, j)
+            kinds = [t[0] for t in tokens[i:j]]
+            entry = Entry(entry_text, None, start_line, (err_line - start_line, message),
+                          kinds.count('LBRACE') - kinds.count('RBRACE'))
+        else:
+            entry = Entry(entry_text, stmt, start_line)
+        entries.append(entry)
+        start_line += entry.lines
+        cut = nxt
+    if not pieces and text:
+        # Blancs seuls : entrée sans instruction, pour garder le texte
+        entries.append(Entry(text, None, line))
+    return entries
+
+
+# ------------------------------
+# Règles sémantiques
+# ------------------------------
+# Mêmes règles que minipython.semantic, par instruction : tout le
+# sous-arbre est parcouru dans l'ordre du texte, et une utilisation qui
+# suit une déclaration de la même instruction est déjà résolue
+def names_of(stmt, base):
+    # (déclarations, utilisations non résolues) : listes de (nom, ligne relative)
+    declares = []
+    uses = []
+    if stmt is None:
+        return declares, uses
+    local = set()
+    line = stmt.line
+    stack = [stmt]
+    while stack:
+        node = stack.pop()
+        if getattr(node, 'line', None) is not None and not isinstance(node, Var):
+            line = node.line
+        if isinstance(node, Decl):
+            declares.extend((name, line - base) for name in node.names)
+            local.update(node.names)
+        elif isinstance(node, (Assign, Var)) and node.name not in local:
+            at = node.line if isinstance(node, Var) and node.line is not None else line
+            uses.append((node.name, at - base))
+        stack.extend(c for c in reversed(node.children()) if not isinstance(c, str))
+    return declares, uses
+
+
+def shift_lines(node, delta):
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        if getattr(node, 'line', None) is not None:
+            node.line += delta
+        stack.extend(c for c in node.children() if c is not None and not isinstance(c, str))
+
+
+def order_key(entry):
+    return entry.order
+
+
+def problem_line(problem):
+    return problem[0]
+
+
+# ------------------------------
+# Document
+# ------------------------------
+class Document:
+    def __init__(self, source=""):
+        self._chunks = []
+        self._chars = 0
+        self._decls = {}        # nom -> entrées qui le déclarent
+        self._uses = {}         # nom -> entrées qui l'utilisent
+        self._flagged = set()   # entrées qui ont des diagnostics
+        if source:
+            self.edit(0, 0, source)
+
+    def __len__(self):
+        return sum(c.statements for c in self._chunks)
+
+    @property
+    def text(self):
+        return "".join(e.text for c in self._chunks for e in c.entries)
+
+    def ast(self):
+        # Liste des instructions ; les lignes des noeuds décalés par des
+        # éditions précédentes sont recalées ici
+        out = []
+        line = 1
+        for chunk in self._chunks:
+            for entry in chunk.entries:
+                if entry.stmt is not None:
+                    if entry.stamp != line:
+                        shift_lines(entry.stmt, line - entry.stamp)
+                        entry.stamp = line
+                    out.append(entry.stmt)
+                line += entry.lines
+        return out
+
+    def diagnostics(self):
+        starts = {}     # paquet -> ligne de début
+        line = 1
+        for chunk in self._chunks:
+            starts[chunk] = line
+            line += chunk.lines
+        lines = {}      # entrée -> ligne de début, pour les paquets concernés
+        out = []
+        for entry in sorted(self._flagged, key=order_key):
+            if entry not in lines:
+                line = starts[entry.chunk]
+                for e in entry.chunk.entries:
+                    lines[e] = line
+                    line += e.lines
+            base = lines[entry]
+            out.extend(Diagnostic(base + rel, message) for rel, message in entry.problems)
+        out.sort(key=lambda d: d.line)
+        return out
+
+    def offset(self, line, column=1):
+        # Position (ligne, colonne), comptées à partir de 1, en caractères
+        need = line - 1
+        pos = 0
+        if need:
+            for chunk in self._chunks:
+                if chunk.lines < need:
+                    need -= chunk.lines
+                    pos += chunk.chars
+                    continue
+                for entry in chunk.entries:
+                    if entry.lines < need:
+                        need -= entry.lines
+                        pos += len(entry.text)
+                        continue
+                    i = -1
+                    for _ in range(need):
+                        i = entry.text.index('\n', i + 1)
+                    return pos + i + column
+            raise ValueError(f"Ligne {line} hors du document")
+        return pos + column - 1
+
+    # --------------------------
+    # Navigation entre les entrées
+    # --------------------------
+    # Une position est (indice du paquet, indice dans le paquet)
+    def _locate(self, offset):
+        # Position de l'entrée qui contient le caractère offset, avec son
+        # décalage et sa ligne de début
+        pos = 0
+        line = 1
+        for ci, chunk in enumerate(self._chunks):
+            if offset < pos + chunk.chars:
+                for ei, entry in enumerate(chunk.entries):
+                    if offset < pos + len(entry.text):
+                        return (ci, ei), pos, line
+                    pos += len(entry.text)
+                    line += entry.lines
+            pos += chunk.chars
+            line += chunk.lines
+        raise IndexError(offset)
+
+    def _entry(self, at):
+        return self._chunks[at[0]].entries[at[1]]
+
+    def _prev(self, at):
+        ci, ei = at
+        if ei > 0:
+            return ci, ei - 1
+        if ci > 0:
+            return ci - 1, len(self._chunks[ci - 1].entries) - 1
+        return None
+
+    def _next(self, at):
+        ci, ei = at
+        if ei + 1 < len(self._chunks[ci].entries):
+            return ci, ei + 1
+        if ci + 1 < len(self._chunks):
+            return ci + 1, 0
+        return None
+
+    # --------------------------
+    # Édition
+    # --------------------------
+    def edit(self, start, end, text):
+        if not 0 <= start <= end <= self._chars:
+            raise ValueError(f"Intervalle d'édition invalide : {start}..{end}")
+        if self._chunks:
+            # Les entrées voisines d'une frontière sont incluses : le texte
+            # inséré peut compléter l'une ou l'autre
+            first, offset, line = self._locate(max(start - 1, 0))
+            last = self._locate(min(end, self._chars - 1))[0]
+            region = [first, last, offset, line]
+        else:
+            region = [None, None, 0, 1]
+
+        entries, region = self._reparse(region, start, end, text)
+        return self._replace(region, entries, end - start, len(text))
+
+    def _region_text(self, region, start, end, text):
+        first, last, offset, _ = region
+        parts = []
+        at = first
+        while at is not None:
+            parts.append(self._entry(at).text)
+            if at == last:
+                break
+            at = self._next(at)
+        old = "".join(parts)
+        return old[:start - offset] + text + old[end - offset:]
+
+    def _widen(self, region, start, end, text, back=0, forward=0):
+        # Élargit la région de back entrées avant et forward entrées après,
+        # puis jusqu'à ce que ses deux bords soient sûrs pour le lexer
+        first, last, offset, line = region
+        if first is None:
+            return region, text
+        for _ in range(back):
+            prev = self._prev(first)
+            if prev is None:
+                break
+            first = prev
+            offset -= len(self._entry(first).text)
+            line -= self._entry(first).lines
+        for _ in range(forward):
+            nxt = self._next(last)
+            if nxt is None:
+                break
+            last = nxt
+        while True:
+            region = [first, last, offset, line]
+            new = self._region_text(region, start, end, text)
+            prev = self._prev(first)
+            nxt = self._next(last)
+            blank = not new.strip(' \t\r\n')
+            if prev is not None and (blank or not new or (
+                    new[0] not in SEPARATORS
+                    and self._entry(prev).text[-1] not in SEPARATORS)):
+                first = prev
+                offset -= len(self._entry(first).text)
+                line -= self._entry(first).lines
+                continue
+            if nxt is not None and (blank or not new or (
+                    new[-1] not in SEPARATORS
+                    and self._entry(nxt).text[0] not in SEPARATORS)):
+                last = nxt
+                continue
+            return region, new
+
+    def _errors_near(self, at, step, sign):
+        # Distances (en entrées) des entrées d'erreur rencontrées depuis at
+        # en suivant step (self._prev ou self._next), dans la limite de
+        # WINDOW, dont le bilan d'accolades est du signe sign
+        found = []
+        for distance in range(1, WINDOW + 1):
+            at = step(at)
+            if at is None:
+                break
+            if self._entry(at).braces * sign > 0:
+                found.append(distance)
+        return found
+
+    def _reparse(self, region, start, end, text):
+        base, new = self._widen(region, start, end, text)
+        entries = build_entries(new, base[3])
+        if base[0] is None:
+            return entries, base
+        # Seules les accolades relient une instruction aux entrées voisines :
+        # une région qui en ouvre trop, ou proche d'entrées d'erreur aux
+        # accolades déséquilibrées, est étendue jusqu'à la plus lointaine
+        # puis la plus proche entrée qui ouvre un bloc avant elle (blocs
+        # imbriqués), et vers l'avant par pas doublés. La première région
+        # entièrement valide est retenue.
+        balance = sum(e.braces for e in entries)
+        opened = self._errors_near(base[0], self._prev, 1)
+        closed = self._errors_near(base[1], self._next, -1)
+        plans = []
+        if balance < 0 or closed:
+            plans = [(b, 0) for b in sorted(set(opened[:1] + opened[-1:]), reverse=True)]
+        if closed or balance > 0:
+            plans.append((0, closed[0] if closed else 1))
+        for b, forward in plans:
+            while forward <= WINDOW:
+                wide, new = self._widen(base, start, end, text, b, forward)
+                candidate = build_entries(new, wide[3])
+                if all(e.syntax is None for e in candidate):
+                    return candidate, wide
+                if self._next(wide[1]) is None:
+                    break
+                forward = forward * 2 if forward else 1
+        return entries, base
+
+    def _replace(self, region, entries, removed_chars, inserted_chars):
+        first, last, _, _ = region
+        chunks = self._chunks
+        if first is None:
+            ci, cj = 0, -1
+            before, after, removed = [], [], []
+            prev = nxt = None
+        else:
+            ci, ei = first
+            cj, ej = last
+            before = chunks[ci].entries[:first[1]]
+            after = chunks[cj].entries[ej + 1:]
+            removed = []
+            at = first
+            while True:
+                removed.append(self._entry(at))
+                if at == last:
+                    break
+                at = self._next(at)
+            prev = self._prev(first)
+            prev = self._entry(prev) if prev is not None else None
+            nxt = self._next(last)
+            nxt = self._entry(nxt) if nxt is not None else None
+
+        index = sum(c.statements for c in chunks[:ci]) + sum(
+            e.stmt is not None for e in before)
+
+        # Clés d'ordre : les nouvelles entrées reprennent celles des entrées
+        # remplacées ; les entrées en plus se placent après, avant la voisine
+        # suivante, à au plus STEP de distance pour laisser de la place
+        while True:
+            for entry, old in zip(entries, removed):
+                entry.order = old.order
+            extra = len(entries) - len(removed)
+            if extra <= 0:
+                break
+            if removed:
+                low = removed[-1].order
+            else:
+                low = prev.order if prev is not None else 0
+            high = nxt.order if nxt is not None else low + GAP
+            step = min((high - low) // (extra + 1), STEP)
+            if step:
+                for k, entry in enumerate(entries[len(removed):], 1):
+                    entry.order = low + step * k
+                break
+            self._renumber()
+
+        # Nouveaux paquets : un petit reste absorbe le paquet suivant
+        merged = before + entries + after
+        if len(merged) < CHUNK and cj + 1 < len(chunks):
+            cj += 1
+            merged += chunks[cj].entries
+        count = max(1, round(len(merged) / CHUNK)) if merged else 0
+        size = -(-len(merged) // count) if count else 0
+        chunks[ci:cj + 1] = [Chunk(merged[k:k + size]) for k in range(0, len(merged), size or 1)]
+        self._chars += inserted_chars - removed_chars
+
+        diagnostics = self._recheck(removed, entries)
+        return EditResult(index, sum(e.stmt is not None for e in removed),
+                          [e.stmt for e in entries if e.stmt is not None], diagnostics)
+
+    def _renumber(self):
+        order = 0
+        for chunk in self._chunks:
+            for entry in chunk.entries:
+                order += GAP
+                entry.order = order
+
+    # --------------------------
+    # Diagnostics
+    # --------------------------
+    def _first_decl(self, name):
+        entries = self._decls.get(name)
+        return min(entries, key=order_key) if entries else None
+
+    def _recheck(self, removed, added):
+        names = {n for e in removed for n, _ in e.declares}
+        names.update(n for e in added for n, _ in e.declares)
+        old_first = {n: self._first_decl(n) for n in names}
+
+        for entry in removed:
+            self._flagged.discard(entry)
+            for name, _ in entry.declares:
+                self._decls[name].remove(entry)
+                if not self._decls[name]:
+                    del self._decls[name]
+            for name, _ in entry.uses:
+                users = self._uses.get(name)
+                if users is not None:
+                    users.discard(entry)
+                    if not users:
+                        del self._uses[name]
+        for entry in added:
+            for name, _ in entry.declares:
+                self._decls.setdefault(name, []).append(entry)
+            for name, _ in entry.uses:
+                self._uses.setdefault(name, set()).add(entry)
+
+        # Les utilisations et déclarations hors de la région ne changent
+        # que si la première déclaration d'un nom passe d'un côté à l'autre
+        removed_ids = set(map(id, removed))
+        added_ids = set(map(id, added))
+        todo = set(added)
+        for name in names:
+            if (id(old_first[name]) in removed_ids) != (id(self._first_decl(name)) in added_ids):
+                todo.update(self._uses.get(name, ()))
+                todo.update(self._decls.get(name, ()))
+        for entry in todo:
+            self._check(entry)
+        return self.diagnostics()
+
+    def _check(self, entry):
+        problems = [entry.syntax] if entry.syntax is not None else []
+        seen = set()
+        for name, rel in entry.declares:
+            if name in seen or self._first_decl(name) is not entry:
+                problems.append((rel, f"Variable {name} déjà déclarée"))
+            seen.add(name)
+        for name, rel in entry.uses:
+            first = self._first_decl(name)
+            if first is None or first.order >= entry.order:
+                problems.append((rel, f"Variable {name} non déclarée"))
+        problems.sort(key=problem_line)
+        entry.problems = problems
+        if problems:
+            self._flagged.add(entry)
+        else:
+            self._flagged.discard(entry)
@@ -0,0 +1,105 @@
+# ------------------------------
+# Front-end Lark : AST et analyse sémantique
+# ------------------------------
+# Partagé par minipython_complete.py et par la compilation par lots
+# (minipython.batch). Les noeuds sont ceux du parser descendant : le TAC
+# vient du même générateur (minipython.tac.TACGenerator).
+import functools
+
+from lark import Transformer
+
+from minipython.lark_parser import GRAMMAR_PATH, build_parser, get_parser
+from minipython.nodes import (ADD, DIV, MUL, OP_CODES, SUB, Assign, BinOp, Block, Decl, If, Num,
+                              Print, UnaryOp, Var, While)
+from minipython.semantic import SemanticErrors, analyze
+
+
+def first_line(expr):
+    # Ligne du premier opérande d'une expression
+    while True:
+        if isinstance(expr, BinOp):
+            expr = expr.left
+        elif isinstance(expr, UnaryOp):
+            expr = expr.operand
+        else:
+            return expr.line
+
+
+# Les terminaux arrivent sous forme de lark.Token (avec leur ligne) : les
+# lignes sources sont prises sur les tokens, sans propagate_positions, ce
+# qui permet aussi d'appliquer le transformer pendant l'analyse LALR.
+class SyntaxTransformer(Transformer):
+    def start(self, items): return list(items)
+
+    def decl(self, items):
+        names = items[0]
+        node = Decl([str(n) for n in names])
+        node.line = names[0].line
+        return node
+
+    def var_list(self, items): return list(items)
+
+    def assign(self, items):
+        node = Assign(str(items[0]), items[1])
+        node.line = items[0].line
+        return node
+
+    def add(self, items): return BinOp(ADD, items[0], items[1])
+    def sub(self, items): return BinOp(SUB, items[0], items[1])
+    def mult(self, items): return BinOp(MUL, items[0], items[1])
+    def div(self, items): return BinOp(DIV, items[0], items[1])
+
+    def number(self, items):
+        node = Num(int(items[0]))
+        node.line = items[0].line
+        return node
+
+    def variable(self, items):
+        node = Var(str(items[0]))
+        node.line = items[0].line
+        return node
+
+    def print_stmt(self, items):
+        node = Print(items[0])
+        node.line = first_line(items[0])
+        return node
+
+    def stmt_list(self, items): return Block(list(items))
+
+    def while_stmt(self, items):
+        node = While(items[0], items[1])
+        node.line = first_line(items[0])
+        return node
+
+    def if_stmt(self, items):
+        node = If(items[0], items[1], items[2] if len(items) > 2 else None)
+        node.line = first_line(items[0])
+        return node
+
+    def condition(self, items): return BinOp(OP_CODES[str(items[1])], items[0], items[2])
+
+
+@functools.lru_cache(maxsize=None)
+def get_ast_parser(grammar_path=GRAMMAR_PATH, disk_cache=True):
+    # Parser "une passe" : SyntaxTransformer est appliqué à chaque réduction
+    # LALR, l'arbre lark.Tree intermédiaire n'est jamais construit
+    return build_parser(grammar_path, disk_cache, transformer=SyntaxTransformer())
+
+
+def parse(source, single_pass=True):
+    if single_pass:
+        return get_ast_parser().parse(source)
+    return SyntaxTransformer().transform(get_parser().parse(source))
+
+
+class SemanticChecker:
+    # Interface historique de minipython.semantic : toutes les erreurs sont
+    # levées ensemble (SemanticErrors), la table des symboles reste nom -> type
+    def __init__(self): self.symbol_table = {}
+
+    def check(self, ast_list):
+        analysis = analyze(ast_list)
+        self.symbol_table = analysis.symbol_table
+        if analysis.errors:
+            raise SemanticErrors(analysis.errors)
+        return ast_list
@@ -0,0 +1,67 @@
+# ------------------------------
+# Fabrique du parser Lark partagée
+# ------------------------------
+# Construire les tables LALR de minipython.lark coûte plus cher que l'analyse
+# d'un petit programme. get_parser() construit donc le parser une seule fois
+# par processus, et Lark sauvegarde ses tables dans un cache disque dont le
+# nom contient le hash de la grammaire : modifier minipython.lark invalide
+# automatiquement le cache.
+import functools
+import glob
+import hashlib
+import os
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+GRAMMAR_PATH = os.path.join(ROOT, "minipython.lark")
+CACHE_DIR = os.environ.get("MINIPYTHON_CACHE_DIR", os.path.join(ROOT, ".minipython_cache"))
+
+PARSER_OPTIONS = dict(start="start", parser="lalr", lexer="basic")
+
+
+def grammar_hash(grammar):
+    return hashlib.sha256(grammar.encode("utf-8")).hexdigest()[:16]
+
+
+def cache_path(grammar, grammar_path=GRAMMAR_PATH, cache_dir=CACHE_DIR):
+    name = os.path.splitext(os.path.basename(grammar_path))[0]
+    return os.path.join(cache_dir, f"{name}-{grammar_hash(grammar)}.lark-cache")
+
+
+def prune_cache(current, cache_dir=CACHE_DIR):
+    # Supprime les tables d'anciennes versions de la même grammaire
+    prefix = os.path.basename(current).rsplit("-", 1)[0]
+    for path in glob.glob(os.path.join(cache_dir, f"{prefix}-*.lark-cache")):
+        if path != current:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+def build_parser(grammar_path=GRAMMAR_PATH, disk_cache=True, **options):
+    # options : passées à Lark en plus de PARSER_OPTIONS (ex. transformer).
+    # Les tables LALR ne dépendent pas du transformer : le même fichier de
+    # cache sert aux deux modes d'analyse.
+    from lark import Lark
+
+    with open(grammar_path, "r", encoding="utf-8") as f:
+        grammar = f.read()
+    options = dict(PARSER_OPTIONS, **options)
+
+    if not disk_cache:
+        return Lark(grammar, **options)
+
+    path = cache_path(grammar, grammar_path)
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+    except OSError:
+        # Répertoire non inscriptible : on se passe du cache disque
+        return Lark(grammar, **options)
+    if not os.path.exists(path):
+        prune_cache(path)
+    return Lark(grammar, cache=path, **options)
+
+
+@functools.lru_cache(maxsize=None)
+def get_parser(grammar_path=GRAMMAR_PATH, disk_cache=True):
+    return build_parser(grammar_path, disk_cache)
@@ -0,0 +1,229 @@
+# ------------------------------
+# Analyse lexicale
+# ------------------------------
+# tokenize() découpe une chaîne complète en liste de (type, valeur).
+# Pour les gros programmes, iter_tokens() lit un fichier par morceaux et
+# produit les tokens à la demande avec leur ligne et colonne ; TokenStream
+# les présente au parser comme une liste, en ne gardant en mémoire que la
+# fenêtre en cours d'analyse.
+#
+# Une seule expression régulière, compilée à l'import, reconnaît tous les
+# tokens. Les identifiants ont un seul motif et les mots-clés sont
+# reconnus par un dictionnaire ("interval" est bien un ID, pas INT +
+# "erval"). Le type d'un token est retrouvé par match.lastindex (un entier)
+# plutôt que par lastgroup, et tout caractère non reconnu lève LexError.
+import re
+from collections import namedtuple
+
+KEYWORDS = {
+    'int': 'INT', 'float': 'FLOAT', 'bool': 'BOOL', 'string': 'STRING',
+    'print': 'PRINT', 'while': 'WHILE', 'if': 'IF', 'else': 'ELSE', 'for': 'FOR',
+    'true': 'TRUE', 'false': 'FALSE',
+}
+
+# Ordre : motifs les plus fréquents d'abord, puis opérateurs de deux
+# caractères avant leur préfixe d'un caractère
+token_specification = [
+    ('ID', r'[A-Za-z_]\w*'),
+    ('SKIP', r'[ \t\r\n]+'),
+    ('FLOATNUM', r'\d+\.\d+'),
+    ('NUMBER', r'\d+'),
+    ('SEMICOLON', r';'),
+    ('LPAR', r'\('), ('RPAR', r'\)'),
+    ('LBRACE', r'\{'), ('RBRACE', r'\}'),
+
+    ('EQEQ', r'=='), ('NEQ', r'!='), ('LTE', r'<='), ('GTE', r'>='),
+    ('LT', r'<'), ('GT', r'>'),
+    ('AND', r'&&'), ('OR', r'\|\|'), ('NOT', r'!'),
+
+    ('PLUS', r'\+'), ('MINUS', r'-'),
+    ('STAR', r'\*'), ('SLASH', r'/'),
+    ('EQUAL', r'='),
+
+    ('STRINGLIT', r'"[^"]*"'),
+]
+
+
+class LexError(ValueError):
+    def __init__(self, message, line, column):
+        super().__init__(message)
+        self.line = line
+        self.column = column
+
+
+class Lexer:
+    # Tables précalculées pour une spécification [(type, motif), ...]
+    def __init__(self, spec, keywords=None):
+        self.pattern = re.compile('|'.join(f'({p})' for _, p in spec))
+        if self.pattern.groups != len(spec):
+            raise ValueError("les motifs ne doivent pas contenir de groupes capturants")
+        # kinds[i] : type du token reconnu par le groupe i (match.lastindex)
+        self.kinds = [None] + [name for name, _ in spec]
+        self.keywords = keywords or {}
+        self.id_index = self.kinds.index('ID') if self.keywords else -1
+        self.skip_index = self.kinds.index('SKIP') if 'SKIP' in self.kinds else -1
+        self.string_index = self.kinds.index('STRINGLIT') if 'STRINGLIT' in self.kinds else -1
+
+    def error(self, text, pos, line=None, line_start=None):
+        if line is None:
+            line = text.count('\n', 0, pos) + 1
+            line_start = text.rfind('\n', 0, pos) + 1
+        column = pos - line_start + 1
+        return LexError(f"Caractère inattendu {text[pos]!r} ligne {line}, colonne {column}",
+                        line, column)
+
+    def tokenize(self, code):
+        kinds = self.kinds
+        keywords = self.keywords
+        id_index = self.id_index
+        skip_index = self.skip_index
+        out = []
+        append = out.append
+        pos = 0
+        for m in self.pattern.finditer(code):
+            if m.start() != pos:
+                raise self.error(code, pos)
+            pos = m.end()
+            i = m.lastindex
+            if i == skip_index:
+                continue
+            text = m.group()
+            if i == id_index:
+                append((keywords.get(text, 'ID'), text))
+            else:
+                append((kinds[i], text))
+        if pos != len(code):
+            raise self.error(code, pos)
+        return out
+
+
+LEXER = Lexer(token_specification, KEYWORDS)
+
+
+def compile_spec(spec, keywords=None):
+    return Lexer(spec, keywords)
+
+
+def tokenize(code, lexer=LEXER):
+    return lexer.tokenize(code)
+
+
+# ------------------------------
+# Lexer incrémental
+# ------------------------------
+Token = namedtuple('Token', 'type value line column')
+
+CHUNK_SIZE = 1 << 16
+# Un token n'est accepté que s'il se termine à plus de MARGIN caractères de
+# la fin du tampon : la suite pourrait encore le prolonger ("whi|le",
+# "1.|5"). Seules les chaînes littérales peuvent dépasser cette marge.
+MARGIN = 32
+
+
+def iter_tokens(fileobj, lexer=LEXER, chunk_size=CHUNK_SIZE):
+    # Mêmes tokens que tokenize() sur le texte complet, mais avec une
+    # mémoire bornée par chunk_size
+    finditer = lexer.pattern.finditer
+    kinds = lexer.kinds
+    keywords = lexer.keywords
+    id_index = lexer.id_index
+    skip_index = lexer.skip_index
+    string_index = lexer.string_index
+    new_token = tuple.__new__     # évite Token.__new__, écrit en Python
+    buffer = ""
+    pos = 0
+    base = 0          # position absolue de buffer[0]
+    line = 1
+    line_start = 0    # position absolue du début de la ligne courante
+    eof = False
+
+    while True:
+        if not eof:
+            chunk = fileobj.read(chunk_size)
+            base += pos
+            buffer = buffer[pos:] + chunk
+            pos = 0
+            eof = not chunk
+        limit = len(buffer) if eof else len(buffer) - MARGIN
+
+        for m in finditer(buffer, pos):
+            start = m.start()
+            if start != pos:
+                # Caractère non reconnu, sauf un guillemet dont la chaîne
+                # n'est pas encore entièrement lue
+                if not eof and buffer[pos] == '"':
+                    break
+                raise lexer.error(buffer, pos, line, line_start - base)
+            end = m.end()
+            if end > limit:
+                break
+            i = m.lastindex
+            if i == skip_index or i == string_index:
+                text = m.group()
+                if i == string_index:
+                    yield new_token(Token, ('STRINGLIT', text, line, base + start - line_start + 1))
+                if '\n' in text:
+                    line += text.count('\n')
+                    line_start = base + start + text.rindex('\n') + 1
+            else:
+                text = m.group()
+                kind = keywords.get(text, 'ID') if i == id_index else kinds[i]
+                yield new_token(Token, (kind, text, line, base + start - line_start + 1))
+            pos = end
+        else:
+            if eof:
+                if pos < len(buffer):
+                    raise lexer.error(buffer, pos, line, line_start - base)
+                return
+
+
+class TokenStream:
+    # Vue "liste" paresseuse sur un itérateur de tokens : tokens[i] et
+    # len(tokens) se comportent comme sur la liste complète tant que le
+    # parser n'anticipe pas de plus de LOOKAHEAD tokens, et release(i)
+    # oublie les tokens d'index inférieur à i.
+    LOOKAHEAD = 4
+
+    def __init__(self, tokens):
+        self._source = iter(tokens)
+        self._buffer = []
+        self._offset = 0      # index absolu de _buffer[0]
+        self._highest = -1    # plus grand index demandé
+        self._exhausted = False
+
+    def _fill(self, index):
+        end = self._offset + len(self._buffer)
+        while end <= index and not self._exhausted:
+            try:
+                self._buffer.append(next(self._source))
+                end += 1
+            except StopIteration:
+                self._exhausted = True
+
+    def __getitem__(self, index):
+        if index < self._offset:
+            raise IndexError(f"token {index} déjà libéré")
+        if index > self._highest:
+            self._highest = index
+        self._fill(index)
+        try:
+            return self._buffer[index - self._offset]
+        except IndexError:
+            raise IndexError(f"token {index} hors du flux") from None
+
+    def __len__(self):
+        self._fill(self._highest + self.LOOKAHEAD)
+        return self._offset + len(self._buffer)
+
+    def release(self, index):
+        drop = index - self._offset
+        if drop > 0:
+            # Tokens sautés sans être lus (le ";" d'une instruction) : lus
+            # avant d'être oubliés, sinon les index suivants seraient décalés
+            self._fill(index - 1)
+            del self._buffer[:drop]
+            self._offset = index
+
+
+def stream_tokens(fileobj, chunk_size=CHUNK_SIZE):
+    return TokenStream(iter_tokens(fileobj, chunk_size=chunk_size))
@@ -0,0 +1,197 @@
+# ------------------------------
+# Noeuds de l'AST MiniPython
+# ------------------------------
+# Classes compactes (__slots__) produites par le parser descendant
+# (minipython.parser) et par le SyntaxTransformer Lark
+# (minipython.lark_frontend). Les noms de variables sont internés et les
+# opérateurs sont des entiers : les phases suivantes n'ont plus aucune
+# chaîne à découper.
+import operator
+import sys
+
+# Codes des opérateurs
+(ADD, SUB, MUL, DIV, LT, GT, LTE, GTE, EQ, NEQ, AND, OR, NEG, NOT) = range(14)
+
+OP_SYMBOLS = ('+', '-', '*', '/', '<', '>', '<=', '>=', '==', '!=', '&&', '||', '-', '!')
+OP_CODES = {sym: code for code, sym in enumerate(OP_SYMBOLS[:NEG])}
+# Nom de l'instruction TAC correspondant à chaque opérateur
+TAC_NAMES = ('ADD', 'SUB', 'MUL', 'DIV', 'LT', 'GT', 'LTE', 'GTE', 'EQ', 'NEQ',
+             'AND', 'OR', 'NEG', 'NOT')
+
+# Sémantique de chaque opérateur (&& et || : valeur Python de and / or ;
+# les moteurs les évaluent en court-circuit, sans calculer l'opérande droit
+# quand le gauche décide du résultat)
+OP_FUNCS = (
+    operator.add, operator.sub, operator.mul, operator.truediv,
+    operator.lt, operator.gt, operator.le, operator.ge,
+    operator.eq, operator.ne,
+    lambda a, b: a and b, lambda a, b: a or b,
+    operator.neg, operator.not_,
+)
+
+intern = sys.intern
+
+# Attributs posés par les passes d'analyse (non affichés par repr)
+ANNOTATIONS = ('slot', 'line', 'vtype')
+
+
+class Node:
+    __slots__ = ()
+
+    def __repr__(self):
+        values = []
+        for f in self.__slots__:
+            if f in ANNOTATIONS:
+                continue
+            v = getattr(self, f)
+            values.append(repr(OP_SYMBOLS[v] if f == 'op' else v))
+        return f"{type(self).__name__}({', '.join(values)})"
+
+    @property
+    def label(self):
+        return type(self).__name__
+
+    def children(self):
+        # Enfants pour l'affichage : noeuds ou feuilles (chaînes)
+        return []
+
+
+# ------------------------------
+# Expressions
+# ------------------------------
+class Num(Node):
+    __slots__ = ('value', 'line', 'vtype')
+
+    def __init__(self, value):
+        self.value = value
+        self.line = None
+        self.vtype = None   # type de la valeur (minipython.semantic)
+
+    @property
+    def label(self):
+        return f"Const: {self.value}"
+
+
+class Var(Node):
+    __slots__ = ('name', 'slot', 'line', 'vtype')
+
+    def __init__(self, name):
+        self.name = intern(name)
+        self.slot = None    # index de la variable (minipython.resolve)
+        self.line = None
+        self.vtype = None
+
+    @property
+    def label(self):
+        return f"Var: {self.name}"
+
+
+class BinOp(Node):
+    __slots__ = ('op', 'left', 'right', 'vtype')
+
+    def __init__(self, op, left, right):
+        self.op = op
+        self.left = left
+        self.right = right
+        self.vtype = None
+
+    @property
+    def label(self):
+        return f"Expr: {OP_SYMBOLS[self.op]}"
+
+    def children(self):
+        return [self.left, self.right]
+
+
+class UnaryOp(Node):
+    __slots__ = ('op', 'operand', 'vtype')
+
+    def __init__(self, op, operand):
+        self.op = op
+        self.operand = operand
+        self.vtype = None
+
+    @property
+    def label(self):
+        return f"Expr: unary{OP_SYMBOLS[self.op]}"
+
+    def children(self):
+        return [self.operand]
+
+
+# ------------------------------
+# Instructions
+# ------------------------------
+# L'attribut line (ligne du programme source, None si inconnue) est
+# renseigné par le parser sur les instructions et sur les feuilles (Num,
+# Var) ; il sert aux messages d'erreur et à la table de correspondance du
+# transpileur (minipython.transpile).
+class Decl(Node):
+    __slots__ = ('names', 'type', 'line')
+
+    def __init__(self, names, type='int'):
+        self.names = [intern(n) for n in names]
+        self.type = type
+        self.line = None
+
+    def children(self):
+        return [f"Var: {n} (type={self.type})" for n in self.names]
+
+
+class Assign(Node):
+    __slots__ = ('name', 'value', 'slot', 'line')
+
+    def __init__(self, name, value):
+        self.name = intern(name)
+        self.value = value
+        self.slot = None
+        self.line = None
+
+    def children(self):
+        return [f"Var: {self.name}", self.value]
+
+
+class Print(Node):
+    __slots__ = ('value', 'line')
+
+    def __init__(self, value):
+        self.value = value
+        self.line = None
+
+    def children(self):
+        return [self.value]
+
+
+class Block(Node):
+    __slots__ = ('stmts',)
+
+    def __init__(self, stmts):
+        self.stmts = stmts
+
+    def children(self):
+        return self.stmts
+
+
+class While(Node):
+    __slots__ = ('cond', 'body', 'line')
+
+    def __init__(self, cond, body):
+        self.cond = cond
+        self.body = body
+        self.line = None
+
+    def children(self):
+        return [self.cond, self.body]
+
+
+class If(Node):
+    __slots__ = ('cond', 'then', 'orelse', 'line')
+
+    def __init__(self, cond, then, orelse=None):
+        self.cond = cond
+        self.then = then
+        self.orelse = orelse if orelse is not None else Block([])
+        self.line = None
+
+    def children(self):
+        return [self.cond, self.then, self.orelse]
@@ -0,0 +1,213 @@
+# ------------------------------
+# Exécution parallèle de lots de programmes MiniPython
+# ------------------------------
+# Usage :
+#     python -m minipython.parallel jobs.jsonl -o resultats.jsonl -j 4
+#
+# Un job est une ligne JSON :
+#     {"id": ..., "source": ... (ou "file": ...), "inputs": {nom: valeur}}
+# "inputs" donne la valeur initiale des variables déclarées (0 sinon).
+# Une ligne JSON est écrite par job, dans l'ordre des jobs :
+#     {"id", "success", "diagnostics", "output", "variables", "steps"}
+#
+# Chaque programme distinct n'est compilé qu'une fois (lexer, parser,
+# sémantique), quel que soit le nombre de jobs qui l'exécutent. Sa forme
+# compilée (CompiledProgram de minipython.compile_cache : AST encodé en
+# tuples marshal, compact et sans exécution de code au chargement) part
+# vers le pool avec des paquets de jobs triés par programme : un paquet
+# transporte chaque programme une seule fois, et un worker garde les
+# programmes décodés pour les paquets suivants. Les print sont capturés
+# job par job ; chaque exécution est bornée par minipython.governor
+# (budget de pas, délai), ce qui arrête les boucles sans fin.
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from minipython.batch import diagnostic, diagnostics
+
+DEFAULT_BUDGET = 1_000_000
+
+# Jobs au plus par paquet envoyé à un worker
+MAX_CHUNK = 256
+
+# Programmes décodés gardés par worker
+MAX_LOADED = 256
+
+loaded = {}
+
+
+# ------------------------------
+# Compilation (une fois par programme distinct)
+# ------------------------------
+def compile_source(source, frontend="rd"):
+    # (CompiledProgram sérialisé ou None, diagnostics)
+    from minipython import check, generate_tac, parse
+    from minipython.compile_cache import CompiledProgram
+
+    phase = "parse"
+    try:
+        ast = parse(source, frontend)
+        phase = "semantic"
+        ast, symtab = check(ast)
+        phase = "tac"
+        tac = generate_tac(ast)
+    except Exception as e:
+        return None, diagnostics(phase, e)
+    return CompiledProgram(ast, symtab, tac).to_bytes(), []
+
+
+def compile_batch(sources, frontend):
+    return [compile_source(source, frontend) for source in sources]
+
+
+# ------------------------------
+# Exécution (côté worker)
+# ------------------------------
+def load(key, data):
+    from minipython.compile_cache import CompiledProgram
+
+    program = loaded.get(key)
+    if program is None:
+        if len(loaded) >= MAX_LOADED:
+            loaded.clear()
+        program = loaded[key] = CompiledProgram.from_bytes(data)
+    return program
+
+
+def run_job(program, inputs, budget, timeout):
+    from minipython.governor import Governor, LimitExceeded, run
+
+    result = {"success": False, "diagnostics": []}
+    env = {name: 0 for name in program.symtab}
+    for name, value in inputs.items():
+        if name not in env:
+            result["diagnostics"].append(diagnostic("inputs", f"Variable {name} non déclarée"))
+        elif type(value) not in (int, float, bool):
+            result["diagnostics"].append(diagnostic("inputs", f"Valeur invalide pour {name}"))
+        else:
+            env[name] = value
+    if result["diagnostics"]:
+        return result
+    output = []
+    try:
+        steps = run(program.ast, env, Governor(max_steps=budget, max_seconds=timeout),
+                    on_print=output.append)
+    except LimitExceeded as e:
+        result["diagnostics"].append(diagnostic("run", e))
+        result["limit"] = e.limit
+        steps = e.steps
+    except Exception as e:
+        result["diagnostics"].extend(diagnostics("run", e))
+        steps = None
+    result["success"] = not result["diagnostics"]
+    result.update(output=output, variables=env, steps=steps)
+    return result
+
+
+def run_chunk(programs, jobs, budget, timeout):
+    # programs : {clé: CompiledProgram sérialisé} des jobs du paquet ;
+    # jobs : [(index, clé, inputs)] -> [(index, résultat)]
+    return [(index, run_job(load(key, programs[key]), inputs, budget, timeout))
+            for index, key, inputs in jobs]
+
+
+# ------------------------------
+# Côté parent
+# ------------------------------
+def chunks(items, size):
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+def run_jobs(jobs, workers=None, frontend="rd", budget=DEFAULT_BUDGET, timeout=None):
+    # jobs : liste de (source, inputs) ; renvoie un résultat par job, dans
+    # l'ordre. workers=1 : tout dans le processus courant, sans pool
+    from minipython.compile_cache import source_key
+
+    workers = workers or os.cpu_count()
+    keys = [source_key(source, frontend, "") for source, _ in jobs]
+    distinct = dict(zip(keys, (source for source, _ in jobs)))
+    order = sorted(range(len(jobs)), key=keys.__getitem__)
+    size = max(1, min(MAX_CHUNK, len(jobs) // (4 * workers)))
+    pool = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    try:
+        mapper = pool.map if pool is not None else map
+        # 1. Compilation des programmes distincts, par paquets
+        sources = chunks(list(distinct.values()), max(1, len(distinct) // (4 * workers)))
+        compiled = dict(zip(distinct, (c for batch in
+                                       mapper(compile_batch, sources, [frontend] * len(sources))
+                                       for c in batch)))
+        # 2. Exécution : les jobs d'un programme qui ne compile pas échouent
+        results = [None] * len(jobs)
+        runnable = []
+        for index in order:
+            data, errors = compiled[keys[index]]
+            if data is None:
+                results[index] = {"success": False, "diagnostics": errors}
+            else:
+                runnable.append((index, keys[index], jobs[index][1]))
+        batches = chunks(runnable, size)
+        programs = [{key: compiled[key][0] for _, key, _ in batch} for batch in batches]
+        for batch in mapper(run_chunk, programs, batches, [budget] * len(batches),
+                            [timeout] * len(batches)):
+            for index, result in batch:
+                results[index] = result
+    finally:
+        if pool is not None:
+            pool.shutdown()
+    return results
+
+
+def read_jobs(path):
+    # [(id, source, inputs)] depuis un fichier JSON lines ("-" : entrée standard)
+    jobs = []
+    with (sys.stdin if path == "-" else open(path, "r", encoding="utf-8")) as f:
+        for n, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            job = json.loads(line)
+            if "source" in job:
+                source = job["source"]
+            else:
+                with open(job["file"], "r", encoding="utf-8") as g:
+                    source = g.read()
+            jobs.append((job.get("id", n), source, job.get("inputs") or {}))
+    return jobs
+
+
+def main(argv=None):
+    arg_parser = argparse.ArgumentParser(description="Exécution MiniPython par lots")
+    arg_parser.add_argument("jobs", help="fichier JSON lines des jobs (- : entrée standard)")
+    arg_parser.add_argument("-o", "--output", help="fichier JSON lines (défaut : sortie standard)")
+    arg_parser.add_argument("-j", "--jobs", dest="workers", type=int, default=os.cpu_count(),
+                            help="nombre de processus (défaut : nombre de coeurs)")
+    arg_parser.add_argument("--frontend", choices=("rd", "lark"), default="rd")
+    arg_parser.add_argument("--budget", type=int, default=DEFAULT_BUDGET,
+                            help="pas d'exécution au plus par job")
+    arg_parser.add_argument("--timeout", type=float, help="durée d'exécution au plus par job (s)")
+    args = arg_parser.parse_args(argv)
+
+    jobs = read_jobs(args.jobs)
+    start = time.perf_counter()
+    results = run_jobs([(source, inputs) for _, source, inputs in jobs], args.workers,
+                       args.frontend, args.budget, args.timeout)
+    elapsed = time.perf_counter() - start
+
+    out = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    try:
+        for (job_id, _, _), result in zip(jobs, results):
+            out.write(json.dumps({"id": job_id, **result}, ensure_ascii=False) + "\n")
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    failures = sum(not r["success"] for r in results)
+    distinct = len({source for _, source, _ in jobs})
+    print(f"{len(jobs)} jobs ({distinct} programmes), {failures} en échec, {elapsed:.2f} s "
+          f"({len(jobs) / elapsed:.1f} jobs/s, {args.workers} processus)", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
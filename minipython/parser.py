@@ -0,0 +1,203 @@
+# ------------------------------
+# Analyse syntaxique descendante récursive & AST
+# ------------------------------
+# Produit les noeuds de minipython.nodes. Les fonctions acceptent une liste
+# de tokens ou un TokenStream (minipython.lexer) : l'accès se fait uniquement
+# par index avec une anticipation bornée. Avec des tokens positionnés
+# (minipython.lexer.Token), chaque instruction reçoit sa ligne source.
+from minipython.nodes import (ADD, AND, DIV, EQ, GT, GTE, LT, LTE, MUL, NEG, NEQ, NOT, OR,
+                              SUB, Assign, BinOp, Block, Decl, If, Num, Print, UnaryOp,
+                              Var, While)
+
+###########
+# EXPRESSIONS
+###########
+# Analyse par précédence avec deux piles explicites (opérandes, opérateurs) :
+# la profondeur d'imbrication des parenthèses et des opérateurs unaires ne
+# consomme aucun cadre de pile Python. Tous les opérateurs binaires sont
+# associatifs à gauche ; les unaires lient plus fort que tous les binaires.
+
+# type de token -> (précédence, code de l'opérateur)
+BINARY = {
+    'OR': (1, OR), 'AND': (2, AND),
+    'EQEQ': (3, EQ), 'NEQ': (3, NEQ),
+    'LT': (4, LT), 'GT': (4, GT), 'LTE': (4, LTE), 'GTE': (4, GTE),
+    'PLUS': (5, ADD), 'MINUS': (5, SUB),
+    'STAR': (6, MUL), 'SLASH': (6, DIV),
+}
+UNARY = {'MINUS': NEG, 'NOT': NOT}
+UNARY_PREC = 7
+PAREN = (0, None)     # marqueur de parenthèse ouvrante sur la pile
+
+def where(tok):
+    return f" ligne {tok[2]}" if len(tok) > 2 else ""
+
+def end_of_input(tokens):
+    # Programme tronqué : les tokens s'arrêtent au milieu d'une instruction
+    n = len(tokens)
+    try:
+        last = tokens[n - 1] if n else ()
+    except IndexError:    # TokenStream : token déjà libéré
+        last = ()
+    return SyntaxError(f"Fin de programme inattendue{where(last)}")
+
+def parse_expr(tokens, i):
+    operands = []
+    operators = []
+    push = operands.append
+    pop = operands.pop
+    depth = 0         # parenthèses ouvertes
+    while True:
+        # Position d'opérande : opérateurs unaires et parenthèses ouvrantes
+        try:
+            tok = tokens[i]
+        except IndexError:
+            raise end_of_input(tokens) from None
+        kind = tok[0]
+        if kind == 'ID' or kind == 'NUMBER':
+            leaf = Var(tok[1]) if kind == 'ID' else Num(int(tok[1]))
+            if len(tok) > 2:
+                leaf.line = tok[2]
+            push(leaf)
+            i += 1
+        elif kind == 'LPAR':
+            operators.append(PAREN)
+            depth += 1
+            i += 1
+            continue
+        elif kind in UNARY:
+            operators.append((UNARY_PREC, UNARY[kind]))
+            i += 1
+            continue
+        else:
+            raise SyntaxError(f"Expression attendue au lieu de {tok[1]!r}{where(tok)}")
+
+        # Après un opérande : opérateur binaire, fermeture ou fin
+        while True:
+            try:
+                kind = tokens[i][0]
+            except IndexError:
+                kind = None
+            binary = BINARY.get(kind)
+            if binary is not None:
+                prec = binary[0]
+                while operators and operators[-1][0] >= prec:
+                    top, op = operators.pop()
+                    if top == UNARY_PREC:
+                        push(UnaryOp(op, pop()))
+                    else:
+                        right = pop()
+                        push(BinOp(op, pop(), right))
+                operators.append(binary)
+                i += 1
+                break
+            while operators and operators[-1] is not PAREN:
+                top, op = operators.pop()
+                if top == UNARY_PREC:
+                    push(UnaryOp(op, pop()))
+                else:
+                    right = pop()
+                    push(BinOp(op, pop(), right))
+            if depth == 0:
+                return operands[0], i
+            # Le token qui termine une sous-expression doit être sa ")"
+            if kind is None:
+                raise end_of_input(tokens)
+            if kind != 'RPAR':
+                raise SyntaxError(f"')' attendue au lieu de {tokens[i][1]!r}")
+            operators.pop()
+            depth -= 1
+            i += 1
+
+###########
+# STATEMENTS
+###########
+# Tokens obligatoires d'une instruction : un token manquant est une erreur,
+# jamais sauté sans être lu
+EXPECTED = {'ID': "Nom de variable attendu", 'EQUAL': "'=' attendu", 'SEMICOLON': "';' attendu",
+            'LPAR': "'(' attendue", 'RPAR': "')' attendue", 'LBRACE': "'{' attendue"}
+
+def expect(tokens, i, kind):
+    tok=tokens[i]
+    if tok[0]!=kind:
+        raise SyntaxError(f"{EXPECTED[kind]} au lieu de {tok[1]!r}{where(tok)}")
+    return i+1
+
+def parse_statement(tokens, i):
+    tok=tokens[i]
+    try:
+        stmt,i=_parse_statement(tokens,i)
+    except IndexError:
+        # Instruction ou bloc coupé par la fin des tokens
+        raise end_of_input(tokens) from None
+    if stmt is not None and len(tok)>2:
+        stmt.line=tok[2]
+    return stmt,i
+
+def _parse_statement(tokens, i):
+    if tokens[i][0]=='INT':
+        varname=tokens[i+1][1]
+        i=expect(tokens,i+1,'ID')
+        i=expect(tokens,i,'SEMICOLON')
+        return Decl([varname]), i
+    
+    if tokens[i][0]=='ID':
+        var=tokens[i][1]
+        i=expect(tokens,i+1,'EQUAL')
+        expr,i=parse_expr(tokens,i)
+        i=expect(tokens,i,'SEMICOLON')
+        return Assign(var,expr),i
+
+    if tokens[i][0]=='PRINT':
+        i=expect(tokens,i+1,'LPAR')
+        expr,i=parse_expr(tokens,i)
+        i=expect(tokens,i,'RPAR')
+        i=expect(tokens,i,'SEMICOLON')
+        return Print(expr),i
+
+    if tokens[i][0]=='WHILE':
+        i=expect(tokens,i+1,'LPAR')
+        cond,i=parse_expr(tokens,i)
+        i=expect(tokens,i,'RPAR')
+        body,i=parse_block(tokens,i)
+        return While(cond,Block(body)),i
+
+    if tokens[i][0]=='IF':
+        i=expect(tokens,i+1,'LPAR')
+        cond,i=parse_expr(tokens,i)
+        i=expect(tokens,i,'RPAR')
+        then_body,i=parse_block(tokens,i)
+        return If(cond,Block(then_body)),i
+
+    return None,i
+
+def unexpected(tok):
+    # Token qui ne peut commencer aucune instruction
+    return SyntaxError(f"Instruction inattendue {tok[1]!r}{where(tok)}")
+
+def parse_block(tokens,i):
+    i=expect(tokens,i,'LBRACE')
+    body=[]
+    while tokens[i][0] != 'RBRACE':
+        stmt,i=parse_statement(tokens,i)
+        if stmt is None:
+            raise unexpected(tokens[i])
+        body.append(stmt)
+    return body,i+1
+
+# Parse global
+def iter_statements(tokens):
+    # Produit les instructions de premier niveau une à une ; avec un
+    # TokenStream, les tokens déjà consommés sont libérés au fur et à mesure
+    release=getattr(tokens,"release",None)
+    i=0
+    while i<len(tokens):
+        stmt,i=parse_statement(tokens,i)
+        if stmt is None:
+            raise unexpected(tokens[i])
+        if release is not None:
+            release(i)
+        yield stmt
+
+def parse_program(tokens):
+    return list(iter_statements(tokens))
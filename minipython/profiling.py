@@ -0,0 +1,130 @@
+# ------------------------------
+# Instrumentation des phases et profilage de l'exécution
+# ------------------------------
+# Instrumentation.phase(nom) entoure une phase (lexing, parse, transform,
+# sémantique, TAC, exécution) et mesure sa durée, ses allocations
+# (tracemalloc, si activé) et les compteurs renseignés par l'appelant
+# (tokens, noeuds, instructions TAC...). Les observateurs reçoivent :
+#  - on_phase_start(nom) / on_phase_end(record) autour de chaque phase ;
+#  - on_stmt(noeud) à chaque instruction exécutée par l'interprète d'AST.
+# Profiler est l'observateur standard : il garde les mesures et produit un
+# rapport, avec les instructions les plus exécutées (boucles chaudes).
+import contextlib
+import time
+
+
+class PhaseRecord:
+    __slots__ = ('name', 'seconds', 'allocated', 'peak', 'counts')
+
+    def __init__(self, name):
+        self.name = name
+        self.seconds = 0.0
+        self.allocated = None   # octets encore alloués en fin de phase
+        self.peak = None        # pic d'allocation pendant la phase
+        self.counts = {}
+
+
+class Observer:
+    # Interface : les sous-classes ne redéfinissent que ce qui les intéresse
+    def on_phase_start(self, name):
+        pass
+
+    def on_phase_end(self, record):
+        pass
+
+    def on_stmt(self, node):
+        pass
+
+
+class Instrumentation:
+    def __init__(self, *observers, trace_alloc=False):
+        self.observers = list(observers)
+        self.trace_alloc = trace_alloc
+
+    def add(self, observer):
+        self.observers.append(observer)
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        record = PhaseRecord(name)
+        for o in self.observers:
+            o.on_phase_start(name)
+        started = False
+        if self.trace_alloc:
+            import tracemalloc
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                started = True
+            tracemalloc.reset_peak()
+            before = tracemalloc.get_traced_memory()[0]
+        start = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record.seconds = time.perf_counter() - start
+            if self.trace_alloc:
+                current, peak = tracemalloc.get_traced_memory()
+                record.allocated = current - before
+                record.peak = peak - before
+                if started:
+                    tracemalloc.stop()
+            for o in self.observers:
+                o.on_phase_end(record)
+
+    def stmt_hook(self):
+        # Fonction à appeler pour chaque instruction exécutée, ou None si
+        # aucun observateur ne s'y intéresse (l'interprète ne paie alors rien)
+        hooks = [o.on_stmt for o in self.observers
+                 if type(o).on_stmt is not Observer.on_stmt]
+        if not hooks:
+            return None
+        if len(hooks) == 1:
+            return hooks[0]
+
+        def on_stmt(node):
+            for hook in hooks:
+                hook(node)
+        return on_stmt
+
+
+def count_nodes(ast):
+    count = 0
+    stack = list(ast)
+    while stack:
+        node = stack.pop()
+        count += 1
+        stack.extend(c for c in node.children() if not isinstance(c, str))
+    return count
+
+
+class Profiler(Observer):
+    def __init__(self):
+        self.records = []
+        self.hits = {}      # noeud -> nombre d'exécutions
+
+    def on_phase_end(self, record):
+        self.records.append(record)
+
+    def on_stmt(self, node):
+        self.hits[node] = self.hits.get(node, 0) + 1
+
+    def hottest(self, top=10):
+        return sorted(self.hits.items(), key=lambda item: item[1], reverse=True)[:top]
+
+    def report(self, top=10):
+        lines = [f"{'phase':<12} {'temps (ms)':>11} {'alloué (Ko)':>12} {'pic (Ko)':>10}  compteurs"]
+        for r in self.records:
+            alloc = f"{r.allocated / 1024:.1f}" if r.allocated is not None else "-"
+            peak = f"{r.peak / 1024:.1f}" if r.peak is not None else "-"
+            counts = ", ".join(f"{k}={v}" for k, v in r.counts.items())
+            lines.append(f"{r.name:<12} {r.seconds * 1000:>11.3f} {alloc:>12} {peak:>10}  {counts}")
+        if self.hits:
+            lines.append("")
+            lines.append(f"Instructions les plus exécutées ({sum(self.hits.values())} au total) :")
+            for node, n in self.hottest(top):
+                where = f"ligne {node.line}" if getattr(node, 'line', None) else "ligne ?"
+                text = repr(node)
+                if len(text) > 60:
+                    text = text[:57] + "..."
+                lines.append(f"{n:>10}  {where:<10} {text}")
+        return "\n".join(lines)
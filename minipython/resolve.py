@@ -0,0 +1,37 @@
+# ------------------------------
+# Résolution des variables en emplacements (slots)
+# ------------------------------
+# Chaque variable reçoit un index fixe : les variables déclarées d'abord,
+# dans l'ordre de la table des symboles, puis les éventuelles variables non
+# déclarées dans l'ordre d'apparition. La passe renseigne l'attribut slot
+# des noeuds Var et Assign ; l'exécution peut alors ranger les valeurs dans
+# une simple liste au lieu d'un dictionnaire indexé par nom.
+from minipython.nodes import Assign, Var
+
+
+def resolve_slots(ast, symtab=()):
+    # Renvoie la liste des noms : names[slot] est le nom de la variable
+    slots = {}
+    names = []
+
+    def slot_of(name):
+        if name not in slots:
+            slots[name] = len(names)
+            names.append(name)
+        return slots[name]
+
+    for name in symtab:
+        slot_of(name)
+
+    stack = list(ast)
+    while stack:
+        node = stack.pop()
+        if isinstance(node, (Var, Assign)):
+            node.slot = slot_of(node.name)
+        stack.extend(c for c in node.children() if not isinstance(c, str))
+    return names
+
+
+def slots_view(names, values):
+    # Vue dictionnaire des variables, pour l'affichage et le débogage
+    return dict(zip(names, values))
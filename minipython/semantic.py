@@ -0,0 +1,246 @@
+# ------------------------------
+# Analyse sémantique en une passe linéaire
+# ------------------------------
+# Analyzer parcourt tout l'AST une seule fois, dans l'ordre du texte, avec
+# une pile explicite (pas de récursion : les blocs et expressions très
+# imbriqués passent). Pour chaque type de noeud, enter_<Classe> est appelé
+# avant les enfants et leave_<Classe> après.
+#  - Decl : chaque nom reçoit une entrée Symbol (type, slot, ligne) ;
+#  - Var / Assign : le nom est résolu dans la table, le noeud reçoit le
+#    slot de son symbole ; une utilisation avant la déclaration est une
+#    erreur ;
+#  - expressions : attribut vtype, le type de la valeur à l'exécution
+#    ("int", "float" ou "bool", None s'il peut varier). / est une division
+#    réelle (float) ; && et || valent l'un de leurs opérandes ; une
+#    variable a le type commun de toutes les valeurs qu'elle reçoit (0 à
+#    l'entrée, puis chaque affectation du programme).
+# Toutes les erreurs sont collectées (SemanticError, avec la ligne) au lieu
+# de s'arrêter à la première. Les slots suivent minipython.resolve : les
+# variables déclarées d'abord, puis les noms jamais déclarés dans l'ordre
+# d'apparition.
+from minipython.nodes import (AND, DIV, EQ, GTE, GT, LT, LTE, NEQ, NOT, OR, Assign, BinOp, Decl,
+                              Var)
+
+INT = 'int'
+FLOAT = 'float'
+BOOL = 'bool'
+
+BOOL_OPS = frozenset((LT, GT, LTE, GTE, EQ, NEQ, NOT))
+
+
+def join(a, b):
+    # Type commun de deux valeurs possibles (None : l'un ou l'autre)
+    return a if a == b else None
+
+
+def arithmetic(*types):
+    # + - * et - unaire : un booléen se comporte comme un entier
+    if None in types:
+        return None
+    return FLOAT if FLOAT in types else INT
+
+
+def expr_type(node):
+    op = node.op
+    if op in BOOL_OPS:
+        return BOOL
+    if not isinstance(node, BinOp):
+        return arithmetic(node.operand.vtype)
+    if op == DIV:
+        return FLOAT
+    if op in (AND, OR):
+        return join(node.left.vtype, node.right.vtype)
+    return arithmetic(node.left.vtype, node.right.vtype)
+
+
+class SemanticError(Exception):
+    def __init__(self, message, line=None):
+        super().__init__(message)
+        self.line = line
+        self.column = None
+
+
+class SemanticErrors(Exception):
+    # Toutes les erreurs d'un programme, levées ensemble
+    def __init__(self, errors):
+        super().__init__("\n".join(
+            f"ligne {e.line} : {e}" if e.line is not None else str(e) for e in errors))
+        self.errors = errors
+
+
+class Symbol:
+    __slots__ = ('name', 'type', 'slot', 'line')
+
+    def __init__(self, name, type, slot, line=None):
+        self.name = name
+        self.type = type
+        self.slot = slot
+        self.line = line
+
+    def __repr__(self):
+        return f"Symbol({self.name!r}, {self.type!r}, slot={self.slot}, ligne={self.line})"
+
+
+class Analyzer:
+    def __init__(self):
+        self.symbols = {}           # nom -> Symbol, dans l'ordre des déclarations
+        self.errors = []
+        self.declarations = []      # (nom, ligne) de chaque déclaration
+        self.unresolved = []        # (nom, ligne) des utilisations non encore déclarées
+        self.names = []             # names[slot] : nom de la variable
+        self.line = None            # ligne de l'instruction en cours
+        self._pending = []          # noeuds à résoudre en fin de passe
+        self._assigns = []          # Assign et Var, pour les types
+        self._vars = []
+        self._parents = {}          # id(expression) -> [noeuds qui la contiennent]
+        self._handlers = {}
+
+    @property
+    def symbol_table(self):
+        # Forme historique : nom -> type
+        return {name: s.type for name, s in self.symbols.items()}
+
+    def error(self, message, line=None):
+        self.errors.append(SemanticError(message, line if line is not None else self.line))
+
+    def handlers(self, cls):
+        handlers = self._handlers.get(cls)
+        if handlers is None:
+            name = cls.__name__
+            handlers = self._handlers[cls] = (getattr(self, 'enter_' + name, None),
+                                              getattr(self, 'leave_' + name, None))
+        return handlers
+
+    def analyze(self, ast):
+        stack = [(node, False) for node in reversed(ast)]
+        while stack:
+            node, leaving = stack.pop()
+            enter, leave = self.handlers(type(node))
+            if leaving:
+                leave(node)
+                continue
+            line = getattr(node, 'line', None)
+            if line is not None and not isinstance(node, Var):
+                self.line = line
+            if enter is not None:
+                enter(node)
+            if leave is not None:
+                stack.append((node, True))
+            stack.extend((c, False) for c in reversed(node.children()) if not isinstance(c, str))
+        self._finish()
+        return self
+
+    def _finish(self):
+        # Noms utilisés avant leur déclaration (ou jamais déclarés)
+        slots = {}
+        for node in self._pending:
+            symbol = self.symbols.get(node.name)
+            if symbol is not None:
+                node.slot = symbol.slot
+            else:
+                if node.name not in slots:
+                    slots[node.name] = len(self.names)
+                    self.names.append(node.name)
+                node.slot = slots[node.name]
+        self._pending = []
+        self._infer_types()
+        self._assigns, self._vars, self._parents = [], [], {}
+
+    def _infer_types(self):
+        # Une affectation placée plus loin (dans une boucle) peut changer le
+        # type d'une lecture déjà vue. Liste de travail : quand le type d'une
+        # variable change, ses lectures sont mises à jour et le changement
+        # remonte (parents) vers les expressions et les affectations qui les
+        # contiennent ; une affectation qui change le type de sa cible remet
+        # cette variable dans la liste. Un type ne fait que passer à None :
+        # chaque noeud change un nombre borné de fois, la passe reste linéaire.
+        types = {name: s.type for name, s in self.symbols.items()}
+        for node in self._assigns:
+            if node.name in types:
+                types[node.name] = join(types[node.name], node.value.vtype)
+        readers = {}
+        for node in self._vars:
+            readers.setdefault(node.name, []).append(node)
+        parents = self._parents
+        work = list(readers)
+        while work:
+            name = work.pop()
+            vtype = types.get(name)
+            for var in readers.get(name, ()):
+                if var.vtype == vtype:
+                    continue
+                var.vtype = vtype
+                changed = [var]
+                while changed:
+                    for parent in parents.get(id(changed.pop()), ()):
+                        if isinstance(parent, Assign):
+                            target = parent.name
+                            if target in types:
+                                new = join(types[target], parent.value.vtype)
+                                if new != types[target]:
+                                    types[target] = new
+                                    work.append(target)
+                        else:
+                            new = expr_type(parent)
+                            if new != parent.vtype:
+                                parent.vtype = new
+                                changed.append(parent)
+
+    def resolve(self, node, line):
+        symbol = self.symbols.get(node.name)
+        if symbol is None:
+            self.error(f"Variable {node.name} non déclarée", line)
+            self.unresolved.append((node.name, line if line is not None else self.line))
+            self._pending.append(node)
+            return None
+        node.slot = symbol.slot
+        return symbol
+
+    # --------------------------
+    # Instructions
+    # --------------------------
+    def enter_Decl(self, node):
+        for name in node.names:
+            self.declarations.append((name, self.line))
+            if name in self.symbols:
+                self.error(f"Variable {name} déjà déclarée")
+                continue
+            self.symbols[name] = Symbol(name, node.type, len(self.names), self.line)
+            self.names.append(name)
+
+    def enter_Assign(self, node):
+        self.resolve(node, self.line)
+        self._assigns.append(node)
+        self._parents.setdefault(id(node.value), []).append(node)
+
+    # --------------------------
+    # Expressions
+    # --------------------------
+    def enter_Num(self, node):
+        node.vtype = INT
+
+    def enter_Var(self, node):
+        symbol = self.resolve(node, node.line)
+        node.vtype = symbol.type if symbol is not None else None
+        self._vars.append(node)
+
+    def leave_BinOp(self, node):
+        node.vtype = expr_type(node)
+        self._parents.setdefault(id(node.left), []).append(node)
+        self._parents.setdefault(id(node.right), []).append(node)
+
+    def leave_UnaryOp(self, node):
+        node.vtype = expr_type(node)
+        self._parents.setdefault(id(node.operand), []).append(node)
+
+
+def analyze(ast):
+    return Analyzer().analyze(ast)
+
+
+def check(ast):
+    # (AST annoté, table nom -> type) ; SemanticErrors si le programme a des erreurs
+    analysis = analyze(ast)
+    if analysis.errors:
+        raise SemanticErrors(analysis.errors)
+    return ast, analysis.symbol_table
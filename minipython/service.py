@@ -0,0 +1,347 @@
+# ------------------------------
+# Service local de compilation et d'exécution
+# ------------------------------
+# Usage :
+#     python -m minipython.service --port 8765 -j 4
+#     python -m minipython.service --unix /tmp/minipython.sock
+#
+# Serveur HTTP/1.1 minimal (asyncio, connexions persistantes), corps JSON :
+#   POST /compile {"source": ..., "frontend": "lark" | "rd"}
+#                 -> {"success", "diagnostics", "tac"}
+#   POST /check   {"source": ..., "frontend": ...}
+#                 -> {"success", "diagnostics", "symbols"}
+#   POST /run     {"source": ..., "frontend": ..., "budget": N, "timeout": s}
+#                 -> {"success", "diagnostics", "output", "variables", "steps"}
+#   GET  /health  -> {"workers", "pending"}
+# "lark" est le front-end de minipython_complete.py (Lark LALR), "rd" celui
+# d'analyse_lark.py (lexer et parser descendant).
+#
+# Le travail CPU part dans un pool de processus préchauffé : chaque worker
+# construit les parsers et compile un petit programme à son démarrage.
+# Les requêtes en attente pendant qu'aucun worker n'est libre sont
+# regroupées (jusqu'à --batch-size) en un seul appel au pool. Chaque requête
+# a un délai (--timeout, ou "timeout" dans la requête, borné par
+# --max-timeout) ; une exécution s'arrête aussi après "budget" pas
+# (minipython.governor, borné par --max-budget), ce qui borne les while
+# sans fin.
+import argparse
+import asyncio
+import io
+import json
+import math
+import os
+import signal
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from minipython.batch import diagnostics
+
+FRONTENDS = ("lark", "rd")
+OPERATIONS = ("compile", "check", "run")
+
+DEFAULT_BUDGET = 1_000_000
+MAX_BUDGET = 100_000_000
+DEFAULT_TIMEOUT = 5.0
+MAX_BODY = 1 << 20
+
+WARMUP = "int x; x = 1; while (x < 3) { x = x + 1; } print(x);"
+
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+           413: "Payload Too Large", 504: "Gateway Timeout"}
+
+
+# ------------------------------
+# Côté worker
+# ------------------------------
+class DeadlineExceeded(Exception):
+    pass
+
+
+def parse_source(source, frontend):
+    if frontend == "lark":
+        from minipython.lark_frontend import parse
+        return parse(source)
+    if frontend == "rd":
+        from minipython.lexer import iter_tokens
+        from minipython.parser import parse_program
+        return parse_program(list(iter_tokens(io.StringIO(source))))
+    raise ValueError(f"Front-end inconnu : {frontend}")
+
+
+def run_program(ast, symtab, budget, deadline):
+    # (sorties de print, variables, pas) ; limites de minipython.governor
+    from minipython.governor import Governor, run
+
+    env = {name: 0 for name in symtab}
+    output = []
+    governor = Governor(max_steps=budget, max_seconds=max(0.0, deadline - time.monotonic()))
+    steps = run(ast, env, governor, on_print=output.append)
+    return output, env, steps
+
+
+def handle(request):
+    # Traite une requête {"op", "source", "frontend", "budget", "deadline"}
+    # (le front-end "rd" n'importe pas Lark)
+    from minipython.semantic import check
+
+    result = {"success": False, "diagnostics": []}
+    op = request["op"]
+    phase = "parse"
+    try:
+        if time.monotonic() > request["deadline"]:
+            raise DeadlineExceeded("Délai dépassé avant le traitement")
+        ast = parse_source(request["source"], request.get("frontend", "lark"))
+        phase = "semantic"
+        ast, symtab = check(ast)
+        if op == "check":
+            result["symbols"] = symtab
+        elif op == "compile":
+            # Même TAC (sauts de while et if) quel que soit le front-end
+            from minipython.tac import TACGenerator
+            phase = "tac"
+            result["tac"] = TACGenerator().generate(ast)
+        elif op == "run":
+            phase = "run"
+            output, env, steps = run_program(ast, symtab, request["budget"],
+                                             request["deadline"])
+            result.update(output=output, variables=env, steps=steps)
+        result["success"] = True
+    except Exception as e:
+        result["diagnostics"].extend(diagnostics(phase, e))
+    return result
+
+
+def handle_batch(requests):
+    return [handle(r) for r in requests]
+
+
+def init_worker():
+    # Parsers construits et chemins de code chargés avant la première requête
+    from minipython.lark_frontend import get_ast_parser
+    get_ast_parser()
+    for frontend in FRONTENDS:
+        for op in OPERATIONS:
+            handle({"op": op, "source": WARMUP, "frontend": frontend,
+                    "budget": DEFAULT_BUDGET, "deadline": time.monotonic() + 60})
+
+
+def worker_ready():
+    return os.getpid()
+
+
+# ------------------------------
+# Côté serveur
+# ------------------------------
+class Service:
+    def __init__(self, workers=os.cpu_count(), batch_size=16, timeout=DEFAULT_TIMEOUT,
+                 max_timeout=60.0, budget=DEFAULT_BUDGET, max_budget=MAX_BUDGET):
+        self.workers = workers
+        self.batch_size = batch_size
+        self.timeout = timeout
+        self.max_timeout = max_timeout
+        self.budget = budget
+        self.max_budget = max_budget
+        self.pool = None
+        self.queue = None
+        self.pending = 0
+        self._dispatcher = None
+        self._servers = []
+
+    async def start(self, host="127.0.0.1", port=8765, unix=None):
+        loop = asyncio.get_running_loop()
+        self.pool = ProcessPoolExecutor(max_workers=self.workers, initializer=init_worker)
+        # Préchauffage : tous les workers démarrés avant d'accepter des requêtes
+        await asyncio.gather(*(loop.run_in_executor(self.pool, worker_ready)
+                               for _ in range(self.workers)))
+        self.queue = asyncio.Queue()
+        self._slots = asyncio.Semaphore(self.workers)
+        self._dispatcher = asyncio.ensure_future(self._dispatch())
+        if unix:
+            server = await asyncio.start_unix_server(self._connection, path=unix)
+        else:
+            server = await asyncio.start_server(self._connection, host, port)
+        self._servers.append(server)
+        return server
+
+    async def close(self):
+        for server in self._servers:
+            server.close()
+            await server.wait_closed()
+        if self._dispatcher is not None:
+            self._dispatcher.cancel()
+        if self.pool is not None:
+            self.pool.shutdown(cancel_futures=True)
+
+    # --------------------------
+    # Regroupement des requêtes
+    # --------------------------
+    async def _dispatch(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.queue.get()]
+            # Pendant l'attente d'un worker libre, d'autres requêtes arrivent :
+            # elles partent dans le même appel au pool
+            await self._slots.acquire()
+            while len(batch) < self.batch_size and not self.queue.empty():
+                batch.append(self.queue.get_nowait())
+            batch = [(r, f) for r, f in batch if not f.done()]
+            if not batch:
+                self._slots.release()
+                continue
+            work = loop.run_in_executor(self.pool, handle_batch, [r for r, _ in batch])
+            work.add_done_callback(lambda done, batch=batch: self._finish(done, batch))
+
+    def _finish(self, done, batch):
+        self._slots.release()
+        error = done.exception()
+        for k, (_, future) in enumerate(batch):
+            if future.done():
+                continue        # délai déjà expiré côté client
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(done.result()[k])
+
+    def limits(self, payload):
+        # (délai, budget) d'une requête, bornés par max_timeout et max_budget ;
+        # ValueError si le délai n'est pas un nombre fini positif ou si le
+        # budget n'est pas un entier positif (2.0 accepté, 1.5 refusé)
+        timeout = payload.get("timeout", self.timeout)
+        budget = payload.get("budget", self.budget)
+        if type(timeout) not in (int, float) or not 0 < timeout < math.inf:
+            raise ValueError("champ 'timeout' : nombre positif fini attendu")
+        if type(budget) is float and budget.is_integer():
+            budget = int(budget)
+        if type(budget) is not int or budget <= 0:
+            raise ValueError("champ 'budget' : entier positif attendu")
+        return min(timeout, self.max_timeout), min(budget, self.max_budget)
+
+    async def submit(self, op, payload):
+        timeout, budget = self.limits(payload)
+        request = {"op": op, "source": payload["source"],
+                   "frontend": payload.get("frontend", "lark"),
+                   "budget": budget, "deadline": time.monotonic() + timeout}
+        future = asyncio.get_running_loop().create_future()
+        self.pending += 1
+        try:
+            await self.queue.put((request, future))
+            return await asyncio.wait_for(future, timeout)
+        finally:
+            self.pending -= 1
+
+    # --------------------------
+    # HTTP
+    # --------------------------
+    async def route(self, method, path, body):
+        # (statut, réponse JSON)
+        op = path.strip("/")
+        if path == "/health":
+            return 200, {"workers": self.workers, "pending": self.pending}
+        if op not in OPERATIONS:
+            return 404, {"error": f"Chemin inconnu : {path}"}
+        if method != "POST":
+            return 405, {"error": "POST attendu"}
+        try:
+            payload = json.loads(body)
+            if not isinstance(payload.get("source"), str):
+                raise ValueError("champ 'source' manquant")
+            if payload.get("frontend", "lark") not in FRONTENDS:
+                raise ValueError(f"front-end inconnu : {payload['frontend']}")
+            self.limits(payload)
+        except (ValueError, AttributeError) as e:
+            return 400, {"error": f"Requête invalide : {e}"}
+        try:
+            return 200, await self.submit(op, payload)
+        except asyncio.TimeoutError:
+            return 504, {"success": False,
+                         "diagnostics": [{"phase": op, "message": "Délai dépassé"}]}
+
+    async def _connection(self, reader, writer):
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    method, path, version = line.decode("latin-1").split()
+                except ValueError:
+                    await self._respond(writer, 400, {"error": "Ligne de requête invalide"})
+                    break
+                headers = {}
+                while True:
+                    header = await reader.readline()
+                    if header in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = header.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                length = headers.get("content-length") or "0"
+                if not (length.isascii() and length.isdigit()):
+                    await self._respond(writer, 400, {"error": "Content-Length invalide"})
+                    break
+                # Longueur bornée avant int() : pas de conversion d'un nombre géant
+                length = length.lstrip("0")
+                if len(length) > len(str(MAX_BODY)) or int(length or 0) > MAX_BODY:
+                    await self._respond(writer, 413, {"error": "Corps trop volumineux"})
+                    break
+                length = int(length or 0)
+                body = await reader.readexactly(length)
+                status, payload = await self.route(method, path, body)
+                await self._respond(writer, status, payload)
+                if version == "HTTP/1.0" or headers.get("connection", "").lower() == "close":
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _respond(self, writer, status, payload):
+        data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        writer.write(f"HTTP/1.1 {status} {REASONS[status]}\r\n"
+                     f"Content-Type: application/json\r\n"
+                     f"Content-Length: {len(data)}\r\n\r\n".encode("latin-1") + data)
+        await writer.drain()
+
+
+async def serve(args):
+    service = Service(workers=args.jobs, batch_size=args.batch_size, timeout=args.timeout,
+                      max_timeout=args.max_timeout, budget=args.budget,
+                      max_budget=args.max_budget)
+    server = await service.start(args.host, args.port, args.unix)
+    where = args.unix or "http://%s:%d" % server.sockets[0].getsockname()[:2]
+    # SIGTERM / SIGINT : arrêt propre, les workers du pool se terminent aussi
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(sig, stop.set)
+    print(f"Service MiniPython prêt : {where} ({args.jobs} processus)", flush=True)
+    try:
+        await stop.wait()
+    finally:
+        await service.close()
+
+
+def main(argv=None):
+    arg_parser = argparse.ArgumentParser(description="Service MiniPython (compile, check, run)")
+    arg_parser.add_argument("--host", default="127.0.0.1")
+    arg_parser.add_argument("--port", type=int, default=8765, help="0 : port libre quelconque")
+    arg_parser.add_argument("--unix", help="socket Unix au lieu de TCP")
+    arg_parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count(),
+                            help="nombre de processus (défaut : nombre de coeurs)")
+    arg_parser.add_argument("--batch-size", type=int, default=16,
+                            help="requêtes au plus par appel au pool")
+    arg_parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT,
+                            help="délai par défaut d'une requête (s)")
+    arg_parser.add_argument("--max-timeout", type=float, default=60.0,
+                            help="délai maximal accepté dans une requête (s)")
+    arg_parser.add_argument("--budget", type=int, default=DEFAULT_BUDGET,
+                            help="pas d'exécution par défaut d'une requête run")
+    arg_parser.add_argument("--max-budget", type=int, default=MAX_BUDGET,
+                            help="pas d'exécution maximaux acceptés dans une requête")
+    args = arg_parser.parse_args(argv)
+    asyncio.run(serve(args))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
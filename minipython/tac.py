@@ -0,0 +1,120 @@
+# ------------------------------
+# Génération du code à trois adresses (TAC)
+# ------------------------------
+# TAC textuel d'analyse_lark.py, avec étiquettes et sauts pour while et if :
+#     LOAD %t1, x / ADD %t2, %t1, 1 / STORE x, %t2 / JZ %t3, L2 / JMP L1 / LABEL L2
+# Il est assemblé en bytecode par minipython.bytecode et optimisé par
+# minipython.tac_opt.
+from minipython.nodes import (AND, OR, TAC_NAMES, Assign, BinOp, Decl, If, Num, Print, UnaryOp,
+                              Var, While)
+
+# Un identifiant ne commence jamais par "%" : un temporaire ne peut pas
+# partager son nom (ni son registre) avec une variable comme "int t2;"
+TEMP_PREFIX = "%"
+
+
+def is_temporary(name):
+    return name.startswith(TEMP_PREFIX)
+
+
+class TACGenerator:
+    def __init__(self):
+        self.code=[]
+        self.temp_id=0
+        self.label_id=0
+    
+    def new_temp(self):
+        self.temp_id+=1
+        return f"{TEMP_PREFIX}t{self.temp_id}"
+    
+    def new_label(self):
+        self.label_id+=1
+        return f"L{self.label_id}"
+    
+    def emit(self, line):
+        self.code.append(line)
+
+    def gen_expr(self, expr):
+        if isinstance(expr,Num):
+            return str(expr.value)
+        if isinstance(expr,Var):
+            t=self.new_temp()
+            self.emit(f"LOAD {t}, {expr.name}")
+            return t
+        if isinstance(expr,UnaryOp):
+            operand=self.gen_expr(expr.operand)
+            t=self.new_temp()
+            self.emit(f"{TAC_NAMES[expr.op]} {t}, {operand}")
+            return t
+        if isinstance(expr,BinOp) and expr.op in (AND,OR):
+            return self.gen_short_circuit(expr)
+        if isinstance(expr,BinOp):
+            left=self.gen_expr(expr.left)
+            right=self.gen_expr(expr.right)
+            t=self.new_temp()
+            self.emit(f"{TAC_NAMES[expr.op]} {t}, {left}, {right}")
+            return t
+        return "0"
+
+    def gen_short_circuit(self, expr):
+        # && et || : l'opérande droit n'est calculé que si le gauche ne
+        # décide pas du résultat, qui vaut l'un des deux opérandes
+        #     a && b : LOAD t, a / JZ t, Lfin / LOAD t, b / LABEL Lfin
+        #     a || b : LOAD t, a / JZ t, Ldroit / JMP Lfin / LABEL Ldroit /
+        #              LOAD t, b / LABEL Lfin
+        t=self.new_temp()
+        L_end=self.new_label()
+        self.emit(f"LOAD {t}, {self.gen_expr(expr.left)}")
+        if expr.op==AND:
+            self.emit(f"JZ {t}, {L_end}")
+        else:
+            L_right=self.new_label()
+            self.emit(f"JZ {t}, {L_right}")
+            self.emit(f"JMP {L_end}")
+            self.emit(f"LABEL {L_right}")
+        self.emit(f"LOAD {t}, {self.gen_expr(expr.right)}")
+        self.emit(f"LABEL {L_end}")
+        return t
+
+    def gen_block(self, block):
+        for s in block.stmts:
+            self.gen_stmt(s)
+
+    def gen_stmt(self, stmt):
+        if isinstance(stmt,Decl):
+            for v in stmt.names:
+                self.emit(f"DECLARE {stmt.type} {v}")
+
+        elif isinstance(stmt,Assign):
+            r=self.gen_expr(stmt.value)
+            self.emit(f"STORE {stmt.name}, {r}")
+
+        elif isinstance(stmt,Print):
+            r=self.gen_expr(stmt.value)
+            self.emit(f"PRINT {r}")
+
+        elif isinstance(stmt,While):
+            L1=self.new_label()
+            L2=self.new_label()
+            self.emit(f"LABEL {L1}")
+            rc=self.gen_expr(stmt.cond)
+            self.emit(f"JZ {rc}, {L2}")
+            self.gen_block(stmt.body)
+            self.emit(f"JMP {L1}")
+            self.emit(f"LABEL {L2}")
+
+        elif isinstance(stmt,If):
+            L_else=self.new_label()
+            L_end=self.new_label()
+            rc=self.gen_expr(stmt.cond)
+            self.emit(f"JZ {rc}, {L_else}")
+            self.gen_block(stmt.then)
+            self.emit(f"JMP {L_end}")
+            self.emit(f"LABEL {L_else}")
+            self.gen_block(stmt.orelse)
+            self.emit(f"LABEL {L_end}")
+
+    def generate(self, ast):
+        for s in ast:
+            self.gen_stmt(s)
+        return self.code
@@ -0,0 +1,826 @@
+# ------------------------------
+# Passes d'optimisation sur le TAC
+# ------------------------------
+# Chaque passe prend une liste d'instructions [op, args] et renvoie une
+# nouvelle liste. optimize() enchaîne les passes et rapporte le nombre
+# d'instructions avant/après chacune :
+#
+#     code, report = optimize(TACGenerator().generate(ast))
+#     print_report(report)
+#
+# Une passe supplémentaire s'ajoute simplement à la liste DEFAULT_PASSES
+# (ou à la liste passée à optimize()).
+#
+# Les passes locales travaillent bloc par bloc ; les passes globales
+# s'appuient sur le graphe de flot de contrôle (build_cfg) et sur deux
+# analyses de flot de données : les variables vivantes (liveness) et les
+# définitions qui atteignent chaque instruction (reaching_definitions).
+# Les passes de boucles (licm, strength_reduction) travaillent sur les
+# boucles naturelles de ce graphe (natural_loops) et placent leur code dans
+# un préentête, juste avant l'étiquette de l'entête.
+import itertools
+
+from minipython.bytecode import is_literal, parse_tac_line
+from minipython.tac import TEMP_PREFIX, is_temporary
+
+# Opérations pures : "OP dest, a[, b]"
+BINARY_OPS = ('ADD', 'SUB', 'MUL', 'DIV', 'LT', 'GT', 'LTE', 'GTE',
+              'EQ', 'NEQ', 'AND', 'OR')
+UNARY_OPS = ('NEG', 'NOT')
+PURE_OPS = ('LOAD',) + BINARY_OPS + UNARY_OPS
+COMMUTATIVE_OPS = ('ADD', 'MUL', 'EQ', 'NEQ', 'AND', 'OR')
+# Opérations dont le résultat est un booléen : repliées en 1/0, ce qui n'est
+# correct que si le résultat sert uniquement de condition de saut
+BOOLEAN_OPS = ('LT', 'GT', 'LTE', 'GTE', 'EQ', 'NEQ', 'AND', 'OR', 'NOT')
+
+FOLD = {
+    'ADD': lambda a, b: a + b,
+    'SUB': lambda a, b: a - b,
+    'MUL': lambda a, b: a * b,
+    'LT': lambda a, b: a < b,
+    'GT': lambda a, b: a > b,
+    'LTE': lambda a, b: a <= b,
+    'GTE': lambda a, b: a >= b,
+    'EQ': lambda a, b: a == b,
+    'NEQ': lambda a, b: a != b,
+    'AND': lambda a, b: bool(a and b),
+    'OR': lambda a, b: bool(a or b),
+    'NEG': lambda a: -a,
+    'NOT': lambda a: not a,
+}
+
+
+# ------------------------------
+# Représentation des instructions
+# ------------------------------
+def parse_tac(tac):
+    return [list(parse_tac_line(line)) for line in tac]
+
+
+def format_tac(code):
+    lines = []
+    for op, args in code:
+        if op == 'DECLARE':
+            lines.append(f"DECLARE int {args[0]}")
+        else:
+            lines.append(f"{op} {', '.join(args)}")
+    return lines
+
+
+def defs(ins):
+    op, args = ins
+    if op in PURE_OPS or op == 'STORE':
+        return args[:1]
+    return []
+
+
+def uses(ins):
+    op, args = ins
+    if op in PURE_OPS or op == 'STORE':
+        return args[1:]
+    if op in ('PRINT', 'JZ'):
+        return args[:1]
+    return []
+
+
+def use_positions(ins):
+    # Indices dans args des opérandes lus par l'instruction
+    op, args = ins
+    if op in PURE_OPS or op == 'STORE':
+        return range(1, len(args))
+    if op in ('PRINT', 'JZ'):
+        return range(0, 1)
+    return ()
+
+
+def removable(ins):
+    # Instruction sans effet de bord, supprimable si sa destination est morte.
+    # Une division peut lever ZeroDivisionError : on la garde
+    op, args = ins
+    if op == 'STORE':
+        return True
+    if op not in PURE_OPS:
+        return False
+    return op != 'DIV' or (is_literal(args[2]) and int(args[2]) != 0)
+
+
+def basic_blocks(code):
+    # Découpe en blocs de base : un LABEL ouvre un bloc, JZ/JMP le ferment
+    blocks = []
+    current = []
+    for ins in code:
+        if ins[0] == 'LABEL' and current:
+            blocks.append(current)
+            current = []
+        current.append(ins)
+        if ins[0] in ('JZ', 'JMP'):
+            blocks.append(current)
+            current = []
+    if current:
+        blocks.append(current)
+    return blocks
+
+
+def temporaries(code):
+    # Temporaires de TACGenerator (et registres ajoutés par les passes),
+    # reconnus à leur préfixe : une variable "t3" n'en est jamais un
+    return {d for ins in code for d in defs(ins) if is_temporary(d)}
+
+
+def condition_temporaries(code):
+    # Temporaires lus uniquement comme condition de JZ : leurs opérations
+    # booléennes peuvent être repliées en 1/0
+    condition_only = set(temporaries(code))
+    for op, args in code:
+        for i, a in enumerate(uses([op, args])):
+            if not (op == 'JZ' and i == 0):
+                condition_only.discard(a)
+    return condition_only
+
+
+# ------------------------------
+# Graphe de flot de contrôle
+# ------------------------------
+class Block:
+    __slots__ = ('index', 'code', 'succ', 'pred')
+
+    def __init__(self, index, code):
+        self.index = index
+        self.code = code        # instructions [op, args] du bloc
+        self.succ = []          # indices des blocs successeurs
+        self.pred = []          # indices des blocs prédécesseurs
+
+    def __repr__(self):
+        return f"Block({self.index}, {len(self.code)} instr., succ={self.succ})"
+
+
+def build_cfg(code):
+    # Blocs de base reliés par les sauts (JMP, les deux sorties de JZ) et
+    # par le passage à l'instruction suivante. Le bloc 0 est l'entrée ; un
+    # bloc sans successeur termine le programme.
+    blocks = [Block(i, b) for i, b in enumerate(basic_blocks(code))]
+    labels = {ins[1][0]: b.index for b in blocks for ins in b.code if ins[0] == 'LABEL'}
+    for b in blocks:
+        op, args = b.code[-1]
+        targets = []
+        if op != 'JMP' and b.index + 1 < len(blocks):
+            targets.append(b.index + 1)
+        if op in ('JZ', 'JMP'):
+            target = labels[args[-1]]
+            if target not in targets:
+                targets.append(target)
+        b.succ = targets
+        for t in targets:
+            blocks[t].pred.append(b.index)
+    return blocks
+
+
+def flatten(blocks):
+    return [ins for b in blocks for ins in b.code]
+
+
+def reachable(blocks):
+    # Indices des blocs atteignables depuis l'entrée
+    seen = set()
+    stack = [0] if blocks else []
+    while stack:
+        i = stack.pop()
+        if i not in seen:
+            seen.add(i)
+            stack.extend(blocks[i].succ)
+    return seen
+
+
+# ------------------------------
+# Analyses de flot de données
+# ------------------------------
+def block_effects(block):
+    # (noms lus avant d'être écrits dans le bloc, noms écrits par le bloc)
+    gen = set()
+    kill = set()
+    for ins in reversed(block.code):
+        for d in defs(ins):
+            gen.discard(d)
+            kill.add(d)
+        gen.update(a for a in uses(ins) if not is_literal(a))
+    return gen, kill
+
+
+def liveness(blocks, live_exit=()):
+    # Renvoie (live_out, index) : live_out[i] contient les noms lus après la
+    # fin du bloc i avant d'être réécrits, sous forme d'entier (bit
+    # index[nom]). live_exit : noms considérés comme lus à la fin du
+    # programme. Seuls les noms qui franchissent une frontière de bloc ont un
+    # bit : les autres ne sont jamais vivants en sortie de bloc.
+    effects = [block_effects(b) for b in blocks]
+    index = {}
+    for name in live_exit:
+        index.setdefault(name, len(index))
+    for gen, _ in effects:
+        for name in gen:
+            index.setdefault(name, len(index))
+
+    def mask(names):
+        m = 0
+        for name in names:
+            if name in index:
+                m |= 1 << index[name]
+        return m
+
+    gen = [mask(g) for g, _ in effects]
+    kill = [mask(k) for _, k in effects]
+    exit_mask = mask(live_exit)
+    live_in = [0] * len(blocks)
+    live_out = [0] * len(blocks)
+    worklist = list(range(len(blocks)))
+    pending = set(worklist)
+    while worklist:
+        i = worklist.pop()
+        pending.discard(i)
+        b = blocks[i]
+        out = exit_mask if not b.succ else 0
+        for s in b.succ:
+            out |= live_in[s]
+        new_in = gen[i] | (out & ~kill[i])
+        live_out[i] = out
+        if new_in != live_in[i]:
+            live_in[i] = new_in
+            for p in b.pred:
+                if p not in pending:
+                    pending.add(p)
+                    worklist.append(p)
+    return live_out, index
+
+
+def reaching_definitions(blocks):
+    # Renvoie (reach_in, definitions, masks) : definitions[k] = (nom, bloc,
+    # position) de chaque définition, reach_in[i] l'ensemble des k qui
+    # atteignent le début du bloc i et masks[nom] celui des définitions du
+    # nom, sous forme d'entiers (bit k). Les définitions de position None
+    # représentent la valeur d'un nom à l'entrée du programme. Seuls les
+    # noms lus dans un autre bloc que celui qui les écrit sont suivis (les
+    # temporaires de TACGenerator restent locaux à leur bloc).
+    tracked = set()
+    for b in blocks:
+        tracked |= block_effects(b)[0]
+    definitions = []
+    masks = {}
+    gen = []
+    for b in blocks:
+        last = {}
+        for pos, ins in enumerate(b.code):
+            for d in defs(ins):
+                if d in tracked:
+                    last[d] = len(definitions)
+                    masks[d] = masks.get(d, 0) | 1 << len(definitions)
+                    definitions.append((d, b.index, pos))
+        gen.append(last)
+    entry = 0
+    for name in tracked:
+        masks[name] = masks.get(name, 0) | 1 << len(definitions)
+        entry |= 1 << len(definitions)
+        definitions.append((name, None, None))
+    kill = [sum(masks[name] for name in last) for last in gen]
+    gen = [sum(1 << k for k in last.values()) for last in gen]
+
+    reach_in = [0] * len(blocks)
+    reach_out = [None] * len(blocks)
+    worklist = list(range(len(blocks) - 1, -1, -1))
+    pending = set(worklist)
+    while worklist:
+        i = worklist.pop()
+        pending.discard(i)
+        b = blocks[i]
+        current = entry if i == 0 else 0
+        for p in b.pred:
+            if reach_out[p] is not None:
+                current |= reach_out[p]
+        reach_in[i] = current
+        out = (current & ~kill[i]) | gen[i]
+        if out != reach_out[i]:
+            reach_out[i] = out
+            for s in b.succ:
+                if s not in pending:
+                    pending.add(s)
+                    worklist.append(s)
+    return reach_in, definitions, masks
+
+
+def bits(mask):
+    # Indices des bits à 1 d'un ensemble représenté par un entier
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+# ------------------------------
+# Boucles naturelles
+# ------------------------------
+def dominators(blocks):
+    # Renvoie (idom, rank) : idom[i] est le dominateur immédiat du bloc i
+    # (l'entrée est son propre dominateur, None pour un bloc inatteignable)
+    # et rank[i] son rang dans l'ordre postfixe inverse. Algorithme itératif
+    # de Cooper, Harvey et Kennedy.
+    order = []
+    if blocks:
+        seen = {0}
+        stack = [(0, iter(blocks[0].succ))]
+        while stack:
+            node, successors = stack[-1]
+            for s in successors:
+                if s not in seen:
+                    seen.add(s)
+                    stack.append((s, iter(blocks[s].succ)))
+                    break
+            else:
+                stack.pop()
+                order.append(node)
+    order.reverse()
+    rank = {b: i for i, b in enumerate(order)}
+
+    idom = [None] * len(blocks)
+    if blocks:
+        idom[0] = 0
+    changed = True
+    while changed:
+        changed = False
+        for b in order[1:]:
+            new = None
+            for p in blocks[b].pred:
+                if idom[p] is None:
+                    continue
+                if new is None:
+                    new = p
+                    continue
+                x, y = p, new
+                while x != y:
+                    while rank[x] > rank[y]:
+                        x = idom[x]
+                    while rank[y] > rank[x]:
+                        y = idom[y]
+                new = x
+            if idom[b] != new:
+                idom[b] = new
+                changed = True
+    return idom, rank
+
+
+def natural_loops(blocks):
+    # [(entête, ensemble des blocs de la boucle)] : un arc b -> h est un arc
+    # retour quand h domine b ; la boucle regroupe h et les blocs qui
+    # atteignent b sans passer par h. Les arcs retour d'un même entête
+    # forment une seule boucle. Les boucles les plus internes d'abord.
+    idom, rank = dominators(blocks)
+    bodies = {}
+    for b in blocks:
+        if b.index not in rank:
+            continue
+        for h in b.succ:
+            x = b.index
+            while rank[x] > rank[h]:
+                x = idom[x]
+            if x != h:
+                continue
+            body = bodies.setdefault(h, {h})
+            stack = [b.index]
+            while stack:
+                x = stack.pop()
+                if x not in body:
+                    body.add(x)
+                    stack.extend(p for p in blocks[x].pred if p in rank)
+    return sorted(bodies.items(), key=lambda item: len(item[1]))
+
+
+def has_preheader(blocks, header, body):
+    # Vrai si du code placé juste avant l'entête (dans l'ordre du TAC)
+    # s'exécute une fois à chaque entrée dans la boucle : on n'y entre que
+    # par le bloc précédent, qui tombe dans l'entête sans sauter.
+    outside = [p for p in blocks[header].pred if p not in body]
+    if header == 0:
+        return not outside
+    if outside != [header - 1]:
+        return False
+    op, args = blocks[header - 1].code[-1]
+    labels = {ins[1][0] for ins in blocks[header].code if ins[0] == 'LABEL'}
+    return not (op in ('JZ', 'JMP') and args[-1] in labels)
+
+
+def float_names(code):
+    # Noms qui peuvent contenir un flottant : seule DIV en produit (les
+    # comparaisons donnent des booléens, qui se comportent comme des entiers)
+    floating = set()
+    changed = True
+    while changed:
+        changed = False
+        for ins in code:
+            for d in defs(ins):
+                if d not in floating and (ins[0] == 'DIV'
+                                          or any(a in floating for a in uses(ins))):
+                    floating.add(d)
+                    changed = True
+    return floating
+
+
+# ------------------------------
+# Passes
+# ------------------------------
+def constant_folding(code):
+    condition_only = condition_temporaries(code)
+
+    result = []
+    for op, args in code:
+        operands = args[1:]
+        if (op in FOLD and operands and all(is_literal(a) for a in operands)
+                and (op not in BOOLEAN_OPS or args[0] in condition_only)):
+            value = FOLD[op](*(int(a) for a in operands))
+            result.append(['LOAD', [args[0], str(int(value))]])
+        else:
+            result.append([op, list(args)])
+    return result
+
+
+def copy_propagation(code):
+    # "LOAD t, x" : les lectures suivantes de t dans le bloc lisent x
+    # directement, tant que x n'est pas réaffecté
+    result = []
+    for block in basic_blocks(code):
+        copies = {}
+        for op, args in block:
+            args = list(args)
+            for i in use_positions([op, args]):
+                args[i] = copies.get(args[i], args[i])
+            for d in defs([op, args]):
+                copies.pop(d, None)
+                for t in [t for t, src in copies.items() if src == d]:
+                    del copies[t]
+            if op == 'LOAD' and args[0] != args[1]:
+                copies[args[0]] = args[1]
+            result.append([op, args])
+    return result
+
+
+def common_subexpression_elimination(code):
+    result = []
+    for block in basic_blocks(code):
+        available = {}
+        for op, args in block:
+            if op in BINARY_OPS or op in UNARY_OPS:
+                operands = args[1:]
+                if op in COMMUTATIVE_OPS:
+                    operands = sorted(operands)
+                key = (op, *operands)
+                if key in available:
+                    result.append(['LOAD', [args[0], available[key]]])
+                    continue
+            else:
+                key = None
+            for d in defs([op, args]):
+                for k in [k for k, t in available.items() if d in k[1:] or t == d]:
+                    del available[k]
+            if key is not None:
+                available[key] = args[0]
+            result.append([op, list(args)])
+    return result
+
+
+def dead_temp_elimination(code):
+    temps = temporaries(code)
+    while True:
+        used = {a for ins in code for a in uses(ins)}
+        kept = []
+        for op, args in code:
+            if op in PURE_OPS and args[0] in temps and args[0] not in used \
+                    and removable([op, args]):
+                continue
+            kept.append([op, args])
+        if len(kept) == len(code):
+            return kept
+        code = kept
+
+
+def constant_propagation(code):
+    # Un opérande dont toutes les définitions qui l'atteignent copient le
+    # même littéral ("STORE x, 3", "LOAD t, 3") est remplacé par ce littéral,
+    # et une opération dont tous les opérandes deviennent constants est
+    # repliée sur place. L'analyse est répétée tant qu'elle trouve de
+    # nouvelles constantes (valeurs qui reviennent par une boucle).
+    code = [[op, list(args)] for op, args in code]
+    condition_only = condition_temporaries(code)
+    while True:
+        blocks = build_cfg(code)
+        reach_in, definitions, masks = reaching_definitions(blocks)
+
+        def constant(block, pos):
+            if block is None:
+                return None
+            op, args = blocks[block].code[pos]
+            if op in ('LOAD', 'STORE') and is_literal(args[1]):
+                return args[1]
+            return None
+
+        changed = False
+        for b in blocks:
+            local = {}          # nom -> position de sa dernière définition dans le bloc
+            for pos, ins in enumerate(b.code):
+                op, args = ins
+                for i in use_positions(ins):
+                    name = args[i]
+                    if name in local:
+                        value = constant(b.index, local[name])
+                    elif name in masks:
+                        value = None
+                        for k in bits(reach_in[b.index] & masks[name]):
+                            v = constant(*definitions[k][1:])
+                            if v is None or (value is not None and v != value):
+                                value = None
+                                break
+                            value = v
+                    else:
+                        continue
+                    if value is not None:
+                        args[i] = value
+                        changed = True
+                operands = args[1:]
+                if (op in FOLD and operands and all(is_literal(a) for a in operands)
+                        and (op not in BOOLEAN_OPS or args[0] in condition_only)):
+                    ins[0] = 'LOAD'
+                    ins[1] = [args[0], str(int(FOLD[op](*(int(a) for a in operands))))]
+                for d in defs(ins):
+                    local[d] = pos
+        code = flatten(blocks)
+        if not changed:
+            return code
+
+
+def constant_branches(code):
+    # JZ sur une condition constante : jamais pris (supprimé) ou toujours
+    # pris (remplacé par JMP)
+    result = []
+    for op, args in code:
+        if op == 'JZ' and is_literal(args[0]):
+            if int(args[0]):
+                continue
+            op, args = 'JMP', [args[1]]
+        result.append([op, list(args)])
+    return result
+
+
+def unreachable_blocks(code):
+    # Blocs qu'aucun chemin depuis l'entrée du programme n'atteint
+    blocks = build_cfg(code)
+    live = reachable(blocks)
+    return flatten(b for b in blocks if b.index in live)
+
+
+def dead_store_elimination(code, live_exit=None):
+    # Affectations (STORE et temporaires) dont la valeur est réécrite ou
+    # jamais lue avant la fin du programme. Par défaut, les variables
+    # restent vivantes à la sortie : leurs valeurs finales sont conservées.
+    if live_exit is None:
+        live_exit = {ins[1][0] for ins in code if ins[0] in ('STORE', 'DECLARE')}
+    while True:
+        blocks = build_cfg(code)
+        live_out, index = liveness(blocks, live_exit)
+        result = []
+        removed = 0
+        for b in blocks:
+            live = live_out[b.index]
+            local = set()       # noms sans bit (temporaires) lus plus loin dans le bloc
+            kept = []
+            for ins in reversed(b.code):
+                targets = defs(ins)
+                if targets and removable(ins) and not any(
+                        live >> index[d] & 1 if d in index else d in local for d in targets):
+                    removed += 1
+                    continue
+                for d in targets:
+                    if d in index:
+                        live &= ~(1 << index[d])
+                    else:
+                        local.discard(d)
+                for a in uses(ins):
+                    if a in index:
+                        live |= 1 << index[a]
+                    elif not is_literal(a):
+                        local.add(a)
+                kept.append(ins)
+            result.extend(reversed(kept))
+        code = result
+        if not removed:
+            return code
+
+
+def loop_invariant_code_motion(code):
+    # Les calculs d'un temporaire dont les opérandes ne changent pas dans la
+    # boucle sont déplacés dans un préentête, exécuté une fois avant
+    # l'entête. Le temporaire doit n'avoir qu'une définition et n'être lu que
+    # dans la boucle. Un tour par niveau d'imbrication : un calcul sorti
+    # d'une boucle interne peut ensuite sortir de la boucle englobante.
+    code = [[op, list(args)] for op, args in code]
+    while True:
+        blocks = build_cfg(code)
+        definitions = {}
+        used_in = {}
+        for b in blocks:
+            for ins in b.code:
+                for d in defs(ins):
+                    definitions[d] = definitions.get(d, 0) + 1
+                for a in uses(ins):
+                    used_in.setdefault(a, set()).add(b.index)
+
+        hoisted = {}            # entête -> instructions de son préentête
+        moved = set()           # id() des instructions déplacées
+        for header, body in natural_loops(blocks):
+            if not has_preheader(blocks, header, body):
+                continue
+            defined = {d for i in body for ins in blocks[i].code for d in defs(ins)}
+            invariant = set()
+            preheader = []
+            found = True
+            while found:
+                found = False
+                for i in sorted(body):
+                    for ins in blocks[i].code:
+                        op, args = ins
+                        if (id(ins) in moved or op not in PURE_OPS or not removable(ins)
+                                or definitions[args[0]] != 1
+                                or not used_in.get(args[0], set()) <= body):
+                            continue
+                        if all(is_literal(a) or a not in defined or a in invariant
+                               for a in args[1:]):
+                            moved.add(id(ins))
+                            invariant.add(args[0])
+                            preheader.append(ins)
+                            found = True
+            if preheader:
+                hoisted[header] = preheader
+        if not moved:
+            return code
+        code = []
+        for b in blocks:
+            code.extend(hoisted.get(b.index, ()))
+            code.extend(ins for ins in b.code if id(ins) not in moved)
+
+
+def strength_reduction(code):
+    # Variable d'induction i : une seule affectation dans la boucle, de la
+    # forme "ADD t, i, c ; STORE i, t" (ou SUB, c littéral). Chaque
+    # "MUL t, i, k" de la boucle (k littéral ou invariant) lit un nouveau
+    # registre r, initialisé à i * k dans le préentête et augmenté de c * k
+    # juste après l'affectation de i. Les noms qui peuvent être flottants
+    # (DIV) sont exclus : l'addition répétée changerait les arrondis.
+    code = [[op, list(args)] for op, args in code]
+    blocks = build_cfg(code)
+    floating = float_names(code)
+    names = {a for _, args in code for a in args}
+    fresh = (f"{TEMP_PREFIX}r{n}" for n in itertools.count(1)
+             if f"{TEMP_PREFIX}r{n}" not in names)
+    preheaders = {}             # entête -> instructions de son préentête
+    after = {}                  # id() d'un STORE -> instructions à ajouter après
+    for header, body in natural_loops(blocks):
+        if not has_preheader(blocks, header, body):
+            continue
+        counts = {}
+        for i in body:
+            for ins in blocks[i].code:
+                for d in defs(ins):
+                    counts[d] = counts.get(d, 0) + 1
+
+        steps = {}              # variable d'induction -> (pas, STORE)
+        for i in body:
+            computed = {}
+            for ins in blocks[i].code:
+                op, args = ins
+                if op in ('ADD', 'SUB'):
+                    computed[args[0]] = ins
+                elif op == 'STORE' and counts[args[0]] == 1 and args[1] in computed:
+                    var = args[0]
+                    update_op, (_, a, b) = computed[args[1]]
+                    if a == var and is_literal(b):
+                        step = int(b) if update_op == 'ADD' else -int(b)
+                    elif update_op == 'ADD' and b == var and is_literal(a):
+                        step = int(a)
+                    else:
+                        continue
+                    if counts[args[1]] == 1 and var not in floating:
+                        steps[var] = (step, ins)
+
+        reduced = {}            # (i, k) -> registre
+        for i in sorted(body):
+            for ins in blocks[i].code:
+                op, args = ins
+                if op != 'MUL':
+                    continue
+                for var, k in ((args[1], args[2]), (args[2], args[1])):
+                    if (var in steps and k not in floating
+                            and (is_literal(k) or k not in counts)):
+                        break
+                else:
+                    continue
+                if (var, k) not in reduced:
+                    r = reduced[var, k] = next(fresh)
+                    step, store = steps[var]
+                    pre = preheaders.setdefault(header, [])
+                    pre.append(['MUL', [r, var, k]])
+                    if is_literal(k):
+                        increment = str(step * int(k))
+                    elif step == 1:
+                        increment = k
+                    else:
+                        increment = next(fresh)
+                        pre.append(['MUL', [increment, k, str(step)]])
+                    after.setdefault(id(store), []).append(['ADD', [r, r, increment]])
+                ins[0] = 'LOAD'
+                ins[1] = [args[0], reduced[var, k]]
+
+    result = []
+    for b in blocks:
+        result.extend(preheaders.get(b.index, ()))
+        for ins in b.code:
+            result.append(ins)
+            result.extend(after.get(id(ins), ()))
+    return result
+
+
+def jump_threading(code):
+    def target_of(label, seen=()):
+        # Suit les chaînes "LABEL L ; JMP M" jusqu'à la destination finale
+        i = positions[label] + 1
+        while i < len(code) and code[i][0] == 'LABEL':
+            i += 1
+        if i < len(code) and code[i][0] == 'JMP' and code[i][1][0] not in seen:
+            return target_of(code[i][1][0], seen + (label,))
+        return label
+
+    positions = {ins[1][0]: i for i, ins in enumerate(code) if ins[0] == 'LABEL'}
+    threaded = []
+    for op, args in code:
+        if op == 'JMP':
+            args = [target_of(args[0])]
+        elif op == 'JZ':
+            if is_literal(args[0]):
+                if int(args[0]):
+                    continue
+                op, args = 'JMP', [target_of(args[1])]
+            else:
+                args = [args[0], target_of(args[1])]
+        threaded.append([op, list(args)])
+
+    # Sauts vers l'instruction suivante, code mort après un JMP et
+    # étiquettes inutilisées
+    result = []
+    after_jump = False
+    for i, (op, args) in enumerate(threaded):
+        if op == 'LABEL':
+            after_jump = False
+        elif after_jump:
+            continue
+        if op == 'JMP':
+            after_jump = True
+            j = i + 1
+            while j < len(threaded) and threaded[j][0] == 'LABEL':
+                if threaded[j][1][0] == args[0]:
+                    break
+                j += 1
+            if j < len(threaded) and threaded[j] == ['LABEL', args]:
+                continue
+        result.append([op, args])
+    referenced = {ins[1][-1] for ins in result if ins[0] in ('JZ', 'JMP')}
+    return [ins for ins in result if ins[0] != 'LABEL' or ins[1][0] in referenced]
+
+
+DEFAULT_PASSES = [
+    ("copy_propagation", copy_propagation),
+    ("constant_folding", constant_folding),
+    ("copy_propagation", copy_propagation),
+    ("cse", common_subexpression_elimination),
+    ("copy_propagation", copy_propagation),
+    ("constant_propagation", constant_propagation),
+    ("constant_branches", constant_branches),
+    ("unreachable_blocks", unreachable_blocks),
+    ("constant_propagation", constant_propagation),
+    ("dead_store_elimination", dead_store_elimination),
+    ("licm", loop_invariant_code_motion),
+    ("strength_reduction", strength_reduction),
+    ("copy_propagation", copy_propagation),
+    ("dead_store_elimination", dead_store_elimination),
+    ("jump_threading", jump_threading),
+]
+
+
+def optimize(tac, passes=None):
+    # Renvoie (TAC optimisé, rapport [(passe, avant, après), ...])
+    code = parse_tac(tac)
+    report = []
+    for name, run_pass in (DEFAULT_PASSES if passes is None else passes):
+        before = len(code)
+        code = run_pass(code)
+        report.append((name, before, len(code)))
+    return format_tac(code), report
+
+
+def print_report(report):
+    print(f"{'passe':<24} {'avant':>6} {'après':>6} {'supprimées':>11}")
+    for name, before, after in report:
+        print(f"{name:<24} {before:>6} {after:>6} {before - after:>11}")
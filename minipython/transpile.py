@@ -0,0 +1,145 @@
+# ------------------------------
+# Transpilation de l'AST en code source Python
+# ------------------------------
+# L'AST (minipython.nodes) est traduit en une fonction Python compilée une
+# seule fois avec compile() : l'exécution se fait ensuite par la boucle de
+# bytecode de CPython, sans interprète intermédiaire. Les variables
+# MiniPython deviennent des variables locales préfixées par "v_" (aucun
+# conflit possible avec les mots-clés ou les fonctions de Python).
+#
+# line_map[k] donne la ligne MiniPython de la ligne k+1 du code généré ;
+# une erreur à l'exécution est rapportée à la ligne du programme d'origine.
+#
+# compile() a ses propres limites (plus de 20 blocs imbriqués, environ 200
+# parenthèses) : PythonProgram lève alors SyntaxError ou RecursionError, et
+# l'appelant choisit un autre moteur.
+import itertools
+import linecache
+import weakref
+
+from minipython.nodes import (AND, NEG, NOT, OP_SYMBOLS, OR, Assign, BinOp, Block, Decl, If,
+                              Num, Print, UnaryOp, Var, While)
+
+PREFIX = "v_"
+INDENT = "    "
+
+# Opérateurs MiniPython -> opérateurs Python (mêmes sémantiques que OP_FUNCS)
+PY_SYMBOLS = {AND: "and", OR: "or", NEG: "-", NOT: "not "}
+
+_counter = itertools.count(1)
+
+
+class MiniPythonRuntimeError(Exception):
+    def __init__(self, message, line):
+        super().__init__(message)
+        self.line = line
+
+
+def py_expr(expr):
+    if isinstance(expr, Num):
+        return repr(expr.value)
+    if isinstance(expr, Var):
+        return PREFIX + expr.name
+    if isinstance(expr, UnaryOp):
+        return f"({PY_SYMBOLS[expr.op]}{py_expr(expr.operand)})"
+    if isinstance(expr, BinOp):
+        # Toujours parenthésé : pas de comparaisons chaînées à la Python
+        sym = PY_SYMBOLS.get(expr.op, OP_SYMBOLS[expr.op])
+        return f"({py_expr(expr.left)} {sym} {py_expr(expr.right)})"
+    raise ValueError(f"Expression inconnue : {expr!r}")
+
+
+class _Emitter:
+    def __init__(self, trace):
+        self.trace = trace
+        self.lines = []
+        self.line_map = []
+
+    def emit(self, depth, text, line=None):
+        self.lines.append(INDENT * depth + text)
+        self.line_map.append(line)
+
+    def block(self, stmts, depth, line):
+        before = len(self.lines)
+        for s in stmts:
+            self.stmt(s, depth)
+        if len(self.lines) == before:
+            self.emit(depth, "pass", line)
+
+    def stmt(self, stmt, depth):
+        line = stmt.line if not isinstance(stmt, Block) else None
+        if isinstance(stmt, Decl):
+            # Les déclarations sont initialisées en tête de fonction
+            return
+        if isinstance(stmt, Assign):
+            target = PREFIX + stmt.name
+            self.emit(depth, f"{target} = {py_expr(stmt.value)}", line)
+            if self.trace:
+                self.emit(depth, f"print(f'EXEC: {stmt.name}={{{target}}}')", line)
+        elif isinstance(stmt, Print):
+            if self.trace:
+                self.emit(depth, f"print('PRINT:', {py_expr(stmt.value)})", line)
+            else:
+                self.emit(depth, f"print({py_expr(stmt.value)})", line)
+        elif isinstance(stmt, While):
+            self.emit(depth, f"while {py_expr(stmt.cond)}:", line)
+            self.block(stmt.body.stmts, depth + 1, line)
+        elif isinstance(stmt, If):
+            self.emit(depth, f"if {py_expr(stmt.cond)}:", line)
+            self.block(stmt.then.stmts, depth + 1, line)
+            if stmt.orelse.stmts:
+                self.emit(depth, "else:", line)
+                self.block(stmt.orelse.stmts, depth + 1, line)
+        elif isinstance(stmt, Block):
+            for s in stmt.stmts:
+                self.stmt(s, depth)
+        else:
+            raise ValueError(f"Instruction inconnue : {stmt!r}")
+
+
+def transpile(ast, symtab=(), trace=True):
+    # trace=True : affichages de analyse_lark.py ("EXEC: x=1", "PRINT: 1") ;
+    # trace=False : seul print() affiche sa valeur (minipython_complete.py)
+    out = _Emitter(trace)
+    out.emit(0, "def main(initial):")
+    for name in symtab:
+        out.emit(1, f"{PREFIX}{name} = initial")
+    out.block(ast, 1, None)
+    out.emit(1, "return locals()")
+    return "\n".join(out.lines) + "\n", out.line_map
+
+
+class PythonProgram:
+    # Programme transpilé et compilé, exécutable plusieurs fois
+    def __init__(self, ast, symtab=(), trace=True):
+        self.source, self.line_map = transpile(ast, symtab, trace)
+        self.filename = f"<minipython-{next(_counter)}>"
+        code = compile(self.source, self.filename, "exec")
+        # Le code généré apparaît dans les tracebacks Python, tant que le
+        # programme existe (pas d'entrée laissée dans linecache après lui)
+        linecache.cache[self.filename] = (len(self.source), None,
+                                          self.source.splitlines(True), self.filename)
+        weakref.finalize(self, linecache.cache.pop, self.filename, None)
+        namespace = {}
+        exec(code, namespace)
+        self._main = namespace["main"]
+
+    def original_line(self, tb):
+        # Ligne MiniPython de la dernière frame du code généré
+        line = None
+        while tb is not None:
+            if tb.tb_frame.f_code.co_filename == self.filename:
+                line = self.line_map[tb.tb_lineno - 1]
+            tb = tb.tb_next
+        return line
+
+    def run(self, initial=0):
+        # Renvoie les variables finales dans un dictionnaire
+        try:
+            local_vars = self._main(initial)
+        except Exception as e:
+            line = self.original_line(e.__traceback__)
+            where = f"ligne {line}" if line is not None else "ligne inconnue"
+            raise MiniPythonRuntimeError(
+                f"Erreur d'exécution ({where}) : {type(e).__name__}: {e}", line) from e
+        return {k[len(PREFIX):]: v for k, v in local_vars.items() if k.startswith(PREFIX)}
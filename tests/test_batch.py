@@ -0,0 +1,58 @@
+# ------------------------------
+# Compilation par lots (minipython.batch)
+# ------------------------------
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from minipython import check, generate_tac, parse
+from minipython.batch import compile_file, main
+
+LOOP = """
+int x;
+int y;
+x = 0;
+while (x < 3) {
+    y = (x + 2) * 3;
+    if (y > 6) {
+        print(y);
+    }
+    x = x + 1;
+}
+"""
+
+
+def write(tmp_path, name, source):
+    path = tmp_path / name
+    path.write_text(source, encoding="utf-8")
+    return str(path)
+
+
+def test_tac_keeps_control_flow(tmp_path):
+    result = compile_file(write(tmp_path, "loop.minipy", LOOP))
+    assert result["success"], result["diagnostics"]
+    # Même TAC que le front-end descendant, sauts compris
+    assert result["tac"] == generate_tac(check(parse(LOOP))[0])
+    assert any(line.startswith("JZ ") for line in result["tac"])
+    assert not any("BinOp" in line or "Var(" in line for line in result["tac"])
+
+
+def test_diagnostics(tmp_path):
+    result = compile_file(write(tmp_path, "bad.minipy", "int x; y = 1;"))
+    assert not result["success"]
+    assert result["diagnostics"][0]["phase"] == "semantic"
+    assert result["diagnostics"][0]["line"] == 1
+    result = compile_file(write(tmp_path, "syntax.minipy", "int x; x = 1 +;"))
+    assert not result["success"]
+    assert result["diagnostics"][0]["phase"] == "parse"
+
+
+@pytest.mark.parametrize("jobs", ["0", "-2"])
+def test_jobs_below_one_rejected(tmp_path, jobs, capsys):
+    with pytest.raises(SystemExit) as info:
+        main([write(tmp_path, "loop.minipy", LOOP), "-j", jobs])
+    assert info.value.code == 2
+    assert "--jobs" in capsys.readouterr().err
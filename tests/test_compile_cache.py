@@ -0,0 +1,117 @@
+# ------------------------------
+# Cache de compilation (minipython.compile_cache)
+# ------------------------------
+import marshal
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from minipython import check, generate_tac, parse
+from minipython.compile_cache import (FORMAT_VERSION, CompileCache, CompiledProgram, encode,
+                                      files_version, source_key)
+from minipython.governor import run
+
+SOURCE = """int x;
+int y;
+x = 0;
+while (x < 5 && !(x == 7)) {
+    if (x > 1) {
+        y = y + x / 2;
+    }
+    x = x + 1;
+}
+print(-y);
+"""
+
+
+def compile_source(source):
+    ast, symtab = check(parse(source))
+    return CompiledProgram(ast, symtab, generate_tac(ast))
+
+
+def outputs(program, slots=False):
+    out = []
+    env = [0] * len(program.symtab) if slots else {name: 0 for name in program.symtab}
+    run(program.ast, env, on_print=out.append, slots=slots)
+    return out, env
+
+
+def test_round_trip_keeps_annotations():
+    program = compile_source(SOURCE)
+    copy = CompiledProgram.from_bytes(program.to_bytes())
+    # slot, vtype et lignes compris
+    assert encode(copy.ast) == encode(program.ast)
+    assert copy.symtab == program.symtab and copy.tac == program.tac
+    assert outputs(copy) == outputs(program)
+    assert outputs(copy, slots=True) == outputs(program, slots=True)
+
+
+def test_key_depends_on_source_frontend_and_version():
+    key = source_key(SOURCE, "rd", "v1")
+    assert key == source_key(SOURCE, "rd", "v1")
+    assert len({key, source_key(SOURCE + " ", "rd", "v1"), source_key(SOURCE, "lark", "v1"),
+                source_key(SOURCE, "rd", "v2")}) == 4
+    # Pas de collision par simple concaténation des parties
+    assert source_key("b", "a", "") != source_key("", "a", "b")
+
+
+def test_files_version_follows_content(tmp_path):
+    path = tmp_path / "grammaire.lark"
+    path.write_text("start: a")
+    version = files_version(str(path))
+    assert files_version(str(path)) == version
+    path.write_text("start: b")
+    assert files_version(str(path)) != version
+
+
+def test_memory_lru():
+    cache = CompileCache(maxsize=2)
+    programs = [compile_source(f"int x; x = {n};") for n in range(3)]
+    for n, program in enumerate(programs):
+        cache.put(str(n), program)
+    assert cache.get("0") is None
+    assert cache.get("1") is programs[1]
+    cache.put("3", programs[0])
+    assert cache.get("2") is None and cache.get("1") is programs[1]
+    assert (cache.hits, cache.misses) == (2, 2)
+
+
+def test_disk_cache_shared_between_instances(tmp_path):
+    key = source_key(SOURCE, "rd", "v1")
+    CompileCache(directory=str(tmp_path)).put(key, compile_source(SOURCE))
+    other = CompileCache(directory=str(tmp_path))
+    program = other.get(key)
+    assert program is not None and other.hits == 1
+    assert outputs(program) == outputs(compile_source(SOURCE))
+    # Nouvelle version du front-end : autre clé, donc défaut de cache
+    assert other.get(source_key(SOURCE, "rd", "v2")) is None
+    assert not [name for _, _, files in os.walk(tmp_path) for name in files
+                if name.endswith(".tmp")]
+
+
+def test_corrupt_or_old_files_are_misses(tmp_path):
+    cache = CompileCache(directory=str(tmp_path))
+    program = compile_source(SOURCE)
+    for key, data in [("a" * 64, b""), ("b" * 64, program.to_bytes()[:10]),
+                      ("c" * 64, b"not marshal"),
+                      ("d" * 64, marshal.dumps((FORMAT_VERSION - 1, encode(program.ast),
+                                                program.symtab, program.tac)))]:
+        path = cache._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(data)
+        assert CompileCache(directory=str(tmp_path)).get(key) is None
+
+
+def test_compile_calls_front_end_once(tmp_path):
+    calls = []
+
+    def front_end(source):
+        calls.append(source)
+        return compile_source(source)
+
+    for _ in range(3):
+        program = CompileCache(directory=str(tmp_path)).compile(SOURCE, "rd", "v1", front_end)
+    assert calls == [SOURCE]
+    assert outputs(program) == outputs(compile_source(SOURCE))
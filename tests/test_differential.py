@@ -0,0 +1,108 @@
+# ------------------------------
+# Test différentiel des moteurs d'exécution
+# ------------------------------
+# Des programmes aléatoires (boucles imbriquées, boucles de comptage
+# affines assez longues pour la forme close, if, && et ||, divisions,
+# variables nommées comme les temporaires du TAC) sont exécutés par tous
+# les moteurs d'analyse_lark.py, par la VM avec le TAC optimisé (-O) et
+# par le parcours d'AST en forme close. Valeurs affichées et variables
+# finales (valeur et type) doivent être identiques.
+# Usage : python -m pytest -q tests
+import contextlib
+import io
+import os
+import random
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "version_lark"))
+
+import analyse_lark
+from minipython.lexer import tokenize
+
+NAMES = ["a", "b", "t1", "t2", "s"]
+COUNTERS = ["i", "j", "k"]
+COMPARISONS = ["<", "<=", ">", ">=", "!=", "=="]
+
+# (nom, moteur, TAC optimisé, forme close)
+CONFIGS = ([(engine, engine, False, False) for engine in analyse_lark.ENGINES]
+           + [("vm -O", "vm", True, False), ("tree forme close", "tree", False, True)])
+
+
+def random_expr(rng):
+    x, y = rng.choice(NAMES + COUNTERS), rng.choice(NAMES)
+    return rng.choice([
+        f"{x} + {y} * {rng.randint(-3, 3)}",
+        f"{x} - {y}",
+        f"({x} + {y}) / {rng.randint(1, 4)}",
+        f"{x} && {y}",
+        f"{x} || ({y} && {x} * 2)",
+        f"({x} > {rng.randint(-2, 5)} || {y}) + {x}",
+        f"{y} && ({x} / {y})",
+        f"{x} {rng.choice(COMPARISONS)} {y}",
+    ])
+
+
+def random_block(rng, depth):
+    lines = []
+    for _ in range(rng.randint(1, 4)):
+        r = rng.random()
+        if r < 0.2 and depth < len(COUNTERS):
+            # Boucle de comptage : affine seulement si le corps l'est
+            i = COUNTERS[depth]
+            start, stop = rng.randint(-3, 3), rng.randint(16, 40) if depth == 0 else rng.randint(0, 5)
+            lines += [f"{i} = {start};", f"while ({i} < {stop}) {{"]
+            if rng.random() < 0.5:
+                lines += [f"{x} = {x} + {i} * {rng.randint(-3, 3)};" for x in rng.sample(NAMES, 2)]
+            else:
+                lines += random_block(rng, depth + 1)
+            lines += [f"{i} = {i} + {rng.randint(1, 2)};", "}"]
+        elif r < 0.35:
+            condition = f"{rng.choice(NAMES)} > {rng.randint(-2, 5)} && {rng.choice(NAMES)}"
+            if rng.random() < 0.5:
+                condition += f" || {rng.choice(NAMES)} < 0"
+            lines += [f"if ({condition}) {{"] + random_block(rng, depth + 1) + ["}"]
+        elif r < 0.5:
+            lines.append(f"print({rng.choice(NAMES + COUNTERS)});")
+        else:
+            lines.append(f"{rng.choice(NAMES)} = {random_expr(rng)};")
+    return lines
+
+
+def random_program(rng):
+    lines = [f"int {n};" for n in NAMES + COUNTERS]
+    lines += [f"{n} = {rng.randint(-5, 5)};" for n in NAMES]
+    lines += random_block(rng, 0)
+    lines += [f"print({n});" for n in NAMES]
+    return "\n".join(lines) + "\n"
+
+
+def same(value):
+    # Clé de comparaison : 1 == 1.0 == True, et nan n'est pas égal à lui-même
+    if isinstance(value, float):
+        return "float", repr(value)
+    return type(value).__name__, value
+
+
+def results(ast, symtab, engine, optimize, closed_form):
+    # Valeurs affichées et variables finales : le TAC optimisé peut supprimer
+    # des STORE morts, et donc des lignes "EXEC" de la trace
+    out = io.StringIO()
+    with contextlib.redirect_stdout(out):
+        env = analyse_lark.execute(ast, symtab, engine=engine, optimize=optimize,
+                                   closed_form=closed_form)
+    printed = [l for l in out.getvalue().splitlines() if l.startswith("PRINT")]
+    return printed, {name: same(env[name]) for name in symtab}
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_engines_agree(seed):
+    source = random_program(random.Random(seed))
+    ast, symtab = analyse_lark.check_program(analyse_lark.parse_program(tokenize(source)))
+    reference = results(ast, symtab, "tree", False, False)
+    for label, engine, optimize, closed_form in CONFIGS:
+        assert results(ast, symtab, engine, optimize, closed_form) == reference, \
+            f"moteur {label}\n{source}"
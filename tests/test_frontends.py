@@ -0,0 +1,58 @@
+# ------------------------------
+# Front-ends : parser descendant ("rd") et Lark produisent le même AST
+# ------------------------------
+import contextlib
+import io
+import os
+import subprocess
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCRIPT_DIR = os.path.join(ROOT, "Codes_Sources", "Analyse_Lark_Automatique")
+sys.path.insert(0, ROOT)
+sys.path.insert(0, SCRIPT_DIR)
+
+from minipython import check, generate_tac, parse
+
+# Syntaxe commune aux deux front-ends (le parser descendant n'a ni "int x, y;" ni else)
+PROGRAMS = [
+    "int x; int y; x = 5; y = x + 2; print(y);",
+    "int x; x = 0; while (x < 3) { if (x == 1) { print(x); } x = x + 1; }",
+    "int a; int b; a = 7; b = (a - 1) * (a + 2) / 3; if (b > a) { print(b); } if (b < a) { a = 0 - b; }",
+]
+
+
+@pytest.mark.parametrize("source", PROGRAMS)
+def test_same_tac(source):
+    rd = generate_tac(check(parse(source, "rd"))[0])
+    lark = generate_tac(check(parse(source, "lark"))[0])
+    assert lark == rd
+
+
+def test_analyse_minipython_import_runs_nothing():
+    # Processus neuf : rien n'est affiché et Lark n'est pas chargé
+    code = (f"import sys; sys.path.insert(0, {SCRIPT_DIR!r}); import analyse_minipython; "
+            f"print('lark' in sys.modules)")
+    process = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True,
+                             timeout=60)
+    assert process.returncode == 0, process.stderr
+    assert process.stdout == "False\n"
+
+
+def test_analyse_minipython_pipeline():
+    import analyse_minipython
+    _, ast = analyse_minipython.parse(analyse_minipython.code_source)
+    ast, symbols = analyse_minipython.check(ast)
+    out = io.StringIO()
+    with contextlib.redirect_stdout(out):
+        env = analyse_minipython.execute(ast, symbols)
+    assert out.getvalue() == "7\n" and env == {"x": 5, "y": 7}
+
+
+def test_analyse_minipython_script():
+    process = subprocess.run([sys.executable, os.path.join(SCRIPT_DIR, "analyse_minipython.py"),
+                              "--no-png"], capture_output=True, text=True, timeout=60)
+    assert process.returncode == 0, process.stderr
+    assert process.stdout.rstrip().endswith("=== Exécution MiniPython ===\n7")
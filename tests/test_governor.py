@@ -0,0 +1,120 @@
+# ------------------------------
+# Exécution gouvernée (minipython.governor) : limites, reprise, forme close
+# ------------------------------
+import os
+import sys
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from minipython import check, parse
+from minipython.governor import (Governor, LimitExceeded, Scheduler, UndeclaredVariable,
+                                 execution, run)
+
+COUNT = "int i; int s; i = 0; while (i < {n}) {{ s = s + i; i = i + 1; }} print(s);"
+FOREVER = "int x; x = 1; while (x > 0) { x = x + 1; }"
+GROWING = "int x; int i; x = 1; while (i < 1000000000) { x = x * 3 + 1; i = i + 1; }"
+
+
+def program(source):
+    ast, symtab = check(parse(source))
+    return ast, {name: 0 for name in symtab}
+
+
+def test_steps_counted_exactly():
+    # 2 déclarations, une affectation, le while et le print, puis 3 pas par
+    # tour (2 instructions + retour à la condition)
+    ast, env = program(COUNT.format(n=10))
+    out = []
+    assert run(ast, env, on_print=out.append) == 5 + 3 * 10
+    assert out == [45] and env == {"i": 10, "s": 45}
+
+
+@pytest.mark.parametrize("max_steps", [1, 5, 1023, 1024, 1025, 5000])
+def test_step_limit_is_exact(max_steps):
+    ast, env = program(FOREVER)
+    with pytest.raises(LimitExceeded) as info:
+        run(ast, env, Governor(max_steps=max_steps))
+    assert info.value.limit == "steps"
+    assert info.value.steps == max_steps + 1
+
+
+def test_step_limit_not_reached():
+    ast, env = program(COUNT.format(n=10))
+    steps = run(ast, dict(env), on_print=lambda v: None)
+    assert run(ast, env, Governor(max_steps=steps), on_print=lambda v: None) == steps
+
+
+def test_time_limit():
+    ast, env = program(FOREVER)
+    start = time.perf_counter()
+    with pytest.raises(LimitExceeded) as info:
+        run(ast, env, Governor(max_seconds=0.2))
+    assert info.value.limit == "time"
+    assert time.perf_counter() - start < 2
+
+
+def test_memory_limit_checks_each_large_value():
+    # x double de taille à chaque tour : arrêté dès qu'une valeur dépasse la limite
+    ast, env = program("int x; x = 2; while (x > 0) { x = x * x; }")
+    with pytest.raises(LimitExceeded) as info:
+        run(ast, env, Governor(max_memory=10_000))
+    assert info.value.limit == "memory"
+    assert sys.getsizeof(env["x"]) < 40_000
+
+
+def test_paused_time_not_counted():
+    ast, env = program(COUNT.format(n=10000))
+    governor = Governor(max_seconds=0.5, check_every=1000)
+    running = execution(ast, env, governor, on_print=lambda v: None)
+    next(running)
+    time.sleep(0.6)     # suspendu : ne compte pas dans la limite
+    with pytest.raises(StopIteration):
+        while True:
+            next(running)
+    assert governor.seconds < 0.5
+
+
+def test_scheduler_isolates_programs():
+    scheduler = Scheduler()
+    ast, env = program(FOREVER)
+    scheduler.add("forever", execution(ast, env, Governor(max_steps=10_000)))
+    ast, finite = program(COUNT.format(n=1000))
+    scheduler.add("count", execution(ast, finite, on_print=lambda v: None))
+    results = scheduler.run()
+    assert isinstance(results["forever"], LimitExceeded)
+    assert results["count"] == 5 + 3 * 1000 and finite["s"] == 499500
+
+
+def test_runtime_errors():
+    ast, env = program("int x; x = 1 / x;")
+    with pytest.raises(ZeroDivisionError):
+        run(ast, env)
+    # Programme non vérifié : lecture d'un nom absent
+    with pytest.raises(UndeclaredVariable, match="Variable y non déclarée"):
+        run(parse("int x; x = y + 1;"), {"x": 0})
+
+
+def test_closed_form_counts_the_same_steps():
+    ast, env = program(COUNT.format(n=100000))
+    closed = dict(env)
+    steps = run(ast, env, on_print=lambda v: None)
+    assert run(ast, closed, on_print=lambda v: None, closed_form=True) == steps
+    assert closed == env
+    with pytest.raises(LimitExceeded) as info:
+        run(ast, closed, Governor(max_steps=steps - 1), on_print=lambda v: None,
+            closed_form=True)
+    assert info.value.limit == "steps"
+
+
+def test_closed_form_respects_time_limit():
+    # Le calcul en forme close de 10^9 tours de x = 3x + 1 ne doit pas
+    # dépasser le délai : il retombe sur l'interprète, arrêté par max_seconds
+    ast, env = program(GROWING)
+    start = time.perf_counter()
+    with pytest.raises(LimitExceeded) as info:
+        run(ast, env, Governor(max_seconds=0.3), closed_form=True)
+    assert info.value.limit == "time"
+    assert time.perf_counter() - start < 3
@@ -0,0 +1,133 @@
+# ------------------------------
+# Analyse incrémentale (minipython.incremental.Document)
+# ------------------------------
+# Après chaque édition, le document doit donner le même AST (lignes
+# comprises) et les mêmes diagnostics sémantiques qu'une analyse complète
+# du texte édité.
+import os
+import random
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from minipython import parse
+from minipython.incremental import Document
+from minipython.lexer import LexError
+from minipython.semantic import analyze
+
+SOURCE = """int x;
+int y;
+x = 1;
+while (x < 30) {
+    if (x > 2) {
+        y = y + x * 2;
+    }
+    x = x + 1;
+}
+print(y);
+"""
+
+
+def full_analysis(text):
+    # (AST, diagnostics) de l'analyse complète ; None si le texte est invalide
+    try:
+        ast = parse(text)
+    except (SyntaxError, LexError, IndexError):
+        return None
+    errors = analyze(ast).errors
+    return ast, sorted((e.line, str(e)) for e in errors)
+
+
+def assert_consistent(doc, text):
+    assert doc.text == text
+    expected = full_analysis(text)
+    if expected is None:
+        assert doc.diagnostics()
+        return
+    ast, diagnostics = expected
+    assert repr(doc.ast()) == repr(ast)
+    assert [stmt.line for stmt in doc.ast()] == [stmt.line for stmt in ast]
+    assert sorted(doc.diagnostics()) == diagnostics
+
+
+def edit(doc, text, start, end, insert):
+    doc.edit(start, end, insert)
+    return text[:start] + insert + text[end:]
+
+
+def test_initial_analysis():
+    doc = Document(SOURCE)
+    assert len(doc) == 5
+    assert_consistent(doc, SOURCE)
+
+
+def test_typing_a_statement():
+    doc = Document(SOURCE)
+    text = SOURCE
+    pos = text.index("print")
+    for ch in "z = x + y;\n":
+        text = edit(doc, text, pos, pos, ch)
+        pos += 1
+        assert_consistent(doc, text)
+    # z n'est pas déclarée
+    assert [d.message for d in doc.diagnostics()] == ["Variable z non déclarée"]
+    text = edit(doc, text, 0, 0, "int z;\n")
+    assert_consistent(doc, text)
+    assert doc.diagnostics() == []
+
+
+def test_deleting_a_declaration():
+    doc = Document(SOURCE)
+    text = edit(doc, SOURCE, 0, len("int x;\n"), "")
+    assert_consistent(doc, text)
+    assert {d.message for d in doc.diagnostics()} == {"Variable x non déclarée"}
+
+
+def test_closing_brace_typed_later():
+    # L'accolade du while manque, puis est tapée quelques lignes plus bas
+    text = SOURCE.replace("    x = x + 1;\n}\n", "    x = x + 1;\n")
+    doc = Document(text)
+    assert_consistent(doc, text)
+    text = edit(doc, text, text.index("print"), text.index("print"), "}\n")
+    assert_consistent(doc, text)
+    assert doc.diagnostics() == []
+
+
+def test_lines_shift_after_edits():
+    doc = Document(SOURCE)
+    text = edit(doc, SOURCE, 0, 0, "\n\n\n")
+    assert_consistent(doc, text)
+    assert doc.ast()[-1].line == 13
+    assert doc.offset(4) == 3 and doc.offset(5, 2) == 3 + len("int x;\n") + 1
+
+
+def test_documents_are_independent():
+    # Pas d'état global partagé entre deux documents (table des symboles)
+    first = Document("int shared;\nshared = 1;\n")
+    second = Document("shared = 2;\n")
+    assert first.diagnostics() == []
+    assert [d.message for d in second.diagnostics()] == ["Variable shared non déclarée"]
+
+
+def test_invalid_edit_range():
+    doc = Document(SOURCE)
+    with pytest.raises(ValueError):
+        doc.edit(5, 2, "")
+    with pytest.raises(ValueError):
+        doc.edit(0, len(SOURCE) + 1, "")
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_random_edits(seed):
+    rng = random.Random(seed)
+    pieces = ["int a;\n", "a = 2;\n", "x = x + 1;\n", "print(a);\n", "}\n", "{", ";", " ",
+              "while (x < 3) {\n", "if (y > 1) {\n", "y = (x + 3) * 2;\n", "\n", "1", "x"]
+    doc = Document(SOURCE)
+    text = SOURCE
+    for _ in range(40):
+        start = rng.randint(0, len(text))
+        end = min(len(text), start + rng.choice([0, 0, 1, 3, 10]))
+        text = edit(doc, text, start, end, rng.choice(pieces + [""]))
+        assert_consistent(doc, text)
@@ -0,0 +1,107 @@
+# ------------------------------
+# Lexer : tokenize() et lecture par morceaux (iter_tokens, TokenStream)
+# ------------------------------
+import io
+import os
+import random
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from minipython.lexer import (MARGIN, LexError, TokenStream, iter_tokens, stream_tokens,
+                              tokenize)
+
+SOURCE = """int interval;
+float ratio;
+interval = 12345 + 3;
+ratio = 1.5 * interval;
+while (interval >= 10 && ratio != 0 || !ratio) {
+    interval = interval - 1;
+}
+print("une chaîne plutôt longue, avec des espaces et un ; dedans");
+"""
+
+# Tailles de morceau petites, autour de MARGIN et plus grandes que le texte
+CHUNK_SIZES = [1, 2, 3, 5, 7, MARGIN - 1, MARGIN, MARGIN + 1, 64, 1 << 16]
+
+
+def positions(source):
+    # (type, valeur, ligne, colonne) calculés sur le texte complet
+    out = []
+    pos = 0
+    for kind, text in tokenize(source):
+        start = source.index(text, pos)
+        line = source.count("\n", 0, start) + 1
+        column = start - (source.rfind("\n", 0, start) + 1) + 1
+        out.append((kind, text, line, column))
+        pos = start + len(text)
+    return out
+
+
+def chunked(source, chunk_size):
+    return [tuple(t) for t in iter_tokens(io.StringIO(source), chunk_size=chunk_size)]
+
+
+def test_keywords_and_identifiers():
+    assert tokenize("interval int while1 while") == [
+        ("ID", "interval"), ("INT", "int"), ("ID", "while1"), ("WHILE", "while")]
+    assert tokenize("a<=b&&!c||d!=1.25") == [
+        ("ID", "a"), ("LTE", "<="), ("ID", "b"), ("AND", "&&"), ("NOT", "!"), ("ID", "c"),
+        ("OR", "||"), ("ID", "d"), ("NEQ", "!="), ("FLOATNUM", "1.25")]
+
+
+@pytest.mark.parametrize("chunk_size", CHUNK_SIZES)
+def test_chunk_boundaries(chunk_size):
+    # Chaque frontière de morceau tombe quelque part dans un token ("whi|le", "1.|5")
+    assert chunked(SOURCE, chunk_size) == positions(SOURCE)
+
+
+def test_tokens_longer_than_margin():
+    name = "v" * (3 * MARGIN)
+    string = '"' + "x" * (5 * MARGIN) + '"'
+    source = f"int {name};\nprint({string});\n{name} = 1234567890123456789012345678901234567890;"
+    for chunk_size in (1, 7, MARGIN, 2 * MARGIN):
+        assert chunked(source, chunk_size) == positions(source)
+
+
+def test_random_sources():
+    rng = random.Random(0)
+    words = ["int", "x", "interval", "12", "3.25", "==", "=", "<", "<=", "!", "!=", "&&",
+             "||", "(", ")", "{", "}", ";", '"a b"', "while", "print", "\n", " ", "\t"]
+    for _ in range(50):
+        source = " ".join(rng.choice(words) for _ in range(rng.randint(1, 80)))
+        for chunk_size in (1, 3, 17):
+            assert chunked(source, chunk_size) == positions(source)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 4, MARGIN, 1 << 16])
+def test_error_position(chunk_size):
+    source = "int x;\n" * 20 + "x = 1 $ 2;\n"
+    with pytest.raises(LexError) as info:
+        chunked(source, chunk_size)
+    assert (info.value.line, info.value.column) == (21, 7)
+    with pytest.raises(LexError) as info:
+        tokenize(source)
+    assert (info.value.line, info.value.column) == (21, 7)
+
+
+def test_unterminated_string():
+    with pytest.raises(LexError):
+        chunked('print("jamais fermée);', 4)
+
+
+def test_token_stream_window():
+    source = "int x;\n" * 1000
+    stream = stream_tokens(io.StringIO(source), chunk_size=16)
+    i = 0
+    while i < len(stream):
+        assert stream[i][:2] == ("INT", "int")
+        i += 3
+        stream.release(i)
+        # Seule la fenêtre courante reste en mémoire
+        assert len(stream._buffer) <= TokenStream.LOOKAHEAD + 1
+    assert i == 3000
+    with pytest.raises(IndexError):
+        stream[0]
@@ -0,0 +1,90 @@
+# ------------------------------
+# Parser descendant : précédence, imbrication profonde, entrées tronquées
+# ------------------------------
+import io
+import os
+import sys
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from minipython import parse
+from minipython.lexer import stream_tokens
+from minipython.nodes import BinOp, Num, UnaryOp, While
+from minipython.parser import parse_program
+from minipython.service import handle
+
+
+def value(source):
+    return parse(f"int x; x = {source};")[1].value
+
+
+def test_precedence_and_associativity():
+    expr = value("1 - 2 - 3 * 4 < 5 && 6 || 7")
+    assert repr(expr) == repr(parse("int x; x = ((((1 - 2) - (3 * 4)) < 5) && 6) || 7;")[1].value)
+    assert isinstance(value("-(1)"), UnaryOp)
+    assert value("(((7)))").value == 7
+
+
+def test_deep_nesting_without_recursion():
+    depth = 20 * sys.getrecursionlimit()
+    expr = value("(" * depth + "1" + ")" * depth)
+    assert isinstance(expr, Num)
+    expr = value("-" * depth + "1")
+    for _ in range(depth):
+        assert isinstance(expr, UnaryOp)
+        expr = expr.operand
+
+
+def test_wide_expression_is_linear():
+    start = time.perf_counter()
+    expr = value(" + ".join(["x"] * 20000))
+    assert time.perf_counter() - start < 2
+    assert isinstance(expr, BinOp) and expr.right.name == "x"
+
+
+def test_statements_get_lines():
+    ast = parse("int x;\nx = 0;\nwhile (x < 3) {\n    x = x + 1;\n}\n")
+    assert [stmt.line for stmt in ast] == [1, 2, 3]
+    assert isinstance(ast[2], While) and ast[2].body.stmts[0].line == 4
+
+
+@pytest.mark.parametrize("source, line", [
+    ("int x;\nx = 1 +", 2),
+    ("int x;\nwhile (x < 3) {", 2),
+    ("int x;\nif (x < 1) {\n  x = 2;", 3),
+    ("int x;\nx = (1 + (2", 2),
+    ("x = -", 1),
+    ("int", 1),
+    ("print(", 1),
+])
+def test_truncated_input(source, line):
+    for tokens in (None, stream_tokens(io.StringIO(source))):
+        with pytest.raises(SyntaxError, match=f"Fin de programme inattendue ligne {line}$"):
+            parse(source) if tokens is None else parse_program(tokens)
+
+
+def test_syntax_errors():
+    with pytest.raises(SyntaxError, match="'\\)' attendue"):
+        parse("int x; x = (1 + 2;")
+    with pytest.raises(SyntaxError, match="Instruction inattendue"):
+        parse("int x; } x = 1;")
+    # Séparateurs et opérandes manquants : refusés, jamais sautés
+    for source, message in [("int x; x = 1 print(x);", "';' attendu au lieu de 'print'"),
+                            ("int x; x 1;", "'=' attendu au lieu de '1'"),
+                            ("int 3;", "Nom de variable attendu au lieu de '3'"),
+                            ("int x; print x;", "'\\(' attendue au lieu de 'x'"),
+                            ("int x; while (x) x = 1;", "'{' attendue au lieu de 'x'"),
+                            ("int x; x = 1 + ;", "Expression attendue au lieu de ';'"),
+                            ("int x; x = 1.5;", "Expression attendue au lieu de '1.5'")]:
+        with pytest.raises(SyntaxError, match=f"{message} ligne 1$"):
+            parse(source)
+
+
+def test_truncated_input_diagnostic():
+    result = handle({"op": "check", "source": "int x;\nwhile (x < 3) {", "frontend": "rd",
+                     "budget": 10, "deadline": time.monotonic() + 10})
+    assert result["diagnostics"] == [{"phase": "parse",
+                                      "message": "Fin de programme inattendue ligne 2"}]
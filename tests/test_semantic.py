@@ -0,0 +1,69 @@
+# ------------------------------
+# Analyse sémantique : types inférés et coût de la passe
+# ------------------------------
+import os
+import sys
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from minipython import parse
+from minipython.semantic import BOOL, FLOAT, INT, SemanticErrors, check
+
+
+def chain(n, last):
+    # v0 = v1; v1 = v2; ... : le type de v{n} remonte toute la chaîne
+    return ("".join(f"int v{i};" for i in range(n + 1))
+            + "".join(f"v{i} = v{i + 1};" for i in range(n)) + f"v{n} = {last};")
+
+
+def best_time(source, repeat=3):
+    best = None
+    for _ in range(repeat):
+        ast = parse(source)
+        start = time.perf_counter()
+        check(ast)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def test_expression_types():
+    ast, _ = check(parse("int x; int y; x = 7 / 2; y = x < 2; y = (1 < 2) && (3 < 4);"))
+    assert ast[2].value.vtype == FLOAT
+    assert ast[3].value.vtype == BOOL
+    assert ast[4].value.vtype == BOOL
+
+
+def test_variable_joins_assigned_types():
+    # x vaut 0 (int) puis un float : son type peut varier
+    ast, _ = check(parse("int x; int y; x = 1; while (x < 3) { y = x + 1; x = x / 2; }"))
+    loop = ast[3]
+    assert loop.cond.left.vtype is None
+    assert loop.body.stmts[0].value.vtype is None
+
+
+def test_reverse_chain_types():
+    ast, _ = check(parse(chain(50, "1 / 2")))
+    # v50 reçoit un float : toute la chaîne devient variable, sauf la dernière valeur
+    assert [a.value.vtype for a in ast[51:-1]] == [None] * 50
+    assert ast[-1].value.vtype == FLOAT
+    ast, _ = check(parse(chain(50, "2")))
+    assert {a.value.vtype for a in ast[51:]} == {INT}
+
+
+def test_reverse_chain_stays_linear():
+    # Une chaîne inversée ne doit pas coûter un tour de point fixe par lien
+    n = 4000
+    straight = best_time(chain(n, "2"))
+    reverse = best_time(chain(n, "1 / 2"))
+    assert reverse < 5 * straight + 0.05
+
+
+def test_all_errors_collected():
+    with pytest.raises(SemanticErrors) as info:
+        check(parse("int x; int x; y = 1; print(z);"))
+    assert [e.line for e in info.value.errors] == [1, 1, 1]
+    assert len(info.value.errors) == 3
@@ -0,0 +1,143 @@
+# ------------------------------
+# Service local (minipython.service) : requêtes valides et invalides
+# ------------------------------
+import asyncio
+import json
+import os
+import sys
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from minipython.service import MAX_BODY, Service, handle
+
+LOOP = "int x; x = 0; while (x < 3) { x = x + 1; } print(x);"
+
+
+def request(op, source, frontend="rd", budget=1000):
+    return {"op": op, "source": source, "frontend": frontend, "budget": budget,
+            "deadline": time.monotonic() + 10}
+
+
+def route(payload, path="/run", service=None):
+    body = payload if isinstance(payload, bytes) else json.dumps(payload).encode()
+    return asyncio.run((service or Service(workers=1)).route("POST", path, body))
+
+
+async def exchange(service, raw):
+    # Envoie une requête HTTP brute, renvoie (statut, JSON) de la réponse
+    server = await asyncio.start_server(service._connection, "127.0.0.1", 0)
+    try:
+        reader, writer = await asyncio.open_connection(*server.sockets[0].getsockname()[:2])
+        writer.write(raw)
+        await writer.drain()
+        status = int((await reader.readline()).split()[1])
+        headers = {}
+        while (line := await reader.readline()) != b"\r\n":
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        body = await reader.readexactly(int(headers["content-length"]))
+        writer.close()
+        return status, json.loads(body)
+    finally:
+        server.close()
+        await server.wait_closed()
+
+
+# --------------------------
+# Côté worker
+# --------------------------
+def test_compile_same_tac_for_both_frontends():
+    rd = handle(request("compile", LOOP, "rd"))
+    lark = handle(request("compile", LOOP, "lark"))
+    assert rd["success"] and lark["success"]
+    assert lark["tac"] == rd["tac"]
+    assert any(line.startswith("JZ ") for line in lark["tac"])
+
+
+def test_run_and_budget():
+    result = handle(request("run", LOOP))
+    assert result["success"] and result["output"] == [3] and result["variables"] == {"x": 3}
+    result = handle(request("run", "int x; while (x < 1) { x = x; }", budget=50))
+    assert not result["success"]
+    assert result["diagnostics"][0]["phase"] == "run"
+
+
+def test_diagnostics():
+    result = handle(request("check", "int x; y = 1; print(z);"))
+    assert [d["phase"] for d in result["diagnostics"]] == ["semantic", "semantic"]
+    result = handle(request("run", "int x; x = 1 / 0;"))
+    assert result["diagnostics"][0]["phase"] == "run"
+
+
+# --------------------------
+# Validation des requêtes (route)
+# --------------------------
+@pytest.mark.parametrize("payload", [
+    {"source": LOOP, "budget": 1e999},
+    {"source": LOOP, "budget": 1.5},
+    {"source": LOOP, "budget": -1},
+    {"source": LOOP, "budget": "100"},
+    {"source": LOOP, "budget": True},
+    {"source": LOOP, "timeout": 1e999},
+    {"source": LOOP, "timeout": 0},
+    {"source": LOOP, "timeout": None},
+    {"frontend": "rd"},
+    {"source": LOOP, "frontend": "yacc"},
+])
+def test_invalid_payload(payload):
+    status, response = route(payload)
+    assert status == 400
+    assert response["error"].startswith("Requête invalide")
+
+
+def test_invalid_json_and_paths():
+    assert route(b"{")[0] == 400
+    assert route(b"[1, 2]")[0] == 400
+    assert route({"source": LOOP}, path="/nope")[0] == 404
+    assert asyncio.run(Service(workers=1).route("GET", "/run", b""))[0] == 405
+
+
+def test_limits_capped():
+    service = Service(workers=1, max_timeout=2.0, max_budget=1000)
+    assert service.limits({"timeout": 30, "budget": 2.0 ** 40}) == (2.0, 1000)
+    assert service.limits({"budget": 2.0}) == (2.0, 2)
+
+
+# --------------------------
+# HTTP
+# --------------------------
+@pytest.mark.parametrize("length, status", [
+    ("abc", 400), ("-5", 400), ("1e3", 400), (str(MAX_BODY + 1), 413),
+    pytest.param("9" * 5000, 413, id="5000-digits"),
+])
+def test_invalid_content_length(length, status):
+    raw = f"POST /run HTTP/1.1\r\nContent-Length: {length}\r\n\r\n".encode()
+    assert asyncio.run(exchange(Service(workers=1), raw))[0] == status
+
+
+def test_bad_request_line():
+    assert asyncio.run(exchange(Service(workers=1), b"GARBAGE\r\n"))[0] == 400
+
+
+def test_end_to_end():
+    async def scenario():
+        service = Service(workers=1)
+        server = await service.start(port=0)
+        try:
+            host, port = server.sockets[0].getsockname()[:2]
+            reader, writer = await asyncio.open_connection(host, port)
+            body = json.dumps({"source": LOOP, "frontend": "rd"}).encode()
+            writer.write(b"POST /run HTTP/1.1\r\nContent-Length: %d\r\n"
+                         b"Connection: close\r\n\r\n" % len(body) + body)
+            await writer.drain()
+            response = await reader.read()
+            writer.close()
+            return json.loads(response.split(b"\r\n\r\n", 1)[1])
+        finally:
+            await service.close()
+
+    result = asyncio.run(scenario())
+    assert result["success"] and result["output"] == [3]
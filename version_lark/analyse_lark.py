@@ -1,10 +1,23 @@
-from anytree import Node, RenderTree
-from anytree.exporter import DotExporter
-import re
+import argparse
+import io
 import os
-import shutil
-import subprocess
-import tempfile
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Les moteurs autres que "tree", l'optimiseur de TAC et le cache de
+# compilation ne sont importés que par les options qui s'en servent
+import minipython.lexer
+import minipython.parser
+import minipython.semantic
+import minipython.tac
+from minipython.ast_export import (export, start_render, wait_render, walk, write_json,
+                                   write_text)
+from minipython.governor import Governor, LimitExceeded, run as run_governed
+from minipython.lexer import iter_tokens
+from minipython.parser import parse_program
+from minipython.profiling import Instrumentation, Profiler, count_nodes
+from minipython.semantic import SemanticErrors, check as check_semantics
+from minipython.tac import TACGenerator
 
 # ------------------------------
 # 1. Code source MiniPython
@@ -23,340 +36,257 @@ while (x <3){
 # ------------------------------
 # 2. Analyse lexicale
 # ------------------------------
-token_specification = [
-    ('INT', r'int'), ('FLOAT', r'float'), ('BOOL', r'bool'),
-    ('STRING', r'string'), ('PRINT', r'print'), ('WHILE', r'while'),
-    ('IF', r'if'), ('ELSE', r'else'), ('FOR', r'for'),
-    ('TRUE', r'true'), ('FALSE', r'false'),
-
-    ('EQEQ', r'=='), ('NEQ', r'!='), ('LTE', r'<='), ('GTE', r'>='),
-    ('LT', r'<'), ('GT', r'>'),
-    ('AND', r'&&'), ('OR', r'\|\|'), ('NOT', r'!'),
-
-    ('PLUS', r'\+'), ('MINUS', r'-'),
-    ('STAR', r'\*'), ('SLASH', r'/'),
-    ('EQUAL', r'='),
-
-    ('LPAR', r'\('), ('RPAR', r'\)'),
-    ('LBRACE', r'\{'), ('RBRACE', r'\}'),
-    ('SEMICOLON', r';'),
-
-    ('FLOATNUM', r'\d+\.\d+'),
-    ('NUMBER', r'\d+'),
-    ('STRINGLIT', r'"[^"]*"'),
-    ('ID', r'[A-Za-z_]\w*'),
-
-    ('SKIP', r'[ \t\n]+')
-]
-
-regex = '|'.join(f'(?P<{n}>{p})' for n, p in token_specification)
-tokens = [(m.lastgroup, m.group()) for m in re.finditer(regex, code_source) if m.lastgroup != 'SKIP']
-
-print("\n=== Phase lexicale ===")
-for t in tokens:
-    print(t)
+# minipython.lexer.iter_tokens : tokens positionnés (type, valeur, ligne)
 
 # ------------------------------
 # 3. Analyse syntaxique & AST
 # ------------------------------
-
-symbol_table = {}
-
-###########
-# EXPRESSIONS
-###########
-
-def parse_expr(tokens, start_idx): return parse_or(tokens, start_idx)
-
-def parse_or(tokens, i):
-    left, i = parse_and(tokens, i)
-    while i < len(tokens) and tokens[i][0] == 'OR':
-        i += 1
-        right, i = parse_and(tokens, i)
-        left = ('Expr: ||', [left, right])
-    return left, i
-
-def parse_and(tokens, i):
-    left, i = parse_equality(tokens, i)
-    while i < len(tokens) and tokens[i][0] == 'AND':
-        i += 1
-        right, i = parse_equality(tokens, i)
-        left = ('Expr: &&', [left, right])
-    return left, i
-
-def parse_equality(tokens, i):
-    left, i = parse_comparison(tokens, i)
-    while i < len(tokens) and tokens[i][0] in ('EQEQ', 'NEQ'):
-        op = '==' if tokens[i][0] == 'EQEQ' else '!='
-        i += 1
-        right, i = parse_comparison(tokens, i)
-        left = (f'Expr: {op}', [left, right])
-    return left, i
-
-def parse_comparison(tokens, i):
-    left, i = parse_additive(tokens, i)
-    while i < len(tokens) and tokens[i][0] in ('LT','GT','LTE','GTE'):
-        op_map = {'LT':'<','GT':'>','LTE':'<=','GTE':'>='}
-        op = op_map[tokens[i][0]]
-        i += 1
-        right, i = parse_additive(tokens, i)
-        left = (f'Expr: {op}', [left, right])
-    return left, i
-
-def parse_additive(tokens, i):
-    left, i = parse_multiplicative(tokens, i)
-    while i < len(tokens) and tokens[i][0] in ('PLUS', 'MINUS'):
-        op = '+' if tokens[i][0]=='PLUS' else '-'
-        i += 1
-        right, i = parse_multiplicative(tokens, i)
-        left = (f'Expr: {op}', [left, right])
-    return left, i
-
-def parse_multiplicative(tokens, i):
-    left, i = parse_unary(tokens, i)
-    while i < len(tokens) and tokens[i][0] in ('STAR','SLASH'):
-        op = '*' if tokens[i][0]=='STAR' else '/'
-        i += 1
-        right, i = parse_unary(tokens, i)
-        left = (f'Expr: {op}', [left, right])
-    return left, i
-
-def parse_unary(tokens, i):
-    if tokens[i][0] in ('MINUS','NOT'):
-        op = '-' if tokens[i][0]=='MINUS' else '!'
-        i += 1
-        expr, i = parse_unary(tokens, i)
-        return (f'Expr: unary{op}', [expr]), i
-    return parse_primary(tokens, i)
-
-def parse_primary(tokens, i):
-    tok,val = tokens[i]
-    if tok == 'LPAR':
-        expr, j = parse_expr(tokens, i+1)
-        return expr, j+1
-    if tok == 'NUMBER': return ('Const: '+val), i+1
-    if tok == 'ID': return ('Var: '+val), i+1
-    return None, i
-
-###########
-# STATEMENTS
-###########
-def parse_statement(tokens, i):
-    if tokens[i][0]=='INT':
-        i+=1
-        varname=tokens[i][1]
-        symbol_table[varname]='int'
-        i+=1  # name
-        i+=1  # ;
-        return ('Decl', [f'Var: {varname} (type=int)']), i
-    
-    if tokens[i][0]=='ID':
-        var=tokens[i][1]
-        i+=2 # var '='
-        expr,i=parse_expr(tokens,i)
-        i+=1 # ;
-        return ('Assign',[f'Var: {var}',expr]),i
-
-    if tokens[i][0]=='PRINT':
-        i+=2 # print (
-        expr,i=parse_expr(tokens,i)
-        i+=2 # ) ;
-        return ('Print',[expr]),i
-
-    if tokens[i][0]=='WHILE':
-        i+=2
-        cond,i=parse_expr(tokens,i)
-        i+=1
-        body,i=parse_block(tokens,i)
-        return ('While',[cond,('Block',body)]),i
-
-    if tokens[i][0]=='IF':
-        i+=2
-        cond,i=parse_expr(tokens,i)
-        i+=1
-        then_body,i=parse_block(tokens,i)
-        else_body=[]
-        return ('If',[cond,('Block',then_body),('Block',else_body)]),i
-
-    return None,i
-
-def parse_block(tokens,i):
-    i+=1
-    body=[]
-    while tokens[i][0] != 'RBRACE':
-        stmt,i=parse_statement(tokens,i)
-        body.append(stmt)
-    return body,i+1
-
-# Parse global
-ast=[]
-i=0
-while i<len(tokens):
-    stmt,i=parse_statement(tokens,i)
-    ast.append(stmt)
-
-print("\n=== AST syntaxique brut ===")
-for x in ast: print(x)
+# minipython.parser.parse_program : descente récursive, noeuds de minipython.nodes
 
 # ------------------------------
 # 4. Analyse sémantique
 # ------------------------------
-ast_semantic = ast
-
-print("\n=== AST après analyse sémantique ===")
-for x in ast_semantic: print(x)
+# Une passe sur tout l'AST (minipython.semantic) : slots et types annotés,
+# toutes les erreurs levées ensemble (SemanticErrors)
+def check_program(ast):
+    # (AST annoté, table des symboles nom -> type)
+    return check_semantics(ast)
 
 # ------------------------------
 # 5. Génération TAC
 # ------------------------------
-class TACGenerator:
-    def __init__(self):
-        self.code=[]
-        self.temp_id=0
-        self.label_id=0
-    
-    def new_temp(self):
-        self.temp_id+=1
-        return f"t{self.temp_id}"
-    
-    def new_label(self):
-        self.label_id+=1
-        return f"L{self.label_id}"
-    
-    def emit(self, line):
-        self.code.append(line)
-
-    def gen_expr(self, expr):
-        if isinstance(expr,str):
-            if expr.startswith("Const:"):
-                return expr.split(": ")[1]
-            if expr.startswith("Var:"):
-                v=expr.split(": ")[1]
-                t=self.new_temp()
-                self.emit(f"LOAD {t}, {v}")
-                return t
-
-        if isinstance(expr,tuple):
-            op=expr[0].split(": ")[1]
-            left=self.gen_expr(expr[1][0])
-            right=self.gen_expr(expr[1][1])
-            t=self.new_temp()
-            opmap={'+':'ADD','-':'SUB','*':'MUL','/':'DIV','<':'LT','>':'GT','<=':'LTE','>=':'GTE','==':'EQ','!=':'NEQ'}
-            op=opmap[op]
-            self.emit(f"{op} {t}, {left}, {right}")
-            return t
-        
-        return "0"
-
-    def gen_stmt(self, stmt):
-        if stmt[0]=='Decl':
-            v=stmt[1][0].split()[1]
-            self.emit(f"DECLARE int {v}")
-        
-        elif stmt[0]=='Assign':
-            v=stmt[1][0].split(": ")[1]
-            r=self.gen_expr(stmt[1][1])
-            self.emit(f"STORE {v}, {r}")
-        
-        elif stmt[0]=='Print':
-            r=self.gen_expr(stmt[1][0])
-            self.emit(f"PRINT {r}")
-        
-        elif stmt[0]=='While':
-            L1=self.new_label()
-            L2=self.new_label()
-            cond=stmt[1][0]
-            self.emit(f"LABEL {L1}")
-            rc=self.gen_expr(cond)
-            self.emit(f"JZ {rc}, {L2}")
-            for s in stmt[1][1][1]:
-                self.gen_stmt(s)
-            self.emit(f"JMP {L1}")
-            self.emit(f"LABEL {L2}")
-
-    def generate(self, ast):
-        for s in ast:
-            self.gen_stmt(s)
-        return self.code
-
-tac=TACGenerator().generate(ast_semantic)
-
-print("\n=== CODE INTERMÉDIAIRE (TAC) ===")
-for x in tac: print(x)
+# minipython.tac.TACGenerator : étiquettes et sauts pour while, if, && et ||
 
 # ------------------------------
 # 6. Visualisation AST
 # ------------------------------
-
-def build_anytree(node, parent=None):
-    n=Node(node[0], parent=parent)
-    for c in node[1]:
-        if isinstance(c,tuple):
-            build_anytree(c,n)
-        elif isinstance(c,list):
-            cn=Node("Block", parent=n)
-            for x in c:
-                build_anytree(x,cn)
-        else:
-            Node(str(c), parent=n)
-    return n
-
-root = build_anytree(("Program", ast_semantic))
-
-print("\n=== AST visuel console ===")
-for pre,_,n in RenderTree(root):
-    print(pre+n.name)
-
-# Fix: generate DOT into local folder (NO TEMP FILES)
-dot_path = os.path.join(os.getcwd(),"ast.dot")
-png_path = os.path.join(os.getcwd(),"ast.png")
-
-try:
-    DotExporter(root).to_dotfile(dot_path)
-    subprocess.run(["dot","-Tpng",dot_path,"-o",png_path], check=True)
-    print(f"\n✔ Image PNG générée : {png_path}")
-except Exception as e:
-    print("\nGraphviz non disponible :", e)
+# L'AST est écrit directement (minipython.ast_export), sans copie anytree,
+# et le PNG est rendu par Graphviz en arrière-plan pendant l'exécution.
+def export_png(ast, max_depth=None):
+    # Fix: generate DOT into local folder (NO TEMP FILES)
+    dot_path = os.path.join(os.getcwd(),"ast.dot")
+    png_path = os.path.join(os.getcwd(),"ast.png")
+
+    export(dot_path, "Program", ast, max_depth)
+    render = start_render(dot_path, png_path)
+    if render is None:
+        print("\nGraphviz non disponible : commande dot introuvable")
+    return render, png_path
+
+def finish_png(render, png_path):
+    if render is None:
+        return
+    error = wait_render(render)
+    if error is None:
+        print(f"\n✔ Image PNG générée : {png_path}")
+    else:
+        print("\nGraphviz non disponible :", error)
 
 # ------------------------------
 # 7. Exécution MiniPython
 # ------------------------------
 
-def eval_expr(expr, env):
-    if isinstance(expr,str):
-        if expr.startswith("Const:"):
-            return int(expr.split(": ")[1])
-        if expr.startswith("Var:"):
-            return env[expr.split(": ")[1]]
-
-    if isinstance(expr,tuple):
-        op=expr[0].split(": ")[1]
-        left=eval_expr(expr[1][0],env)
-        right=eval_expr(expr[1][1],env)
-        ops={'+':left+right,'-':left-right,'*':left*right,'/':left/right,
-             '<':left<right,'>':left>right,'<=':left<=right,'>=':left>=right,
-             '==':left==right,'!=':left!=right}
-        return ops[op]
-
-def exec_stmt(stmt,env):
-    if stmt[0]=='Assign':
-        v=stmt[1][0].split(": ")[1]
-        env[v]=eval_expr(stmt[1][1],env)
-        print(f"EXEC: {v}={env[v]}")
-    elif stmt[0]=='Print':
-        print("PRINT:", eval_expr(stmt[1][0],env))
-    elif stmt[0]=='While':
-        cond=stmt[1][0]
-        while eval_expr(cond,env):
-            for s in stmt[1][1][1]:
-                exec_stmt(s,env)
-
-def execute(ast,symtab):
+# Le moteur "tree" passe par minipython.governor : pas, temps et mémoire
+# peuvent être limités (--max-steps, --max-time, --max-memory)
+def show_assign(name,value):
+    print(f"EXEC: {name}={value}")
+
+def show_print(value):
+    print("PRINT:", value)
+
+# Moteurs d'exécution disponibles :
+#  - "tree"     : parcours direct de l'AST (minipython.governor)
+#  - "closures" : l'AST est compilé une seule fois en fermetures Python
+#  - "slots"    : fermetures sur une liste plate indexée par les slots
+#  - "python"   : l'AST est transpilé en code Python, compilé par compile()
+#  - "vm"       : le TAC est assemblé en bytecode puis exécuté par la VM
+ENGINES = ("tree", "closures", "slots", "python", "vm")
+
+def execute(ast,symtab,engine="tree",optimize=False,hook=None,governor=None,closed_form=False,
+            tac=None):
+    # hook : compteur d'instructions exécutées, governor : limites
+    # d'exécution, closed_form : boucles de comptage affines exécutées
+    # d'un coup (moteur "tree" uniquement). tac : TAC déjà généré (et
+    # optimisé si besoin) pour le moteur "vm", sinon produit ici
     env={k:0 for k in symtab}
     print("\n=== Début exécution ===")
-    for s in ast:
-        exec_stmt(s,env)
+    if engine=="closures":
+        from minipython.closures import compile_program
+        compile_program(ast)(env)
+    elif engine=="slots":
+        # Variables résolues en index : l'environnement est une liste plate
+        from minipython.closures import compile_program
+        from minipython.resolve import resolve_slots, slots_view
+        names=resolve_slots(ast,symtab)
+        values=[0]*len(names)
+        compile_program(ast,slots=True)(values)
+        env=slots_view(names,values)
+    elif engine=="python":
+        from minipython.transpile import PythonProgram
+        try:
+            program=PythonProgram(ast,symtab)
+        except (SyntaxError,RecursionError):
+            # Au-delà des limites de compile() : moteur à fermetures
+            from minipython.closures import compile_program
+            compile_program(ast)(env)
+        else:
+            env=program.run(initial=0)
+    elif engine=="vm":
+        from minipython.bytecode import assemble, run as run_bytecode
+        if tac is None:
+            tac=TACGenerator().generate(ast)
+            if optimize:
+                from minipython.tac_opt import optimize as optimize_tac
+                tac,_=optimize_tac(tac)
+        env=run_bytecode(assemble(tac,symtab))
+    elif engine=="tree":
+        try:
+            run_governed(ast,env,governor,on_assign=show_assign,on_print=show_print,hook=hook,
+                         closed_form=closed_form)
+        except LimitExceeded as e:
+            print("Exécution interrompue :", e)
+    else:
+        raise ValueError(f"Moteur d'exécution inconnu : {engine}")
+    # Vue dictionnaire des variables finales (débogage)
+    return env
+
+# ------------------------------
+# 8. Compilation (front-end complet) et cache
+# ------------------------------
+def frontend_version():
+    # Le cache est invalidé dès que le lexer, le parser ou ce fichier changent
+    from minipython.compile_cache import files_version
+    return files_version(minipython.lexer.__file__, minipython.parser.__file__,
+                         minipython.semantic.__file__, minipython.tac.__file__,
+                         os.path.abspath(__file__))
+
+def front_end(source, instr):
+    # Lexing, parsing, sémantique et TAC, avec affichage des phases.
+    # Tokens positionnés : l'AST garde la ligne source de chaque instruction
+    with instr.phase("lex") as rec:
+        tokens = list(iter_tokens(io.StringIO(source)))
+        rec.counts["tokens"] = len(tokens)
+    print("\n=== Phase lexicale ===")
+    for t in tokens:
+        print(t[:2])
+
+    with instr.phase("parse") as rec:
+        ast = parse_program(tokens)
+        rec.counts["noeuds"] = count_nodes(ast)
+    print("\n=== AST syntaxique brut ===")
+    for x in ast: print(x)
+
+    with instr.phase("semantic") as rec:
+        ast_semantic, symtab = check_program(ast)
+        rec.counts["symboles"] = len(symtab)
+
+    with instr.phase("tac") as rec:
+        tac=TACGenerator().generate(ast_semantic)
+        rec.counts["instructions"] = len(tac)
+    return ast_semantic, symtab, tac
 
-print("\n=== Exécution MiniPython ===")
-execute(ast_semantic,symbol_table)
-print("=== Fin exécution ===")
+# ------------------------------
+# 9. Programme principal
+# ------------------------------
+def main():
+    arg_parser = argparse.ArgumentParser(description="Analyse et exécution MiniPython")
+    arg_parser.add_argument("--engine", choices=ENGINES, default="tree",
+                            help="moteur d'exécution (défaut : tree)")
+    arg_parser.add_argument("-O", "--optimize", action="store_true",
+                            help="optimise le TAC (exécuté par le moteur vm)")
+    arg_parser.add_argument("--max-steps", type=int, metavar="N",
+                            help="arrête l'exécution après N pas (moteur tree)")
+    arg_parser.add_argument("--max-time", type=float, metavar="S",
+                            help="arrête l'exécution après S secondes (moteur tree)")
+    arg_parser.add_argument("--max-memory", type=int, metavar="KO",
+                            help="limite la taille des variables en Ko (moteur tree)")
+    arg_parser.add_argument("--closed-form", action="store_true",
+                            help="exécute d'un coup les boucles de comptage affines (moteur tree)")
+    arg_parser.add_argument("--profile", action="store_true",
+                            help="mesure chaque phase et compte les instructions exécutées "
+                                 "(moteur tree)")
+    arg_parser.add_argument("--cache", action="store_true",
+                            help="réutilise l'AST et le TAC d'une compilation identique")
+    arg_parser.add_argument("--ast-depth", type=int, metavar="N",
+                            help="résume les sous-arbres de l'AST au-delà de la profondeur N")
+    arg_parser.add_argument("--ast-json", metavar="FICHIER",
+                            help="écrit aussi l'AST au format JSON")
+    arg_parser.add_argument("--no-png", action="store_true",
+                            help="n'écrit pas ast.dot et ne lance pas Graphviz")
+    args = arg_parser.parse_args()
+    governor = Governor(args.max_steps, args.max_time,
+                        args.max_memory * 1024 if args.max_memory is not None else None)
+    limited = (args.max_steps, args.max_time, args.max_memory) != (None, None, None)
+    if limited and args.engine != "tree":
+        arg_parser.error("--max-steps, --max-time et --max-memory demandent --engine tree")
+    if args.closed_form and args.engine != "tree":
+        arg_parser.error("--closed-form demande --engine tree")
+    # Seul le parcours d'AST appelle le compteur d'instructions
+    if args.profile and args.engine != "tree":
+        arg_parser.error("--profile demande --engine tree")
+
+    profiler = Profiler()
+    instr = Instrumentation(profiler, trace_alloc=True) if args.profile else Instrumentation()
+
+    program = None
+    if args.cache:
+        from minipython.compile_cache import (DEFAULT_DIR, CompileCache, CompiledProgram,
+                                              source_key)
+        cache = CompileCache(directory=DEFAULT_DIR)
+        key = source_key(code_source, "analyse_lark", frontend_version())
+        program = cache.get(key)
+    if program is not None:
+        print("\n=== Programme trouvé dans le cache de compilation ===")
+        ast_semantic, symtab, tac = program.ast, program.symtab, program.tac
+    else:
+        try:
+            ast_semantic, symtab, tac = front_end(code_source, instr)
+        except SemanticErrors as e:
+            print("\n=== Erreurs sémantiques ===")
+            print(e)
+            sys.exit(1)
+        if args.cache:
+            cache.put(key, CompiledProgram(ast_semantic, symtab, tac))
+
+    print("\n=== AST après analyse sémantique ===")
+    for x in ast_semantic: print(x)
+
+    print("\n=== CODE INTERMÉDIAIRE (TAC) ===")
+    for x in tac: print(x)
+
+    if args.optimize:
+        from minipython.tac_opt import optimize as optimize_tac, print_report
+        with instr.phase("optimize") as rec:
+            tac,report=optimize_tac(tac)
+            rec.counts["instructions"] = len(tac)
+        print("\n=== TAC OPTIMISÉ ===")
+        for x in tac: print(x)
+        print()
+        print_report(report)
+
+    print("\n=== AST visuel console ===")
+    write_text(walk("Program", ast_semantic, args.ast_depth), sys.stdout)
+    render = None
+    if not args.no_png:
+        render = export_png(ast_semantic, args.ast_depth)
+    if args.ast_json:
+        # Toujours du JSON, quelle que soit l'extension du fichier
+        export(args.ast_json, "Program", ast_semantic, args.ast_depth, writer=write_json)
+
+    print("\n=== Exécution MiniPython ===")
+    with instr.phase("execute") as rec:
+        # TAC déjà généré, et optimisé avec -O : le moteur vm l'exécute tel quel
+        execute(ast_semantic,symtab,engine=args.engine,hook=instr.stmt_hook(),
+                governor=governor,closed_form=args.closed_form,tac=tac)
+        if profiler.hits:
+            rec.counts["exécutées"] = sum(profiler.hits.values())
+    print("=== Fin exécution ===")
+    if render is not None:
+        finish_png(*render)
+
+    if args.profile:
+        print("\n=== Profil ===")
+        print(profiler.report())
+
+if __name__ == "__main__":
+    main()